@@ -1,58 +1,232 @@
 import streamlit as st
 import pandas as pd
-from wordcloud import WordCloud
 import matplotlib.pyplot as plt
-from visualize import visualize
+import plotly.io as pio
+from visualize import TREE_CLASSES, analyze
+from tree.suite import run_suite, to_csv, to_json
+from tree.ingest import count_words, sample_file
 import concurrent.futures
+import multiprocessing
+
+
+# Word list file for each dataset choice, and whether only alphabetic words are kept
+DATASETS = {
+    "4000 english common words": ('data/4000-most-common-english-words-csv.csv', False),
+    "400.000 english common words": ('data/words.csv', True),
+}
 
 
 #------------------FUNCTIONS-------------------------------------
-def create_wordcloud(words):
-    wordcloud = WordCloud(width=800, height=400, background_color="white").generate(" ".join(words))
-    fig, ax = plt.subplots()
-    plt.imshow(wordcloud, interpolation="bilinear")
-    plt.axis("off")
-    st.pyplot(fig)
+@st.cache_data(show_spinner=False)
+def dataset_size(choice):
+    """Count the usable words of the chosen list in one streaming pass, or None for an unknown choice."""
+    if choice not in DATASETS:
+        return None
+    return count_words(*DATASETS[choice])
+
+
+def dataset_sample(choice, num_words):
+    """Return the sample_file arguments for num_words of the chosen list; the workers read the same sample from them."""
+    path, alphabetic = DATASETS[choice]
+    return (path, num_words, 42, alphabetic)
+
+
+@st.cache_data(show_spinner=False)
+def load_dataset(choice, num_words):
+    """Stream the chosen word list and keep a seeded random sample of num_words distinct words; reruns reuse it."""
+    return sample_file(*dataset_sample(choice, num_words))
+
+
+def start_worker():
+    """Start a single worker process for one tree type."""
+    context = multiprocessing.get_context('spawn')  # Forking the threaded Streamlit server is unsafe
+    return concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context)
+
+
+@st.cache_resource(show_spinner=False)
+def get_workers():
+    """Start one worker process per tree type, shared by every session until the cache is cleared.
+
+    Each tree type always goes to its own worker, so the trees that worker has
+    built stay cached there and the selected trees are processed in parallel.
+    """
+    return {tree_selection: start_worker() for tree_selection in TREE_CLASSES}
+
+
+def clear_cached_trees():
+    """Drop every cached tree by shutting down the workers that hold them."""
+    for worker in get_workers().values():
+        worker.shutdown(wait=False, cancel_futures=True)
+    get_workers.clear()
+
+
+def replace_worker(tree_selection, broken):
+    """Swap a stopped worker for a fresh one; the other tree types keep their workers and cached trees.
+
+    Another session may have replaced it already, so only the broken executor itself is swapped out.
+    """
+    workers = get_workers()
+    if workers.get(tree_selection) is broken:
+        broken.shutdown(wait=False, cancel_futures=True)
+        workers[tree_selection] = start_worker()
+
+
+def show_tree(tree_key, result):
+    """Draw one tree's figure and word cloud in the Visualize tab."""
+    with tab_visualize:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown(f"## {tree_key} data structure")
+            if result['figure'] is not None:
+                # Clicking a collapsed node reruns the app, which expands it on the next render
+                st.plotly_chart(pio.from_json(result['figure']), key=f"chart_{tree_key}",
+                                on_select="rerun", selection_mode="points")
+        with col2:
+            st.markdown(f"## {tree_key} found words")
+            if result['wordcloud'] is not None:
+                st.image(result['wordcloud'])
+            else:
+                st.markdown("No words found.")
+
+
+def chart_clicks(tree_key):
+    """Return the figure node keys in the current selection of this tree's chart."""
+    clicks = []
+    selection = st.session_state.get(f"chart_{tree_key}")
+    if selection:
+        for point in selection.get('selection', {}).get('points', []):
+            key = point.get('customdata')
+            if isinstance(key, list):
+                key = key[0] if key else None
+            if key is not None:
+                clicks.append(key)
+    return clicks
+
+
+def clicked_nodes(tree_key):
+    """Return the figure node keys opened so far for this tree and prefix, adding any node just clicked."""
+    opened = st.session_state.setdefault('expanded', {}).setdefault((choice, num_words, tree_key, prefix), set())
+    opened.update(chart_clicks(tree_key))
+    return sorted(opened)
+
+
+def run_benchmarks():
+    """Run the headless benchmark suite on the selected words and trees and show it in the Metrics tab."""
+    settings = {'datasets': [choice], 'words': num_words, 'trees': selected_trees, 'repeats': 3, 'warmup': 1}
+    with tab_metrics:
+        st.markdown("### Benchmark suite")
+        with st.spinner("Benchmarking..."):
+            rows = run_suite(datasets=(choice,), trees=selected_trees, repeats=3, warmup=1,
+                             words=words)
+        st.write(pd.DataFrame(rows))
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Download JSON", to_json(rows, settings), file_name='benchmark.json', mime='application/json')
+        with col2:
+            st.download_button("Download CSV", to_csv(rows), file_name='benchmark.csv', mime='text/csv')
 
 
 def run_analysis():
-    """Function to run the analysis and store metrics."""
+    """Run the analysis, show each tree as it finishes, and keep the figures and metrics in the session."""
     merged_metrics = {
-            'Insertion Time (ms)': [],
             'Retrieval Time (ms)': [],
             'Total Nodes': [],
-            'Nodes Traversed': []
+            'Nodes Traversed': [],
+            'Character Comparisons': [],
+            'Edge Comparisons': [],
+            'Allocated Bytes': []
         }
+    if measure_insertion:
+        merged_metrics = {'Insertion Time (ms)': [], **merged_metrics}
+    if cache_results:
+        merged_metrics.update({'Cache Hits': [], 'Cache Filtered Hits': [], 'Cache Misses': [], 'Cache Evictions': []})
     
     tree_names = []
+    shown = {}
+    errors = []
+    workers = get_workers()
+    with tab_metrics:
+        live_metrics = st.empty()
 
+    # Every selected tree is built or fetched, queried and drawn in its own worker at once.
+    # Only the sample's description is sent; a worker reads the words itself when it needs them.
+    futures = {}
+    sample = dataset_sample(choice, num_words)
     for tree_key in selected_trees:
         tree_value = tree_options[tree_key]
+        job = (analyze, sample, tree_value, prefix, measure_insertion, clicked_nodes(tree_key), cache_results)
+        worker = workers[tree_value]
         try:
-            # Capture all the metrics from visualize function
-            results, fig, nodes_traversed, total_nodes, insertion_time, retrieval_time = visualize(
-                words=filtered_df.iloc[:, 0].tolist(), 
-                tree_selection=tree_value, 
-                prefix=prefix
-            )
+            future = worker.submit(*job)
+        except concurrent.futures.process.BrokenProcessPool:
+            # The worker stopped while idle; start this tree type over on a fresh one
+            replace_worker(tree_value, worker)
+            worker = workers[tree_value]
+            future = worker.submit(*job)
+        futures[future] = tree_key, worker
+
+    # Show each tree as soon as its worker finishes
+    for future in concurrent.futures.as_completed(futures):
+        tree_key, worker = futures[future]
+        try:
+            result = future.result()
+            show_tree(tree_key, result)
+            shown[tree_key] = {'figure': result['figure'], 'wordcloud': result['wordcloud']}
             tree_names.append(tree_key)
-            merged_metrics['Insertion Time (ms)'].append(insertion_time)
-            merged_metrics['Retrieval Time (ms)'].append(retrieval_time)
-            merged_metrics['Total Nodes'].append(total_nodes)
-            merged_metrics['Nodes Traversed'].append(nodes_traversed)
-
-            # Display visualizations in the Visualize tab
-            with tab_visualize:
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown(f"## {tree_key} data structure")
-                    st.plotly_chart(fig)
-                with col2:
-                    st.markdown(f"## {tree_key} found words")
-                    wordcloud_fig = create_wordcloud(results)
+            if measure_insertion:
+                merged_metrics['Insertion Time (ms)'].append(result['insertion_time'])
+            merged_metrics['Retrieval Time (ms)'].append(result['retrieval_time'])
+            merged_metrics['Total Nodes'].append(result['total_nodes'])
+            merged_metrics['Nodes Traversed'].append(result['nodes_traversed'])
+            merged_metrics['Character Comparisons'].append(result['char_comparisons'])
+            merged_metrics['Edge Comparisons'].append(result['edge_comparisons'])
+            merged_metrics['Allocated Bytes'].append(result['allocated_bytes'])
+            if cache_results:
+                merged_metrics['Cache Hits'].append(result['cache']['hits'])
+                merged_metrics['Cache Filtered Hits'].append(result['cache']['filtered_hits'])
+                merged_metrics['Cache Misses'].append(result['cache']['misses'])
+                merged_metrics['Cache Evictions'].append(result['cache']['evictions'])
+            live_metrics.write(pd.DataFrame(merged_metrics, index=tree_names).T)
+        except concurrent.futures.process.BrokenProcessPool:
+            errors.append(f"**Error with {tree_key}**: the worker process stopped; its cached trees were dropped")
+            st.markdown(errors[-1])
+            replace_worker(tree_options[tree_key], worker)
         except Exception as e:
-            st.markdown(f"**Error with {tree_key}**: {str(e)}")
+            errors.append(f"**Error with {tree_key}**: {str(e)}")
+            st.markdown(errors[-1])
+    live_metrics.empty()
+    show_metrics(merged_metrics, tree_names)
+
+    # Later reruns redraw these instead of asking the workers again
+    st.session_state['analysis'] = {
+        'settings': analysis_settings(),
+        'clicks': {tree_key: chart_clicks(tree_key) for tree_key in selected_trees},
+        'trees': shown,
+        'metrics': merged_metrics,
+        'tree_names': tree_names,
+        'errors': errors,
+    }
+
+
+def analysis_settings():
+    """Return the sidebar choices an analysis depends on, to tell whether the last one is out of date."""
+    return (choice, num_words, tuple(selected_trees), prefix, measure_insertion, cache_results)
+
+
+def show_analysis(analysis):
+    """Redraw the last analysis kept in the session without running it again."""
+    if analysis['settings'] != analysis_settings():
+        with tab_visualize:
+            st.caption("Showing the last run; press Run to apply the new settings.")
+    for message in analysis['errors']:
+        st.markdown(message)
+    for tree_key in analysis['tree_names']:
+        show_tree(tree_key, analysis['trees'][tree_key])
+    show_metrics(analysis['metrics'], analysis['tree_names'])
 
+
+def show_metrics(merged_metrics, tree_names):
+    """Draw the metrics table and one comparison chart per metric in the Metrics tab."""
     with tab_metrics:
         st.markdown("### Tree Metrics")
         if merged_metrics:
@@ -75,86 +249,112 @@ def run_analysis():
         else:
             st.markdown("No metrics collected yet. Please click the 'Run' button.")
 
-# ----------------------Set page config -------------------------------------------
-apptitle = 'Tree visualizer'
-st.set_page_config(page_title=apptitle, page_icon=":evergreen_tree:", layout="wide")
-
-st.title('Tree nodes visualizer')
-
-# Sidebar
-
-## Select files:
-# file_options = ["4000 english common words", "400.000 english common words", "Upload a CSV file"]
-file_options = ["4000 english common words", "400.000 english common words"]
-choice = st.sidebar.selectbox("Choose a file option:", file_options)
-df = None
-# Handle the file choice
-if choice == "4000 english common words":
-    file = 'data/4000-most-common-english-words-csv.csv'
-    df = pd.read_csv(file, header=None, names=['word'])
-elif choice == "400.000 english common words":
-    file = 'data/words.csv'
-    df = pd.read_csv(file, header=None, names=['word'])
-    df = df.dropna()
-    df['word'] = df['word'].str.strip('\"')  # Remove any surrounding quotes
-    df = df[df['word'].str.isalpha()] # Filter out non-alphabetic words
-# elif choice == "Upload a CSV file":
-#     # Allow the user to upload a file
-#     uploaded_file = st.file_uploader("Upload your file", type="csv")
-#     if uploaded_file is not None:
-#         # Read and display the uploaded file
-#         df = pd.read_csv(uploaded_file)
-#         # Ensure the 'word' column exists and process it
-#         if 'word' in df.columns:
-#             df['word'] = df['word'].str.strip('\"')  # Remove any surrounding quotes
-#             df = df[df['word'].str.isalpha()]  # Filter out non-alphabetic words
-#             df = df['word']  # Keep only the 'word' column
-#             df.reset_index()
-#         else:
-#             st.error("The uploaded file does not contain a 'word' column.")
-
-
-## Select dataset
-st.sidebar.markdown("## Select Number of Words")
-        # Add a slider to allow users to select a subset of words from the dataset
-num_words = 0
-
-
-if df is not None:
-    st.write("Displaying File:")
-    st.dataframe(df)
-    num_words = st.sidebar.slider(
-        "Number of words to visualize",
-        min_value=100,
-        max_value=len(df),
-        value=1000,  # default value
-        step=100
-    )
-
-    df.head()
-
-    # Subset and shuffle the dataframe based on the slider
-    filtered_df = df.sample(frac=1, random_state=42).head(num_words)
-
-    st.sidebar.markdown(f"Selected {num_words} words from the dataset.")
-
-    st.sidebar.markdown("## Select Tree data structure")
-    tree_options = {
-        'Trie': 1,
-        'Ternary': 2,
-        'Radix': 3
-    }
-    selected_trees = [tree for tree in tree_options if st.sidebar.checkbox(tree, value=False)]
 
-    st.sidebar.markdown("## Select a prefix")
-    st.sidebar.markdown("""Choose a prefix. Leave blank if you want to list all possible words""")
-    prefix = st.sidebar.text_input(label='Prefix', value='')
+def main():
+    """Draw the page; spawned workers import this file as __mp_main__ and never call it."""
+    # The functions above read the sidebar choices and the tabs as module globals
+    global choice, num_words, words, tree_options, selected_trees, prefix, measure_insertion, cache_results
+    global tab_visualize, tab_metrics
+
+    # ----------------------Set page config -------------------------------------------
+    apptitle = 'Tree visualizer'
+    st.set_page_config(page_title=apptitle, page_icon=":evergreen_tree:", layout="wide")
+
+    st.title('Tree nodes visualizer')
+
+    # Sidebar
+
+    ## Select files:
+    # file_options = ["4000 english common words", "400.000 english common words", "Upload a CSV file"]
+    file_options = ["4000 english common words", "400.000 english common words"]
+    choice = st.sidebar.selectbox("Choose a file option:", file_options)
+    # Handle the file choice
+    total_words = dataset_size(choice)
+    # elif choice == "Upload a CSV file":
+    #     # Allow the user to upload a file
+    #     uploaded_file = st.file_uploader("Upload your file", type="csv")
+    #     if uploaded_file is not None:
+    #         # Read and display the uploaded file
+    #         df = pd.read_csv(uploaded_file)
+    #         # Ensure the 'word' column exists and process it
+    #         if 'word' in df.columns:
+    #             df['word'] = df['word'].str.strip('\"')  # Remove any surrounding quotes
+    #             df = df[df['word'].str.isalpha()]  # Filter out non-alphabetic words
+    #             df = df['word']  # Keep only the 'word' column
+    #             df.reset_index()
+    #         else:
+    #             st.error("The uploaded file does not contain a 'word' column.")
+
+
+    ## Select dataset
+    st.sidebar.markdown("## Select Number of Words")
+            # Add a slider to allow users to select a subset of words from the dataset
+    num_words = 0
+
+
+    if total_words is not None:
+        num_words = st.sidebar.slider(
+            "Number of words to visualize",
+            min_value=100,
+            max_value=total_words,
+            value=1000,  # default value
+            step=100
+        )
+
+        # Only the sampled words are ever held; the list is streamed, not loaded
+        words = load_dataset(choice, num_words)
+        st.write("Displaying sampled words:")
+        st.dataframe(pd.DataFrame({'word': words}))
+
+        st.sidebar.markdown(f"Selected {num_words} words from the dataset.")
+
+        st.sidebar.markdown("## Select Tree data structure")
+        tree_options = {
+            'Trie': 1,
+            'Ternary': 2,
+            'Radix': 3,
+            'DAWG': 4
+        }
+        selected_trees = [tree for tree in tree_options if st.sidebar.checkbox(tree, value=False)]
+
+        st.sidebar.markdown("## Select a prefix")
+        st.sidebar.markdown("""Choose a prefix. Leave blank if you want to list all possible words""")
+        prefix = st.sidebar.text_input(label='Prefix', value='')
+
+        st.sidebar.markdown("## Cached trees")
+        st.sidebar.markdown("""Built trees are reused while only the prefix changes.""")
+        measure_insertion = st.sidebar.checkbox(
+            "Measure insertion time", value=False,
+            help="Also build each selected tree from scratch to time insertion; the cached trees are untouched.")
+        cache_results = st.sidebar.checkbox(
+            "Cache query results", value=False,
+            help="Answer repeated prefixes, and prefixes extending a cached one, from an LRU of earlier results.")
+        if st.sidebar.button(label='Clear cached trees', key='clear_trees'):
+            clear_cached_trees()
+
+
+
+        # Main screen
+        tab_visualize, tab_metrics = st.tabs(["Visualize", "Metrics"])
 
+        # Run button in the sidebar
+        run_clicked = st.sidebar.button(label='Run', key='run_analysis')
+        collapse_clicked = st.sidebar.button(label='Collapse figures', key='collapse_figures')
+        if collapse_clicked:
+            st.session_state['expanded'] = {}
+        # After a run, only a click on a figure or collapsing them asks the workers again; any other rerun redraws the last results
+        last = st.session_state.get('analysis')
+        if run_clicked or (last is not None and (
+                collapse_clicked or any(chart_clicks(tree_key) != clicks for tree_key, clicks in last['clicks'].items()))):
+            run_analysis()
+        elif last is not None:
+            show_analysis(last)
 
+        # Benchmark button in the sidebar
+        if st.sidebar.button(label='Run benchmark suite', key='run_benchmarks',
+                             help="Time insert, find and starts_with with warmups and percentiles, and trace memory"):
+            run_benchmarks()
 
-    # Main screen
-    tab_visualize, tab_metrics = st.tabs(["Visualize", "Metrics"])
 
-    # Run button in the sidebar
-    if st.sidebar.button(label='Run', key='run_analysis'):
-        run_analysis()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Report TernaryTree shape and lookup cost before and after rebalancing.
+
+Run from the repository root:
+    python -m benchmarks.balance [--file data/words.csv] [--limit N]
+"""
+import argparse
+import random
+
+from benchmarks.common import load_words
+from tree.ternary import TernaryTree
+
+COLUMNS = ['max_depth', 'max_sibling_height', 'average_find_nodes', 'average_prefix_nodes']
+
+
+def inserted(words):
+    tree = TernaryTree()
+    tree.insert_many(words, balanced=False)
+    return tree
+
+
+def rebalanced(words):
+    tree = inserted(words)
+    tree.rebalance()
+    return tree
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=None, help='word list CSV (defaults to data/words.csv when present)')
+    parser.add_argument('--limit', type=int, default=None, help='only load the first N words')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    words = load_words(args.file, args.limit)
+    shuffled = list(words)
+    random.Random(args.seed).shuffle(shuffled)  # app.py shuffles before inserting
+    ordered = sorted(set(words))
+
+    builds = {
+        'shuffled insert': lambda: inserted(shuffled),
+        'sorted insert': lambda: inserted(ordered),
+        'shuffled + rebalance': lambda: rebalanced(shuffled),
+        'from_sorted': lambda: TernaryTree.from_sorted(ordered),
+    }
+    print(f"{len(words)} words")
+    print(f"{'build':<24}" + ''.join(f"{column:>22}" for column in COLUMNS))
+    for name, build in builds.items():
+        report = build().depth_report()
+        print(f"{name:<24}" + ''.join(f"{report[column]:>22.2f}" for column in COLUMNS))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Compare one starts_with or find call per query against the batched starts_with_many and find_many.
+
+Bursts mix prefixes of one to four characters drawn from stored words, so
+they overlap the way autocomplete traffic does. find bursts are whole stored
+words, which share far less.
+
+Run from the repository root:
+    python -m benchmarks.batch [--file data/words.csv] [--synthetic N] [--sizes 10 100 1000]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import load_words, synthetic_words
+from tree.tries import PrefixTree
+from tree.ternary import TernaryTree
+from tree.radix import RadixTree
+
+TREES = {
+    'Trie': PrefixTree,
+    'Ternary': TernaryTree,
+    'Radix': RadixTree,
+}
+
+
+def timed_us(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1e6
+
+
+def batch_nodes(prefixes, answers):
+    """Return the nodes a batch visited; a repeated prefix is answered once, so it is counted once."""
+    return sum(nodes for _, nodes in dict(zip(prefixes, answers)).values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=None, help='word list CSV (defaults to data/words.csv when present)')
+    parser.add_argument('--synthetic', type=int, default=None, help='use N random words instead of a CSV')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help='queries per burst')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    words = synthetic_words(args.synthetic, args.seed) if args.synthetic else load_words(args.file)
+    rng = random.Random(args.seed)
+    print(f"{len(words)} words")
+    print(f"{'tree':<10}{'burst':>7}{'prefix loop us':>16}{'prefix batch us':>17}{'nodes loop':>12}{'nodes batch':>13}"
+          f"{'find loop us':>14}{'find batch us':>15}")
+    for name, tree_class in TREES.items():
+        tree = tree_class()
+        tree.insert_many(words)
+        for size in args.sizes:
+            hits = rng.choices(words, k=size)
+            prefixes = [word[:rng.randint(1, 4)] for word in hits]
+            single, loop_us = timed_us(lambda: [tree.starts_with(prefix) for prefix in prefixes])
+            batched, batch_us = timed_us(lambda: tree.starts_with_many(prefixes))
+            _, find_loop_us = timed_us(lambda: [tree.find(word) for word in hits])
+            _, find_batch_us = timed_us(lambda: tree.find_many(hits))
+            print(f"{name:<10}{size:>7}{loop_us:>16.0f}{batch_us:>17.0f}"
+                  f"{sum(nodes for _, nodes in single):>12}{batch_nodes(prefixes, batched):>13}"
+                  f"{find_loop_us:>14.0f}{find_batch_us:>15.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Compare per-word insertion against insert_many and from_sorted bulk loading.
+
+Run from the repository root:
+    python -m benchmarks.bulk [--file data/words.csv] [--limit N] [--synthetic N]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import load_words, synthetic_words
+from tree.tries import PrefixTree
+from tree.ternary import TernaryTree
+from tree.radix import RadixTree
+
+TREES = {
+    'Trie': PrefixTree,
+    'Ternary': TernaryTree,
+    'Radix': RadixTree,
+}
+
+
+def elapsed_ms(function):
+    """Time a build, keeping teardown of the built tree outside the measurement."""
+    start = time.perf_counter()
+    built = function()
+    elapsed = (time.perf_counter() - start) * 1000
+    del built
+    return elapsed
+
+
+def insert_loop(tree_class, words):
+    tree = tree_class()
+    for word in words:
+        tree.insert(word)
+    return tree
+
+
+def insert_many(tree_class, words):
+    tree = tree_class()
+    tree.insert_many(words)
+    return tree
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=None, help='word list CSV (defaults to data/words.csv when present)')
+    parser.add_argument('--limit', type=int, default=None, help='only load the first N words')
+    parser.add_argument('--synthetic', type=int, default=None, help='use N random words instead of a CSV')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        words = synthetic_words(args.synthetic, args.seed)
+    else:
+        words = load_words(args.file, args.limit)
+    shuffled = list(words)
+    random.Random(args.seed).shuffle(shuffled)  # app.py shuffles before inserting
+    ordered = sorted(set(words))
+
+    print(f"{len(words)} words")
+    print(f"{'tree':<10}{'insert loop ms':>16}{'insert_many ms':>16}{'from_sorted ms':>16}")
+    for name, tree_class in TREES.items():
+        loop = elapsed_ms(lambda: insert_loop(tree_class, shuffled))
+        many = elapsed_ms(lambda: insert_many(tree_class, shuffled))
+        bulk = elapsed_ms(lambda: tree_class.from_sorted(ordered))
+        print(f"{name:<10}{loop:>16.1f}{many:>16.1f}{bulk:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Compare starts_with with and without the CachedTree result cache on autocomplete-like traffic.
+
+Sessions type a word one character at a time, querying every prefix up to
+--depth characters. Words are drawn with a Zipf-like skew, so a few short
+prefixes come up again and again while longer ones seldom repeat. Those are
+then filtered from a cached shorter prefix. A single insert every
+--insert-every sessions shows the cost of invalidation.
+
+Run from the repository root:
+    python -m benchmarks.cache [--synthetic N] [--max-words 100000] [--sessions 2000]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import load_words, synthetic_words
+from tree.cache import DEFAULT_MAX_WORDS, CachedTree
+from tree.tries import PrefixTree
+from tree.ternary import TernaryTree
+from tree.radix import RadixTree
+
+TREES = {
+    'Trie': PrefixTree,
+    'Ternary': TernaryTree,
+    'Radix': RadixTree,
+}
+
+
+def sessions(words, count, depth, seed):
+    """Return count lists of typed prefixes, one list per word drawn with a 1/rank skew."""
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+    return [[word[:length] for length in range(1, min(depth, len(word)) + 1)]
+            for word in rng.choices(words, weights, k=count)]
+
+
+def replay(tree, typed, insert_every):
+    start = time.perf_counter()
+    for number, prefixes in enumerate(typed, 1):
+        for prefix in prefixes:
+            tree.starts_with(prefix)
+        if insert_every and number % insert_every == 0:
+            tree.insert(f'zz{number}')
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=None, help='word list CSV (defaults to data/words.csv when present)')
+    parser.add_argument('--synthetic', type=int, default=None, help='use N random words instead of a CSV')
+    parser.add_argument('--max-words', type=int, default=DEFAULT_MAX_WORDS, help='cache bound in words')
+    parser.add_argument('--sessions', type=int, default=2000)
+    parser.add_argument('--depth', type=int, default=4, help='characters typed per session')
+    parser.add_argument('--insert-every', type=int, default=500, help='sessions between inserts; 0 for none')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    words = synthetic_words(args.synthetic, args.seed) if args.synthetic else load_words(args.file)
+    typed = sessions(words, args.sessions, args.depth, args.seed)
+    queries = sum(map(len, typed))
+    print(f"{len(words)} words, {queries} queries in {len(typed)} sessions, cache bound {args.max_words} words")
+    print(f"{'tree':<10}{'plain ms':>10}{'cached ms':>11}{'hits':>8}{'filtered':>10}{'misses':>8}"
+          f"{'evictions':>11}{'invalidations':>15}")
+    for name, tree_class in TREES.items():
+        plain = tree_class()
+        plain.insert_many(words)
+        plain_seconds = replay(plain, typed, args.insert_every)
+        cached = CachedTree(tree_class(), args.max_words)
+        cached.insert_many(words)
+        cached_seconds = replay(cached, typed, args.insert_every)
+        info = cached.cache_info()
+        print(f"{name:<10}{plain_seconds * 1e3:>10.0f}{cached_seconds * 1e3:>11.0f}{info['hits']:>8}"
+              f"{info['filtered_hits']:>10}{info['misses']:>8}{info['evictions']:>11}{info['invalidations']:>15}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Replace part of the vocabulary every round and check that nodes and memory stay flat.
+
+Run from the repository root:
+    python -m benchmarks.churn [--words N] [--rounds 10] [--batch N]
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+
+from benchmarks.common import synthetic_words
+from tree.tries import PrefixTree
+from tree.ternary import TernaryTree
+from tree.radix import RadixTree
+
+TREES = {
+    'Trie': PrefixTree,
+    'Ternary': TernaryTree,
+    'Radix': RadixTree,
+}
+
+
+def churn(tree_class, words, pool, rounds, batch, seed):
+    """Build a tree from words, then each round delete batch live words and insert batch unseen ones from pool.
+
+    Returns the tree, its live words and one (nodes, traced bytes) row per round.
+    """
+    rng = random.Random(seed)
+    gc.collect()
+    tracemalloc.start()
+    tree = tree_class()
+    for word in words:
+        tree.insert(word)
+    live = list(words)
+    rows = [(tree.size(), tracemalloc.get_traced_memory()[0])]
+    fresh = iter(pool)
+    for _ in range(rounds):
+        rng.shuffle(live)
+        for word in live[-batch:]:
+            tree.delete(word)
+        del live[-batch:]
+        for _ in range(batch):
+            word = next(fresh)
+            tree.insert(word)
+            live.append(word)
+        gc.collect()
+        rows.append((tree.size(), tracemalloc.get_traced_memory()[0]))
+    tracemalloc.stop()
+    return tree, live, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=20000, help='live vocabulary size')
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--batch', type=int, default=5000, help='words replaced per round')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    everything = synthetic_words(args.words + args.rounds * args.batch, args.seed)
+    words, pool = everything[:args.words], everything[args.words:]
+
+    print(f"{args.words} live words, {args.batch} replaced per round")
+    for name, tree_class in TREES.items():
+        tree, live, rows = churn(tree_class, words, pool, args.rounds, args.batch, args.seed)
+        rebuilt = tree_class()
+        for word in live:
+            rebuilt.insert(word)
+        print(f"\n{name}")
+        print(f"{'round':>6}{'nodes':>12}{'traced KiB':>14}")
+        for round_number, (nodes, traced) in enumerate(rows):
+            print(f"{round_number:>6}{nodes:>12}{traced / 1024:>14.0f}")
+        print(f"fresh build of the final vocabulary: {rebuilt.size()} nodes")
+        del tree, rebuilt
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,2 @@
+"""The word lists the benchmarks share; they live in tree.ingest so the app and server can use them too."""
+from tree.ingest import DATA_DIR, LARGE_WORDS, SMALL_WORDS, default_word_file, load_words, synthetic_words  # noqa: F401
@@ -0,0 +1,78 @@
+"""Compare per-keystroke cost of a cursor against querying every typed prefix from the root.
+
+Each word is typed one character at a time, and after every keystroke the
+number of matches and the first 10 completions are read: from the root with
+count_prefix and iter_prefix, or from the cursor after push(char). Times are
+averaged by prefix length, so a cost that grows with the prefix shows up as a
+rising row. Long keys make the difference visible.
+
+Run from the repository root:
+    python -m benchmarks.cursor [--synthetic N] [--min-length 10] [--max-length 80]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import synthetic_words
+from tree.tries import PrefixTree
+from tree.ternary import TernaryTree
+from tree.radix import RadixTree
+
+TREES = {
+    'Trie': PrefixTree,
+    'Ternary': TernaryTree,
+    'Radix': RadixTree,
+}
+
+
+def type_from_root(tree, word, k, totals):
+    for length in range(1, len(word) + 1):
+        start = time.perf_counter()
+        prefix = word[:length]
+        tree.count_prefix(prefix)
+        list(tree.iter_prefix(prefix, k))
+        totals[length] += time.perf_counter() - start
+
+
+def type_with_cursor(tree, word, k, totals):
+    cursor = tree.cursor()
+    for length, char in enumerate(word, 1):
+        start = time.perf_counter()
+        cursor.push(char)
+        cursor.count()
+        list(cursor.completions(k))
+        totals[length] += time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--synthetic', type=int, default=20000, help='number of random words')
+    parser.add_argument('--min-length', type=int, default=10)
+    parser.add_argument('--max-length', type=int, default=80)
+    parser.add_argument('--typed', type=int, default=200, help='words typed per tree')
+    parser.add_argument('-k', type=int, default=10, help='completions read per keystroke')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    # Four letters make the first keystrokes match thousands of words, as short prefixes do in real lists
+    words = synthetic_words(args.synthetic, args.seed, alphabet='abcd',
+                            min_length=args.min_length, max_length=args.max_length)
+    typed = random.Random(args.seed).sample(words, args.typed)
+    columns = [length for length in (1, 5, 10, 20, 40, 80) if length <= args.max_length]
+    reaching = [sum(len(word) >= length for word in typed) or 1 for length in range(args.max_length + 1)]
+    print(f"{len(words)} words of {args.min_length}-{args.max_length} characters, "
+          f"us per keystroke at prefix length {columns}")
+    for name, tree_class in TREES.items():
+        tree = tree_class()
+        for rank, word in enumerate(words):
+            tree.insert(word, rank)
+        for label, typist in (('from root', type_from_root), ('cursor', type_with_cursor)):
+            totals = [0.0] * (args.max_length + 1)
+            for word in typed:
+                typist(tree, word, args.k, totals)
+            cells = ''.join(f"{totals[length] * 1e6 / reaching[length]:>9.1f}" for length in columns)
+            print(f"{name:<10}{label:<12}{cells}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Compare tree-walk fuzzy search against brute-force edit distance over the word list.
+
+Run from the repository root:
+    python -m benchmarks.fuzzy [--file data/words.csv] [--synthetic N] [--max-edits 2]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import load_words, synthetic_words
+from tree.tries import PrefixTree
+from tree.radix import RadixTree
+
+
+def edit_distance(a, b):
+    """Plain Levenshtein distance, the baseline a spell checker without a tree would run."""
+    row = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        new_row = [i]
+        for j, char_b in enumerate(b, 1):
+            new_row.append(min(new_row[j - 1] + 1, row[j] + 1, row[j - 1] + (char_a != char_b)))
+        row = new_row
+    return row[-1]
+
+
+def brute_force(words, query, max_edits):
+    matches = [(word, edit_distance(query, word)) for word in words]
+    return sorted((match for match in matches if match[1] <= max_edits), key=lambda match: (match[1], match[0]))
+
+
+def typo(word, rng):
+    """Return word with one random substitution, the usual shape of a keystroke mistake."""
+    if not word:
+        return word
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice('abcdefghijklmnopqrstuvwxyz') + word[i + 1:]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=None, help='word list CSV (defaults to data/words.csv when present)')
+    parser.add_argument('--synthetic', type=int, default=None, help='use N random words instead of a CSV')
+    parser.add_argument('--max-edits', type=int, default=2)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    words = synthetic_words(args.synthetic, args.seed) if args.synthetic else load_words(args.file)
+    rng = random.Random(args.seed)
+    queries = [typo(word, rng) for word in rng.choices(words, k=args.queries)]
+
+    start = time.perf_counter()
+    expected = [brute_force(words, query, args.max_edits) for query in queries]
+    brute_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    print(f"{len(words)} words, {len(queries)} queries, max_edits={args.max_edits}")
+    print(f"{'search':<14}{'ms/query':>12}{'nodes/query':>14}")
+    print(f"{'brute force':<14}{brute_ms:>12.2f}{'':>14}")
+    for name, tree_class in (('Trie', PrefixTree), ('Radix', RadixTree)):
+        tree = tree_class()
+        tree.insert_many(words)
+        nodes = 0
+        start = time.perf_counter()
+        for query, matches in zip(queries, expected):
+            results, visited = tree.fuzzy(query, args.max_edits)
+            nodes += visited
+            assert results == matches, query
+        elapsed = (time.perf_counter() - start) * 1000 / len(queries)
+        print(f"{name:<14}{elapsed:>12.2f}{nodes / len(queries):>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Compare sampling words with a full pandas load and shuffle against the streaming reservoir loader.
+
+The pandas path is what app.py used to do: read the whole CSV, dropna, strip
+quotes, filter non-alphabetic rows, shuffle every row and keep the first n.
+The streaming path is tree.ingest.sample_file. Both are timed, with
+tracemalloc peaks, for several sample sizes. Without --file a CSV of
+--synthetic words is written first, with quoted, repeated and
+non-alphabetic rows like the real list.
+
+Run from the repository root:
+    python -m benchmarks.ingest [--file data/words.csv | --synthetic N] [--sizes 1000 10000 100000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.common import synthetic_words
+from tree.ingest import sample_file
+
+
+def pandas_sample(path, size):
+    df = pd.read_csv(path, header=None, names=['word'])
+    df = df.dropna()
+    df['word'] = df['word'].str.strip('"')
+    df = df[df['word'].str.isalpha()]
+    return df.sample(frac=1, random_state=42).head(size)['word'].tolist()
+
+
+def measured(function, *args):
+    """Return (result, milliseconds, peak traced MB); the peak comes from a second, traced call so tracing never skews the time."""
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed * 1e3, peak / 1e6
+
+
+def write_word_file(path, count, seed):
+    """Write count synthetic rows: mostly words, some quoted, repeated or not alphabetic."""
+    rng = random.Random(seed)
+    words = synthetic_words(count, seed)
+    with open(path, 'w', encoding='utf-8') as csvfile:
+        for word in words:
+            roll = rng.random()
+            if roll < 0.1:
+                word = f'"{word}"'
+            elif roll < 0.15:
+                word = rng.choice(words)
+            elif roll < 0.17:
+                word += '-' + rng.choice(words)
+            csvfile.write(word + '\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=None, help='word list CSV to sample')
+    parser.add_argument('--synthetic', type=int, default=400000, help='rows of the generated CSV without --file')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='words to sample')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.file
+        if path is None:
+            path = os.path.join(directory, 'words.csv')
+            write_word_file(path, args.synthetic, args.seed)
+        print(f"{path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+        print(f"{'sample':>8}{'pandas ms':>11}{'pandas MB':>11}{'stream ms':>11}{'stream MB':>11}")
+        for size in args.sizes:
+            _, pandas_ms, pandas_mb = measured(pandas_sample, path, size)
+            _, stream_ms, stream_mb = measured(sample_file, path, size, args.seed)
+            print(f"{size:>8}{pandas_ms:>11.0f}{pandas_mb:>11.1f}{stream_ms:>11.0f}{stream_mb:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Drive the autocomplete server with concurrent keep-alive clients and report latency percentiles and QPS.
+
+Without --url a server is started on a free port with the same word options
+and stopped afterwards. The request mix follows autocomplete traffic: short
+prefixes from stored words for /top, limited and full /starts_with, and
+whole words for /find. Short prefixes repeat, so concurrent clients often ask
+the same question and the server's coalescing shows up in its counters.
+
+Run from the repository root:
+    python -m benchmarks.load [--tree Radix] [--synthetic N] [--connections 32] [--requests 5000] [--workers 2]
+    python -m benchmarks.load --url 127.0.0.1:8080
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from urllib.parse import quote
+
+from benchmarks.common import load_words, synthetic_words
+from tree.suite import percentile
+
+MIX = (('top', 0.5), ('starts_with_limit', 0.2), ('starts_with', 0.1), ('find', 0.2))
+
+
+def request_paths(words, count, seed):
+    """Return (kind, path) pairs drawn from MIX."""
+    rng = random.Random(seed)
+    kinds = rng.choices([kind for kind, _ in MIX], [share for _, share in MIX], k=count)
+    paths = []
+    for kind in kinds:
+        word = rng.choice(words)
+        prefix = quote(word[:rng.randint(1, 3)])
+        if kind == 'top':
+            paths.append((kind, f'/top?prefix={prefix}&k=10'))
+        elif kind == 'starts_with_limit':
+            paths.append((kind, f'/starts_with?prefix={prefix}&limit=20'))
+        elif kind == 'starts_with':
+            paths.append((kind, f'/starts_with?prefix={prefix}'))
+        else:
+            paths.append((kind, f'/find?word={quote(word)}'))
+    return paths
+
+
+async def fetch(reader, writer, path):
+    """Send one GET on an open connection and return the response body."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: load\r\n\r\n".encode())
+    await writer.drain()
+    length = 0
+    while True:
+        header = await reader.readline()
+        if header in (b'\r\n', b''):
+            break
+        name, _, value = header.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return await reader.readexactly(length)
+
+
+async def client(host, port, queue, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while queue:
+            kind, path = queue.pop()
+            start = time.perf_counter()
+            await fetch(reader, writer, path)
+            latencies.setdefault(kind, []).append(time.perf_counter() - start)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load(host, port, paths, connections):
+    """Run paths over connections clients; returns per-kind latencies in seconds, elapsed seconds and server stats."""
+    queue = list(reversed(paths))
+    latencies = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, queue, latencies) for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    reader, writer = await asyncio.open_connection(host, port)
+    stats = json.loads(await fetch(reader, writer, '/stats'))
+    writer.close()
+    await writer.wait_closed()
+    return latencies, elapsed, stats
+
+
+def start_server(args):
+    """Start server.py on a free port and return the process and its host and port."""
+    command = [sys.executable, 'server.py', '--tree', args.tree, '--port', '0', '--workers', str(args.workers)]
+    if args.synthetic:
+        command += ['--synthetic', str(args.synthetic), '--seed', str(args.seed)]
+    elif args.file:
+        command += ['--file', args.file]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()  # "Serving ... on http://host:port"
+    if not line:
+        raise RuntimeError("server exited before listening")
+    host, port = line.rsplit('//', 1)[1].strip().rsplit(':', 1)
+    return process, host, int(port)
+
+
+def report(latencies, elapsed, stats):
+    print(f"{'requests':<20}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    every = [sample for samples in latencies.values() for sample in samples]
+    for kind, _ in MIX + (('all', None),):
+        samples = sorted(every if kind == 'all' else latencies.get(kind, []))
+        if samples:
+            print(f"{kind:<20}{len(samples):>8}{percentile(samples, 0.5) * 1e3:>10.2f}"
+                  f"{percentile(samples, 0.99) * 1e3:>10.2f}{samples[-1] * 1e3:>10.2f}")
+    print(f"{len(every) / elapsed:.0f} QPS over {elapsed:.2f}s; server counters: "
+          f"{stats['coalesced']} coalesced, {stats['offloaded']} offloaded of {stats['requests']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default=None, help='host:port of a running server; omit to start one')
+    parser.add_argument('--tree', default='Radix', help='tree for the started server')
+    parser.add_argument('--file', default=None, help='word list CSV (defaults to data/words.csv when present)')
+    parser.add_argument('--synthetic', type=int, default=None, help='use N random words instead of a CSV')
+    parser.add_argument('--workers', type=int, default=2, help='worker processes of the started server')
+    parser.add_argument('--connections', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    words = synthetic_words(args.synthetic, args.seed) if args.synthetic else load_words(args.file)
+    paths = request_paths(words, args.requests, args.seed)
+    process = None
+    if args.url:
+        host, port = args.url.rsplit(':', 1)
+    else:
+        process, host, port = start_server(args)
+    try:
+        report(*asyncio.run(run_load(host, int(port), paths, args.connections)))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Time find and starts_with lookups on each structure.
+
+Run from the repository root:
+    python -m benchmarks.lookup [--file data/words.csv] [--limit N]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import load_words
+from tree.tries import PrefixTree
+from tree.ternary import TernaryTree
+from tree.radix import RadixTree
+from tree.louds import LoudsTrie
+
+
+def build_trie(words):
+    tree = PrefixTree()
+    for word in words:
+        tree.insert(word)
+    return tree
+
+
+def build_frozen(words):
+    tree = PrefixTree(compact=True)
+    for word in words:
+        tree.insert(word)
+    return tree.freeze()
+
+
+def build_sorted(tree_class):
+    def build(words):
+        tree = tree_class()
+        tree.insert_many(words)
+        return tree
+    return build
+
+
+STRUCTURES = {
+    'Trie': build_trie,
+    'Trie (frozen)': build_frozen,
+    'Trie (LOUDS)': lambda words: LoudsTrie.from_sorted(sorted(set(words))),
+    'Ternary': build_sorted(TernaryTree),
+    'Radix': build_sorted(RadixTree),
+}
+
+
+def time_per_call(function, arguments):
+    """Return the mean wall time in microseconds of calling function on each argument."""
+    start = time.perf_counter()
+    for argument in arguments:
+        function(argument)
+    return (time.perf_counter() - start) * 1e6 / max(len(arguments), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=None, help='word list CSV (defaults to data/words.csv when present)')
+    parser.add_argument('--limit', type=int, default=None, help='only load the first N words')
+    parser.add_argument('--queries', type=int, default=10000, help='number of lookups per workload')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    words = load_words(args.file, args.limit)
+    rng = random.Random(args.seed)
+    hits = [rng.choice(words) for _ in range(args.queries)]
+    misses = [word + 'qz' for word in hits]
+    prefixes = [word[:3] for word in hits[:max(args.queries // 100, 1)]]
+
+    print(f"{len(words)} words")
+    print(f"{'structure':<20}{'find hit us':>14}{'find miss us':>14}{'prefix3 us':>14}")
+    for name, build in STRUCTURES.items():
+        structure = build(words)
+        print(f"{name:<20}"
+              f"{time_per_call(structure.find, hits):>14.2f}"
+              f"{time_per_call(structure.find, misses):>14.2f}"
+              f"{time_per_call(structure.starts_with, prefixes):>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
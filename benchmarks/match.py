@@ -0,0 +1,48 @@
+"""Compare TernaryTree.match against listing every word and regex-filtering it.
+
+Run from the repository root:
+    python -m benchmarks.match [--file data/words.csv] [--synthetic N]
+"""
+import argparse
+import re
+import time
+
+from benchmarks.common import load_words, synthetic_words
+from tree.ternary import TernaryTree
+
+PATTERNS = ['c?t', 'b??k', 'th*', '*ing', 's*e?', '?a?e', 'pre*ion', '*']
+
+
+def to_regex(pattern):
+    return re.compile(''.join('.' if char == '?' else '.*' if char == '*' else re.escape(char) for char in pattern))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=None, help='word list CSV (defaults to data/words.csv when present)')
+    parser.add_argument('--synthetic', type=int, default=None, help='use N random words instead of a CSV')
+    args = parser.parse_args(argv)
+
+    words = synthetic_words(args.synthetic) if args.synthetic else load_words(args.file)
+    tree = TernaryTree()
+    tree.insert_many(words)
+    total_nodes = tree.size()
+
+    print(f"{len(words)} words, {total_nodes} nodes")
+    print(f"{'pattern':<10}{'matches':>9}{'match nodes':>13}{'match ms':>10}{'scan nodes':>12}{'scan ms':>10}")
+    for pattern in PATTERNS:
+        start = time.perf_counter()
+        results, nodes_traversed = tree.match(pattern)
+        match_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        regex = to_regex(pattern)
+        scanned = [word for word in tree.starts_with('')[0] if regex.fullmatch(word)]
+        scan_ms = (time.perf_counter() - start) * 1000
+        assert scanned == results, pattern
+
+        print(f"{pattern:<10}{len(results):>9}{nodes_traversed:>13}{match_ms:>10.2f}{total_nodes:>12}{scan_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Report bytes-per-word for each tree layout.
+
+Run from the repository root:
+    python -m benchmarks.memory [--file data/words.csv] [--limit N]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.common import load_words
+from tree.tries import PrefixTree
+from tree.ternary import TernaryTree
+from tree.radix import RadixTree
+from tree.louds import LoudsTrie
+from tree.dawg import DAWG
+
+
+def measure(build, words):
+    """Build a structure under tracemalloc and return it with the bytes it retained."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    structure = build(words)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return structure, after - before
+
+
+def build_tree(tree_factory):
+    def build(words):
+        tree = tree_factory()
+        for word in words:
+            tree.insert(word)
+        return tree
+    return build
+
+
+def build_sorted(tree_class):
+    def build(words):
+        tree = tree_class()
+        tree.insert_many(words)
+        return tree
+    return build
+
+
+def build_frozen(words):
+    return build_tree(lambda: PrefixTree(compact=True))(words).freeze()
+
+
+LAYOUTS = {
+    'Trie': build_tree(PrefixTree),
+    'Trie (compact)': build_tree(lambda: PrefixTree(compact=True)),
+    'Trie (frozen)': build_frozen,
+    'Trie (LOUDS)': lambda words: LoudsTrie.from_sorted(sorted(set(words))),
+    'Ternary': build_sorted(TernaryTree),
+    'Radix': build_sorted(RadixTree),
+    'DAWG': build_sorted(DAWG),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=None, help='word list CSV (defaults to data/words.csv when present)')
+    parser.add_argument('--limit', type=int, default=None, help='only load the first N words')
+    args = parser.parse_args(argv)
+
+    words = load_words(args.file, args.limit)
+    print(f"{len(words)} words")
+    print(f"{'layout':<20}{'nodes':>12}{'bytes':>16}{'bytes/word':>14}")
+    for name, build in LAYOUTS.items():
+        structure, nbytes = measure(build, words)
+        print(f"{name:<20}{structure.size():>12}{nbytes:>16}{nbytes / max(len(words), 1):>14.1f}")
+        del structure
+
+
+if __name__ == '__main__':
+    main()
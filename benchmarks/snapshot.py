@@ -0,0 +1,68 @@
+"""Compare rebuilding each tree from the word list against opening a saved snapshot.
+
+Run from the repository root:
+    python -m benchmarks.snapshot [--file data/words.csv] [--synthetic N] [--queries 1000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import load_words, synthetic_words
+from tree.tries import PrefixTree
+from tree.ternary import TernaryTree
+from tree.radix import RadixTree
+
+TREES = {
+    'Trie': PrefixTree,
+    'Ternary': TernaryTree,
+    'Radix': RadixTree,
+}
+
+
+def timed_ms(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def rebuild(tree_class, path, synthetic, seed):
+    """Cold start the way app.py does today: read the words, then insert them."""
+    words = synthetic_words(synthetic, seed) if synthetic else load_words(path)
+    tree = tree_class()
+    tree.insert_many(words)
+    return tree
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=None, help='word list CSV (defaults to data/words.csv when present)')
+    parser.add_argument('--synthetic', type=int, default=None, help='use N random words instead of a CSV')
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    words = synthetic_words(args.synthetic, args.seed) if args.synthetic else load_words(args.file)
+    queries = random.Random(args.seed).choices(words, k=args.queries)
+    prefixes = [word[:2] for word in queries[:50]]
+    print(f"{len(words)} words, {len(queries)} find queries, {len(prefixes)} prefix queries")
+    print(f"{'tree':<18}{'cold start ms':>15}{'file KiB':>10}{'find us':>10}{'prefix ms':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, tree_class in TREES.items():
+            tree, build_ms = timed_ms(lambda: rebuild(tree_class, args.file, args.synthetic, args.seed))
+            path = os.path.join(directory, f'{name}.tree')
+            tree.save(path)
+            mapped, load_ms = timed_ms(lambda: tree_class.load(path))
+            for label, structure, cold_ms in ((name, tree, build_ms), (mapped.name, mapped, load_ms)):
+                _, find_ms = timed_ms(lambda: [structure.find(word) for word in queries])
+                _, prefix_ms = timed_ms(lambda: [structure.starts_with(prefix) for prefix in prefixes])
+                size = f"{os.path.getsize(path) / 1024:.0f}" if structure is mapped else '-'
+                print(f"{label:<18}{cold_ms:>15.2f}{size:>10}{find_ms * 1000 / len(queries):>10.1f}"
+                      f"{prefix_ms / len(prefixes):>11.3f}")
+            mapped.close()
+            del tree
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Headless benchmark suite: insert, find, starts_with and memory for every tree over a sweep of datasets.
+
+Run from the repository root:
+    python -m benchmarks.suite [--datasets small synthetic:10000 ...] [--trees Trie Radix]
+                               [--repeats 5] [--warmup 1] [--queries 1000]
+                               [--format table|json|csv] [--output FILE]
+
+The workloads, dataset specs and result rows are described in tree/suite.py.
+"""
+import argparse
+
+from tree.suite import DEFAULT_DATASETS, TREES, WORKLOADS, run_suite, to_csv, to_json
+
+
+def to_table(rows):
+    """Format result rows as a plain-text table for the terminal."""
+    lines = [f"{'dataset':<18}{'words':>8}  {'tree':<9}{'workload':<13}{'median':>12}{'p90':>12}{'p99':>12}  unit"]
+    for row in rows:
+        if row['workload'] == 'memory':
+            lines.append(f"{row['dataset']:<18}{row['words']:>8}  {row['tree']:<9}{'memory':<13}"
+                         f"{'-':>12}{'-':>12}{'-':>12}  peak {row['peak_bytes']} B, retained {row['retained_bytes']} B")
+        else:
+            lines.append(f"{row['dataset']:<18}{row['words']:>8}  {row['tree']:<9}{row['workload']:<13}"
+                         f"{row['median']:>12.0f}{row['p90']:>12.0f}{row['p99']:>12.0f}  {row['unit']}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--datasets', nargs='+', default=list(DEFAULT_DATASETS))
+    parser.add_argument('--trees', nargs='+', choices=list(TREES), default=list(TREES))
+    parser.add_argument('--workloads', nargs='+', choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--queries', type=int, default=1000, help='find queries per repetition')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--format', choices=('table', 'json', 'csv'), default='table')
+    parser.add_argument('--output', default=None, help='write to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    settings = {key: getattr(args, key) for key in ('datasets', 'trees', 'workloads', 'repeats', 'warmup', 'queries', 'seed')}
+    rows = run_suite(args.datasets, args.trees, args.workloads, args.repeats, args.warmup, args.queries, args.seed)
+    if args.format == 'json':
+        text = to_json(rows, settings)
+    elif args.format == 'csv':
+        text = to_csv(rows)
+    else:
+        text = to_table(rows)
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as out:
+            out.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Compare weighted top_k autocomplete against listing every match with starts_with.
+
+Words are weighted by their rank in a frequency-ordered list (the bundled
+4000-word CSV is ordered most common first).
+
+Run from the repository root:
+    python -m benchmarks.topk [--file data/4000-most-common-english-words-csv.csv] [-k 10]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import SMALL_WORDS, load_words
+from tree.tries import PrefixTree
+from tree.ternary import TernaryTree
+from tree.radix import RadixTree
+
+TREES = {
+    'Trie': PrefixTree,
+    'Ternary': TernaryTree,
+    'Radix': RadixTree,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=SMALL_WORDS, help='frequency-ordered word list CSV')
+    parser.add_argument('-k', type=int, default=10, help='number of completions per query')
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    words = load_words(args.file)
+    rng = random.Random(args.seed)
+    prefixes = [word[:rng.randint(1, 3)] for word in rng.choices(words, k=args.queries)]
+
+    print(f"{len(words)} words, {len(prefixes)} prefixes, k={args.k}")
+    print(f"{'tree':<10}{'top_k nodes':>14}{'top_k us':>12}{'subtree nodes':>20}{'starts_with us':>16}")
+    for name, tree_class in TREES.items():
+        tree = tree_class()
+        for rank, word in enumerate(words):
+            tree.insert(word, len(words) - rank)
+
+        top_nodes = 0
+        start = time.perf_counter()
+        for prefix in prefixes:
+            top_nodes += tree.top_k(prefix, args.k)[1]
+        top_us = (time.perf_counter() - start) * 1e6 / len(prefixes)
+
+        all_nodes = 0
+        start = time.perf_counter()
+        for prefix in prefixes:
+            tree.starts_with(prefix)
+        all_us = (time.perf_counter() - start) * 1e6 / len(prefixes)
+        for prefix in prefixes:
+            # Asking for every word opens the whole subtree, which is what starts_with walks
+            all_nodes += tree.top_k(prefix, len(words))[1]
+
+        print(f"{name:<10}{top_nodes / len(prefixes):>14.1f}{top_us:>12.1f}"
+              f"{all_nodes / len(prefixes):>20.1f}{all_us:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Compare the explicit-stack traversals against the recursive ones they replaced.
+
+Run from the repository root:
+    python -m benchmarks.traversal [--synthetic N] [--deep LENGTH]
+"""
+import argparse
+import time
+
+from benchmarks.common import load_words, synthetic_words
+from tree.tries import PrefixTree
+from tree.ternary import TernaryTree
+from tree.radix import RadixTree
+from tree.traversal import collect_ternary_words, collect_words, count_nodes, count_ternary_nodes
+
+
+# The recursive helpers as they were before the traversal engine, kept as a baseline
+def recursive_trie_words(node, text, words):
+    visited = 1
+    if node.is_word:
+        words.append(text)
+    for char, child in node.children.items():
+        visited += recursive_trie_words(child, text + char, words)
+    return visited
+
+
+def recursive_radix_words(node, text, words):
+    if node.is_word:
+        words.append(text)
+    for child in node.children.values():
+        recursive_radix_words(child, text + child.text, words)
+
+
+def recursive_ternary_words(node, prefix, words):
+    if node is None:
+        return
+    recursive_ternary_words(node.left, prefix, words)
+    if node.is_end_of_string:
+        words.append(prefix + node.data)
+    recursive_ternary_words(node.equal, prefix + node.data, words)
+    recursive_ternary_words(node.right, prefix, words)
+
+
+def recursive_size(node):
+    return 1 + sum(recursive_size(child) for child in node.children.values())
+
+
+def recursive_ternary_size(node):
+    if not node:
+        return 0
+    return 1 + recursive_ternary_size(node.left) + recursive_ternary_size(node.equal) + recursive_ternary_size(node.right)
+
+
+CASES = {
+    'Trie': (PrefixTree,
+             lambda tree: recursive_trie_words(tree.root, '', []),
+             lambda tree: collect_words(tree.root, '', []),
+             lambda tree: recursive_size(tree.root),
+             lambda tree: count_nodes(tree.root)),
+    'Ternary': (TernaryTree,
+                lambda tree: recursive_ternary_words(tree.root, '', []),
+                lambda tree: collect_ternary_words(tree.root, '', []),
+                lambda tree: recursive_ternary_size(tree.root),
+                lambda tree: count_ternary_nodes(tree.root)),
+    'Radix': (RadixTree,
+              lambda tree: recursive_radix_words(tree.root, '', []),
+              lambda tree: collect_words(tree.root, '', [], edge_text=True),
+              lambda tree: recursive_size(tree.root),
+              lambda tree: count_nodes(tree.root)),
+}
+
+
+def ns_per_node(function, tree, nodes, repeat=3):
+    """Return the best-of-repeat time per node in nanoseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        function(tree)
+        best = min(best, time.perf_counter_ns() - start)
+    return best / nodes
+
+
+def survives(function, tree):
+    try:
+        function(tree)
+        return 'ok'
+    except RecursionError:
+        return 'RecursionError'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=None, help='word list CSV (defaults to data/words.csv when present)')
+    parser.add_argument('--synthetic', type=int, default=None, help='use N random words instead of a CSV')
+    parser.add_argument('--deep', type=int, default=5000, help='length of the long key used for the depth check')
+    args = parser.parse_args(argv)
+
+    words = synthetic_words(args.synthetic) if args.synthetic else load_words(args.file)
+    print(f"{len(words)} words, deep key of {args.deep} characters")
+    print(f"{'tree':<10}{'collect rec ns':>16}{'collect iter ns':>17}{'size rec ns':>14}{'size iter ns':>15}"
+          f"{'deep rec':>17}{'deep iter':>12}")
+    for name, (tree_class, old_collect, new_collect, old_size, new_size) in CASES.items():
+        tree = tree_class()
+        tree.insert_many(words)
+        nodes = tree.size()
+        deep = tree_class()
+        deep.insert('a' * args.deep)
+        print(f"{name:<10}"
+              f"{ns_per_node(old_collect, tree, nodes):>16.1f}{ns_per_node(new_collect, tree, nodes):>17.1f}"
+              f"{ns_per_node(old_size, tree, nodes):>14.1f}{ns_per_node(new_size, tree, nodes):>15.1f}"
+              f"{survives(old_collect, deep):>17}{survives(new_collect, deep):>12}")
+
+
+if __name__ == '__main__':
+    main()
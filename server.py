@@ -0,0 +1,220 @@
+"""Headless autocomplete server: loads one tree and answers find, starts_with and top-N over HTTP.
+
+Run from the repository root:
+    python server.py [--tree Radix] [--file data/words.csv | --synthetic N] [--port 8080] [--workers 2]
+
+Endpoints (GET, JSON responses):
+    /find?word=about               {"word": "about", "found": true}
+    /starts_with?prefix=ab         {"prefix": "ab", "count": 24, "words": [...], "nodes": 41}
+    /starts_with?prefix=ab&limit=5 only the first 5 words in order, read lazily
+    /top?prefix=ab&k=5             {"prefix": "ab", "words": [["about", 3990], ...], "nodes": 12}
+    /stats                         request, coalesced and offloaded counters
+
+Words are weighted by their position in the word list, first heaviest, so
+/top favours the most common words of a frequency-ordered list.
+
+Everything runs on one asyncio event loop using only the standard library.
+An identical request that arrives while another is still being answered
+waits for that answer instead of repeating the work. A starts_with without a
+limit whose prefix holds more than --offload words is collected and encoded
+by a worker process reading a memory-mapped snapshot of the tree, so the
+loop keeps answering small queries meanwhile.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import signal
+import tempfile
+from urllib.parse import parse_qsl, urlsplit
+
+from tree.ingest import load_words, synthetic_words
+from tree.tries import PrefixTree
+from tree.ternary import TernaryTree
+from tree.radix import RadixTree
+
+TREES = {
+    'Trie': PrefixTree,
+    'Ternary': TernaryTree,
+    'Radix': RadixTree,
+}
+
+OFFLOAD_WORDS = 2000  # starts_with answers larger than this are collected in a worker process
+DEFAULT_TOP = 10
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+_snapshot = None  # The memory-mapped tree of a worker process
+
+
+def open_worker_snapshot(tree_name, path):
+    """Pool initializer: map the server's snapshot once per worker process."""
+    global _snapshot
+    _snapshot = TREES[tree_name].load(path)
+
+
+def collect_words_body(prefix):
+    """Return the JSON body of a full starts_with answer, built in a worker from its snapshot."""
+    words, nodes = _snapshot.starts_with(prefix)
+    return json.dumps({'prefix': prefix, 'count': len(words), 'words': words, 'nodes': nodes}).encode()
+
+
+def build_weighted(tree_class, words):
+    """Return a tree of words weighted by list position, the first word heaviest."""
+    tree = tree_class()
+    words = list(dict.fromkeys(words))  # A repeated word keeps the weight of its first appearance
+    for rank, word in enumerate(words):
+        tree.insert(word, len(words) - rank)
+    return tree
+
+
+def encode(payload):
+    return json.dumps(payload).encode()
+
+
+class CompletionService:
+    """Answers HTTP queries against one read-only tree.
+
+    executor runs collect_words_body for large starts_with answers; without
+    one, every answer is computed on the event loop.
+    """
+
+    def __init__(self, tree, executor=None, offload=OFFLOAD_WORDS):
+        self.tree = tree
+        self.executor = executor
+        self.offload = offload
+        self.in_flight = {}  # (path, sorted params) -> task producing (status, body)
+        self.counters = {'requests': 0, 'coalesced': 0, 'offloaded': 0}
+
+    async def answer(self, path, params):
+        """Return (status, body) for a request, sharing the answer of an identical request still in flight."""
+        self.counters['requests'] += 1
+        key = (path, tuple(sorted(params.items())))
+        task = self.in_flight.get(key)
+        if task is not None:
+            self.counters['coalesced'] += 1
+        else:
+            task = asyncio.ensure_future(self._compute(path, params))
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        # Shielded, so one client hanging up does not cancel the answer others are waiting for
+        return await asyncio.shield(task)
+
+    async def _compute(self, path, params):
+        try:
+            if path == '/find':
+                if 'word' not in params:
+                    return 400, encode({'error': 'missing word'})
+                word = params['word']
+                return 200, encode({'word': word, 'found': self.tree.find(word) is not None})
+            if path == '/starts_with':
+                return await self._starts_with(params.get('prefix', ''), params.get('limit'))
+            if path == '/top':
+                prefix = params.get('prefix', '')
+                results, nodes = self.tree.top_k(prefix, int(params.get('k', DEFAULT_TOP)))
+                return 200, encode({'prefix': prefix, 'words': results, 'nodes': nodes})
+            if path == '/stats':
+                return 200, encode(dict(self.counters, words=len(self.tree), in_flight=len(self.in_flight)))
+        except ValueError as error:
+            return 400, encode({'error': str(error)})
+        return 404, encode({'error': f'unknown path {path}'})
+
+    async def _starts_with(self, prefix, limit):
+        count = self.tree.count_prefix(prefix)
+        if limit is not None:
+            words = list(self.tree.iter_prefix(prefix, int(limit)))
+            return 200, encode({'prefix': prefix, 'count': count, 'words': words})
+        if self.executor is not None and count > self.offload:
+            self.counters['offloaded'] += 1
+            loop = asyncio.get_running_loop()
+            return 200, await loop.run_in_executor(self.executor, collect_words_body, prefix)
+        words, nodes = self.tree.starts_with(prefix)
+        return 200, encode({'prefix': prefix, 'count': count, 'words': sorted(words), 'nodes': nodes})
+
+    async def handle(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until the client closes it or asks to."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode('latin-1').split()
+                keep_alive = len(parts) == 3 and parts[2] == 'HTTP/1.1'
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    if name.strip().lower() == 'connection':
+                        keep_alive = value.strip().lower() == 'keep-alive'
+                if len(parts) != 3:
+                    status, body = 400, encode({'error': 'malformed request line'})
+                elif parts[0] != 'GET':
+                    status, body = 405, encode({'error': 'only GET is served'})
+                else:
+                    url = urlsplit(parts[1])
+                    status, body = await self.answer(url.path, dict(parse_qsl(url.query, keep_blank_values=True)))
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(body)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(service, host, port):
+    """Serve until SIGINT or SIGTERM; prints the bound address first so scripts can read it."""
+    server = await asyncio.start_server(service.handle, host, port)
+    host, port = server.sockets[0].getsockname()[:2]
+    print(f"Serving {len(service.tree)} words ({service.tree.name}) on http://{host}:{port}", flush=True)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C still raises KeyboardInterrupt
+    async with server:
+        await stop.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tree', choices=sorted(TREES), default='Radix')
+    parser.add_argument('--file', default=None, help='word list CSV (defaults to data/words.csv when present)')
+    parser.add_argument('--synthetic', type=int, default=None, help='serve N random words instead of a CSV')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080, help='0 picks a free port')
+    parser.add_argument('--workers', type=int, default=2, help='processes for large answers; 0 keeps all work on the loop')
+    parser.add_argument('--offload', type=int, default=OFFLOAD_WORDS, help='answers above this many words are offloaded')
+    args = parser.parse_args(argv)
+
+    words = synthetic_words(args.synthetic, args.seed) if args.synthetic else load_words(args.file)
+    tree = build_weighted(TREES[args.tree], words)
+    with tempfile.TemporaryDirectory() as directory:
+        executor = None
+        if args.workers:
+            path = os.path.join(directory, 'tree.snapshot')
+            tree.save(path)
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=args.workers, mp_context=multiprocessing.get_context('spawn'),
+                initializer=open_worker_snapshot, initargs=(args.tree, path))
+            list(executor.map(abs, range(args.workers)))  # Start the workers now rather than on the first large prefix
+        try:
+            asyncio.run(serve(CompletionService(tree, executor, args.offload), args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import server
+from server import CompletionService, build_weighted, open_worker_snapshot
+from tree.radix import RadixTree
+
+WORDS = ['bad', 'bat', 'bath', 'bathroom', 'battle', 'battery', 'cat', 'cage', 'a']
+
+
+class ServerTest(unittest.TestCase):
+
+    def forget_snapshot(self):
+        """Unmap the snapshot a test opened in this process and reset the module global, as in a fresh worker."""
+        if server._snapshot is not None:
+            server._snapshot.close()
+            server._snapshot = None
+
+    def test_queries_and_coalescing(self):
+        """The service answers each endpoint, shares identical in-flight answers and offloads large ones."""
+        tree = build_weighted(RadixTree, WORDS)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.addCleanup(self.forget_snapshot)  # Cleanups run last-in first-out, so this unmaps before the removal
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            path = os.path.join(directory, 'words.snapshot')
+            tree.save(path)
+            open_worker_snapshot('Radix', path)
+            service = CompletionService(tree, executor, offload=3)
+
+            async def ask():
+                first, second, small = await asyncio.gather(
+                    service.answer('/starts_with', {'prefix': 'b'}),
+                    service.answer('/starts_with', {'prefix': 'b'}),
+                    service.answer('/starts_with', {'prefix': 'c'}))
+                top = await service.answer('/top', {'prefix': 'ba', 'k': '2'})
+                find = await service.answer('/find', {'word': 'bath'})
+                missing = await service.answer('/find', {})
+                return first, second, small, top, find, missing
+
+            first, second, small, top, find, missing = asyncio.run(ask())
+        self.assertEqual(first, second)
+        self.assertEqual(json.loads(first[1])['words'], sorted(w for w in WORDS if w.startswith('b')))
+        self.assertEqual(json.loads(small[1])['words'], ['cage', 'cat'])
+        self.assertEqual(json.loads(top[1])['words'], [['bad', 9], ['bat', 8]])
+        self.assertTrue(json.loads(find[1])['found'])
+        self.assertEqual(missing[0], 400)
+        self.assertEqual(service.counters['coalesced'], 1)
+        self.assertEqual(service.counters['offloaded'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
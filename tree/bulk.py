@@ -0,0 +1,35 @@
+import gc
+from contextlib import contextmanager
+
+
+@contextmanager
+def paused_gc():
+    """Suspend the cyclic garbage collector while a bulk load allocates many acyclic nodes."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def common_prefix_length(word, previous):
+    """Return how many leading characters word shares with previous."""
+    limit = min(len(word), len(previous))
+    common = 0
+    while common < limit and word[common] == previous[common]:
+        common += 1
+    return common
+
+
+def sorted_unique(words):
+    """Yield words that must already be sorted, dropping repeats; raises ValueError on disorder."""
+    previous = None
+    for word in words:
+        if previous is not None and word <= previous:
+            if word == previous:
+                continue
+            raise ValueError(f"from_sorted needs sorted input: {word!r} came after {previous!r}")
+        yield word
+        previous = word
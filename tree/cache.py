@@ -0,0 +1,106 @@
+"""An opt-in LRU cache of starts_with results, in front of any of the tree classes.
+
+Short prefixes such as "s" or "co" match a large share of the dictionary,
+and every starts_with call collects those words again. CachedTree keeps
+recent results in sorted order, least recently used first, and bounds them
+by the total number of words held rather than the number of prefixes. A
+prefix that is not cached but extends a cached one is cut out of the cached
+list with a binary search and the tree's count_prefix, without visiting
+the subtree.
+
+Results are only valid for the tree as it was when they were collected.
+Every tree bumps ``generation`` on insert, insert_many, a successful delete
+and rebalance, so the cache empties itself exactly when that number moves.
+"""
+from bisect import bisect_left
+from collections import OrderedDict
+
+DEFAULT_MAX_WORDS = 100000
+
+
+class CachedTree:
+    """Wraps a tree so repeated starts_with calls are answered from a bounded LRU of results.
+
+    Every other attribute is the wrapped tree's, so inserts and deletes go
+    through the wrapper as usual and invalidate the cache.
+    """
+
+    def __init__(self, tree, max_words=DEFAULT_MAX_WORDS):
+        self.tree = tree
+        self.max_words = max_words
+        self._results = OrderedDict()  # prefix -> sorted words, least recently used first
+        self._words = 0
+        self._generation = tree.generation
+        self.hits = 0
+        self.filtered_hits = 0  # Served from a cached shorter prefix
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __getattr__(self, name):
+        if name == 'tree':  # Not set yet, e.g. while unpickling
+            raise AttributeError(name)
+        return getattr(self.tree, name)
+
+    def __len__(self):
+        return len(self.tree)
+
+    def starts_with(self, prefix, stats=None):
+        """Return a sorted list of all words starting with prefix and the count of nodes traversed.
+
+        Answers from the cache traverse no nodes. A QueryStats call is passed to
+        the tree uncached so its counters describe the tree's own work.
+        """
+        if stats is not None:
+            return self.tree.starts_with(prefix, stats)
+        if self.tree.generation != self._generation:
+            self.clear()
+            self._generation = self.tree.generation
+            self.invalidations += 1
+        words = self._results.get(prefix)
+        if words is not None:
+            self.hits += 1
+            self._results.move_to_end(prefix)
+            return list(words), 0
+        for length in range(len(prefix) - 1, -1, -1):
+            shorter = self._results.get(prefix[:length])
+            if shorter is not None:
+                self.filtered_hits += 1
+                self._results.move_to_end(prefix[:length])
+                start = bisect_left(shorter, prefix)
+                words = shorter[start:start + self.tree.count_prefix(prefix)]
+                self._store(prefix, words)
+                return list(words), 0
+        self.misses += 1
+        words, nodes_traversed = self.tree.starts_with(prefix)
+        words = sorted(words)
+        self._store(prefix, words)
+        return list(words), nodes_traversed
+
+    def _store(self, prefix, words):
+        """Cache words for prefix, evicting least recently used results until the total fits."""
+        if len(words) > self.max_words:
+            return
+        self._results[prefix] = words
+        self._words += len(words)
+        while self._words > self.max_words:
+            _, evicted = self._results.popitem(last=False)
+            self._words -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every cached result; the counters are kept."""
+        self._results.clear()
+        self._words = 0
+
+    def cache_info(self):
+        """Return the hit, miss and eviction counters and the cache's current size as a dict."""
+        return {
+            'hits': self.hits,
+            'filtered_hits': self.filtered_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'prefixes': len(self._results),
+            'words': self._words,
+        }
@@ -0,0 +1,197 @@
+"""Keystroke cursors: a prefix held as a position in a tree, extended and shortened one character at a time.
+
+An autocomplete box asks for "b", "ba", "bat", ... in turn. A cursor keeps
+the node each of those prefixes reached, so push(char) takes one step from
+the last position and pop() returns to the one before, and neither depends on
+how long the prefix already is. A Radix position is a node plus how many
+characters of its edge label have been matched, since a prefix can end
+partway along an edge. Completions, counts and top-k are then read from the
+current position without walking the prefix again.
+
+A cursor notices when its tree's ``generation`` changes and walks its prefix
+again from the root on the next call.
+"""
+from itertools import islice
+
+from tree.ranking import top_ternary_words, top_words
+from tree.traversal import iter_ternary_words, iter_words, seek_ternary_words, seek_words
+
+
+class Cursor:
+    """The shared part of the tree cursors; positions are None once no stored word has the prefix."""
+
+    def __init__(self, tree, prefix=''):
+        self.tree = tree
+        self.generation = tree.generation
+        self._chars = []
+        self._positions = [self._start()]
+        for char in prefix:
+            self.push(char)
+
+    @property
+    def prefix(self):
+        return ''.join(self._chars)
+
+    def __len__(self):
+        return len(self._chars)
+
+    def _sync(self):
+        """Walk the prefix again if the tree changed since the positions were taken."""
+        if self.tree.generation != self.generation:
+            chars = self._chars
+            self.generation = self.tree.generation
+            self._chars = []
+            self._positions = [self._start()]
+            for char in chars:
+                self.push(char)
+
+    def push(self, char):
+        """Extend the prefix by char; returns whether any stored word still starts with it."""
+        self._sync()
+        position = self._positions[-1]
+        position = None if position is None else self._step(position, char)
+        self._chars.append(char)
+        self._positions.append(position)
+        return position is not None
+
+    def pop(self):
+        """Remove and return the last character of the prefix; raises IndexError when it is empty."""
+        if not self._chars:
+            raise IndexError("pop from an empty cursor")
+        self._sync()
+        self._positions.pop()
+        return self._chars.pop()
+
+    def _current(self):
+        self._sync()
+        return self._positions[-1]
+
+    def completions(self, limit=None):
+        """Lazily yield up to limit words starting with the prefix in lexicographic order."""
+        position = self._current()
+        if position is None:
+            return iter(())
+        return islice(self._words(position), limit)
+
+
+class TrieCursor(Cursor):
+    """A cursor over a PrefixTree; a position is the node the prefix spells."""
+
+    def _start(self):
+        return self.tree.root
+
+    def _step(self, node, char):
+        return node.children.get(char)
+
+    def _words(self, node):
+        return iter_words(seek_words(node, self.prefix))
+
+    def is_word(self):
+        """Return whether the prefix itself is a stored word."""
+        node = self._current()
+        return node is not None and node.is_word
+
+    def count(self):
+        """Return how many words start with the prefix."""
+        node = self._current()
+        return node.count if node is not None else 0
+
+    def top(self, k):
+        """Return the k heaviest words starting with the prefix as (word, weight) pairs."""
+        node = self._current()
+        return top_words(node, self.prefix, k)[0] if node is not None else []
+
+
+class RadixCursor(Cursor):
+    """A cursor over a RadixTree; a position is (node, matched), the characters matched of node's edge label."""
+
+    def _start(self):
+        return self.tree.root, 0
+
+    def _step(self, position, char):
+        node, matched = position
+        if matched < len(node.text):
+            return (node, matched + 1) if node.text[matched] == char else None
+        child = node.children.get(char)
+        return None if child is None else (child, 1)
+
+    def _spelled(self, position):
+        """Return the text spelled down to the node, which runs past the prefix when it ends mid-edge."""
+        node, matched = position
+        return self.prefix + node.text[matched:]
+
+    def _words(self, position):
+        return iter_words(seek_words(position[0], self._spelled(position), edge_text=True), edge_text=True)
+
+    def is_word(self):
+        """Return whether the prefix itself is a stored word."""
+        position = self._current()
+        return position is not None and position[1] == len(position[0].text) and position[0].is_word
+
+    def count(self):
+        """Return how many words start with the prefix."""
+        position = self._current()
+        return position[0].count if position is not None else 0
+
+    def top(self, k):
+        """Return the k heaviest words starting with the prefix as (word, weight) pairs."""
+        position = self._current()
+        if position is None:
+            return []
+        return top_words(position[0], self._spelled(position), k, edge_text=True)[0]
+
+
+class TernaryCursor(Cursor):
+    """A cursor over a TernaryTree; a position is the node matching the prefix's last character.
+
+    The empty prefix is held as the root sentinel. A push searches one sibling BST,
+    so it costs the depth of that BST rather than the length of the prefix.
+    """
+
+    def _start(self):
+        return self.tree.root
+
+    def _step(self, node, char):
+        node = node.equal if self._chars else node
+        while node is not None:
+            if char < node.data:
+                node = node.left
+            elif char > node.data:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def _words(self, node):
+        if not self._chars:
+            return iter_ternary_words(seek_ternary_words(node, ''))
+        stack = seek_ternary_words(node.equal, self.prefix)
+        if node.is_end_of_string:
+            stack.append((None, self.prefix))  # The prefix itself sorts first
+        return iter_ternary_words(stack)
+
+    def is_word(self):
+        """Return whether the prefix itself is a stored word."""
+        node = self._current()
+        return node is not None and bool(self._chars) and node.is_end_of_string
+
+    def count(self):
+        """Return how many words start with the prefix."""
+        node = self._current()
+        if node is None:
+            return 0
+        if not self._chars:
+            return node.count
+        return node.is_end_of_string + (node.equal.count if node.equal else 0)
+
+    def top(self, k):
+        """Return the k heaviest words starting with the prefix as (word, weight) pairs."""
+        node = self._current()
+        if node is None:
+            return []
+        if not self._chars:
+            return top_ternary_words([(node, '')], k)[0]
+        entries = [(node.equal, self.prefix)] if node.equal else []
+        if node.is_end_of_string:
+            entries.append((None, self.prefix, node.weight))
+        return top_ternary_words(entries, k)[0]
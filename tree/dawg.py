@@ -0,0 +1,201 @@
+"""A minimal acyclic word automaton (DAWG) that shares suffixes as well as prefixes.
+
+Words are added in sorted order with the incremental algorithm of Daciuk et al.
+Once a word arrives, the part of the previous word's path that it does not
+share can never change again, so those states are minimized bottom-up: each is
+looked up in a register of finished states keyed by finality and outgoing
+transitions, and replaced by the registered twin when one exists. The states of
+"-ing", "-tion" or "-ness" endings are then stored once however many words end
+with them.
+"""
+from tree.bulk import common_prefix_length, paused_gc, sorted_unique
+from tree.render import DEFAULT_BUDGET, DEFAULT_DEPTH, render_tree
+from tree.traversal import collect_words
+
+
+class DawgNode:
+    """A DAWG state; several parents may share it."""
+    __slots__ = ('children', 'is_word', 'count')
+
+    def __init__(self):
+        self.children = dict()
+        self.is_word = False
+        self.count = 0  # Words ending at or below this state, i.e. the suffixes it accepts
+
+
+class DAWG:
+    """A minimal DAWG for read-mostly dictionaries; words must be inserted in sorted order."""
+
+    def __init__(self):
+        self.root = DawgNode()
+        self.name = "DAWG"
+        self.node_count = 1
+        self.generation = 0
+        self._register = {}  # (is_word, transitions) -> finished state; dropped by finish()
+        self._unchecked = []  # (parent, char, child) along the last word's path, not yet minimized
+        self._previous = None
+
+    def insert(self, word):
+        """Add a word that sorts after every word added so far; raises ValueError otherwise or after finish()."""
+        if self._register is None:
+            raise ValueError("DAWG is finished; build a new one to add words")
+        if self._previous is not None and word <= self._previous:
+            if word == self._previous:
+                return
+            raise ValueError(f"DAWG needs sorted input: {word!r} came after {self._previous!r}")
+        self.generation += 1
+        common = common_prefix_length(word, self._previous or '')
+        self._minimize(common)
+        node = self._unchecked[-1][2] if self._unchecked else self.root
+        for char in word[common:]:
+            child = DawgNode()
+            node.children[char] = child
+            self._unchecked.append((node, char, child))
+            node = child
+        self.node_count += len(word) - common
+        node.is_word = True
+        # Every state on the word's path is still unchecked, so none of them is shared yet
+        self.root.count += 1
+        for _, _, child in self._unchecked:
+            child.count += 1
+        self._previous = word
+
+    def _minimize(self, down_to):
+        """Replace unchecked states below depth down_to with registered twins, or register them."""
+        register = self._register
+        unchecked = self._unchecked
+        while len(unchecked) > down_to:
+            parent, char, child = unchecked.pop()
+            key = (child.is_word, tuple((label, id(state)) for label, state in child.children.items()))
+            twin = register.get(key)
+            if twin is None:
+                register[key] = child
+            else:
+                parent.children[char] = twin
+                self.node_count -= 1
+
+    def finish(self):
+        """Minimize the last word's path and drop the register; the DAWG is read-only afterwards."""
+        if self._register is not None:
+            self.generation += 1
+            self._minimize(0)
+            self._register = None
+
+    def insert_many(self, words):
+        """Insert a batch of words in any order into an empty DAWG and finish it."""
+        with paused_gc():
+            for word in sorted(set(words)):
+                self.insert(word)
+            self.finish()
+
+    @classmethod
+    def from_sorted(cls, words):
+        """Build a finished DAWG from words in sorted order; raises ValueError on out-of-order input."""
+        dawg = cls()
+        with paused_gc():
+            for word in sorted_unique(words):
+                dawg.insert(word)
+            dawg.finish()
+        return dawg
+
+    def find(self, word, stats=None):
+        """Return the state the word ends in, or None if not found; pass a QueryStats to count the work.
+
+        States are shared, so the same state is returned for every word with the same remaining suffixes.
+        """
+        if stats is not None:
+            return stats.measure('find', self._find_counted, word)
+        current = self.root
+        for char in word:
+            current = current.children.get(char)
+            if current is None:
+                return None
+        return current if current.is_word else None
+
+    def starts_with(self, prefix, stats=None):
+        """Return a list of all words starting with the given prefix and count nodes traversed.
+
+        Pass a QueryStats to also count comparisons and time the call.
+        """
+        if stats is not None:
+            return stats.measure('starts_with', self._starts_with_counted, prefix)
+        words = list()
+        current = self.root
+        nodes_traversed = 0
+        for char in prefix:
+            current = current.children.get(char)
+            if current is None:
+                return list(), nodes_traversed
+            nodes_traversed += 1
+        nodes_traversed += collect_words(current, prefix, words)
+        return words, nodes_traversed
+
+    def _descend_counted(self, prefix, stats):
+        """Walk prefix from the root like find, counting into stats; returns the state reached or None."""
+        current = self.root
+        for char in prefix:
+            stats.char_comparisons += 1
+            current = current.children.get(char)
+            if current is None:
+                return None
+            stats.nodes_visited += 1
+        return current
+
+    def _find_counted(self, word, stats):
+        current = self._descend_counted(word, stats)
+        return current if current is not None and current.is_word else None
+
+    def _starts_with_counted(self, prefix, stats):
+        before = stats.nodes_visited
+        words = []
+        current = self._descend_counted(prefix, stats)
+        if current is not None:
+            stats.nodes_visited += collect_words(current, prefix, words)
+        return words, stats.nodes_visited - before
+
+    def count_prefix(self, prefix):
+        """Return how many words start with prefix, walking only the prefix path."""
+        current = self.root
+        for char in prefix:
+            current = current.children.get(char)
+            if current is None:
+                return 0
+        return current.count
+
+    def size(self, current=None):
+        """Return the number of states in the DAWG, or the distinct states reachable from current."""
+        if not current:
+            return self.node_count
+        seen = {id(current)}
+        stack = [current]
+        while stack:
+            for child in stack.pop().children.values():
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    stack.append(child)
+        return len(seen)
+
+    def __len__(self):
+        """Return the number of words stored."""
+        return self.root.count
+
+    def visualize(self, prefix='', budget=DEFAULT_BUDGET, max_depth=DEFAULT_DEPTH, expanded=()):
+        """Visualize the DAWG with plotly, drawing every state once and shared transitions as dashed lines.
+
+        expanded holds keys (the text spelled on the first path found to a state) of collapsed states to open anyway.
+        """
+        current = self.root
+        for char in prefix:
+            current = current.children.get(char)
+            if current is None:
+                return  # Prefix not in DAWG
+
+        def children(node, key):
+            # render_tree draws a shared state under the first open parent that reaches it; the rest get dashed links
+            return [(child, key + char, char) for char, child in sorted(node.children.items())]
+
+        # No owner: which parent draws a shared state depends on the budget, so cut-out subtree layouts would differ
+        return render_tree(f'DAWG Visualization (Prefix: {prefix})', current, prefix or 'root', children,
+                           lambda node: node.count, lambda node: node.is_word,
+                           budget, max_depth, expanded, root_key=prefix,
+                           links=lambda node: node.children.values())
@@ -0,0 +1,180 @@
+from array import array
+
+EMPTY = -1
+SCAN_LIMIT = 64  # Free slots tried per child block before appending fresh space
+
+
+class FrozenTrie:
+    """An immutable double-array trie built from a PrefixTree for read-only lookups.
+
+    A child of state ``s`` on character ``c`` lives at ``base[s] + code(c)`` and is
+    valid only when ``check`` at that slot holds ``s``. The child codes of every
+    state are also packed in ``labels[label_start[s]:label_start[s + 1]]`` so
+    prefix collection visits only real children, in lexicographic order.
+    """
+
+    def __init__(self, root):
+        self.name = "Trie (frozen)"
+        alphabet = set()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            alphabet.update(node.children)
+            stack.extend(node.children.values())
+        self.alphabet = sorted(alphabet)
+        self.codes = {char: code for code, char in enumerate(self.alphabet, start=1)}
+        self._build(root)
+
+    def _build(self, root):
+        """Lay the trie out breadth-first, placing each child block at the first base that fits."""
+        codes = self.codes
+        base = [0]
+        check = [0]  # The root owns slot 0 so it is never handed out as a child slot
+        terminal = bytearray(1)
+        terminal[0] = root.is_word
+        # Free slots form a doubly linked list so placement skips occupied runs
+        free_next = [-1]
+        free_prev = [-1]
+        free_head = free_tail = -1
+
+        def grow(size):
+            nonlocal free_head, free_tail
+            for slot in range(len(check), size):
+                base.append(0)
+                check.append(EMPTY)
+                terminal.append(0)
+                free_prev.append(free_tail)
+                free_next.append(-1)
+                if free_tail == -1:
+                    free_head = slot
+                else:
+                    free_next[free_tail] = slot
+                free_tail = slot
+
+        def occupy(slot, state):
+            nonlocal free_head, free_tail
+            prev, following = free_prev[slot], free_next[slot]
+            if prev == -1:
+                free_head = following
+            else:
+                free_next[prev] = following
+            if following == -1:
+                free_tail = prev
+            else:
+                free_prev[following] = prev
+            check[slot] = state
+
+        child_codes = {}
+        words = int(root.is_word)
+        queue = [(root, 0)]
+        for node, state in queue:
+            if not node.children:
+                continue
+            block = sorted((codes[char], child) for char, child in node.children.items())
+            first, last = block[0][0], block[-1][0]
+
+            # Try a bounded number of free slots before falling back to fresh space at the end
+            offset = None
+            position = free_head
+            tries = 0
+            while position != -1 and tries < SCAN_LIMIT:
+                candidate = position - first
+                if candidate >= 0:
+                    if candidate + last >= len(check):
+                        grow(candidate + last + 1)
+                    if all(check[candidate + code] == EMPTY for code, _ in block):
+                        offset = candidate
+                        break
+                position = free_next[position]
+                tries += 1
+            if offset is None:
+                offset = max(len(check) - first, 0)
+                grow(offset + last + 1)
+
+            base[state] = offset
+            child_codes[state] = [code for code, _ in block]
+            for code, child in block:
+                slot = offset + code
+                occupy(slot, state)
+                terminal[slot] = child.is_word
+                words += child.is_word
+                queue.append((child, slot))
+
+        label_start = array('i', [0]) * (len(check) + 1)
+        labels = array('H' if len(codes) < 1 << 16 else 'I')
+        for state in range(len(check)):
+            label_start[state] = len(labels)
+            labels.extend(child_codes.get(state, ()))
+        label_start[len(check)] = len(labels)
+
+        self.base = array('i', base)
+        self.check = array('i', check)
+        self.terminal = bytes(terminal)
+        self.label_start = label_start
+        self.labels = labels
+        self.states = len(queue)
+        self.words = words
+
+    def _walk(self, word):
+        """Return the state reached by following word from the root, or None."""
+        base, check, codes = self.base, self.check, self.codes
+        limit = len(check)
+        state = 0
+        for char in word:
+            code = codes.get(char)
+            if code is None:
+                return None
+            slot = base[state] + code
+            if slot >= limit or check[slot] != state:
+                return None
+            state = slot
+        return state
+
+    def find(self, word):
+        """Return the state index of the word, or None if it is not stored."""
+        state = self._walk(word)
+        if state is None or not self.terminal[state]:
+            return None
+        return state
+
+    def starts_with(self, prefix):
+        """Return a sorted list of all words starting with the prefix and the count of nodes traversed."""
+        state = 0
+        nodes_traversed = 0
+        for char in prefix:
+            state = self._step(state, char)
+            if state is None:
+                return [], nodes_traversed
+            nodes_traversed += 1
+
+        words = []
+        base, terminal, alphabet = self.base, self.terminal, self.alphabet
+        label_start, labels = self.label_start, self.labels
+        stack = [(state, prefix)]
+        while stack:
+            state, text = stack.pop()
+            nodes_traversed += 1
+            if terminal[state]:
+                words.append(text)
+            offset = base[state]
+            for i in range(label_start[state + 1] - 1, label_start[state] - 1, -1):
+                code = labels[i]
+                stack.append((offset + code, text + alphabet[code - 1]))
+        return words, nodes_traversed
+
+    def _step(self, state, char):
+        """Follow a single character from state, returning the child state or None."""
+        code = self.codes.get(char)
+        if code is None:
+            return None
+        slot = self.base[state] + code
+        if slot >= len(self.check) or self.check[slot] != state:
+            return None
+        return slot
+
+    def size(self):
+        """Return the total number of states (nodes) in the frozen trie."""
+        return self.states
+
+    def __len__(self):
+        return self.words
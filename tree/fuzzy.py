@@ -0,0 +1,57 @@
+"""Edit-distance search over the children-dict trees (Trie and Radix).
+
+The walk carries one row of the Levenshtein table per node: the distance from
+every prefix of the query to the text spelled so far. Each edge character
+extends the row in O(len(query)), and a branch is dropped as soon as the
+smallest value in its row exceeds the edit budget, since no longer word below
+it can come back under the bound.
+"""
+
+
+def next_row(row, char, word):
+    """Return the Levenshtein row for the spelled text extended by char."""
+    left = row[0] + 1
+    new_row = [left]
+    append = new_row.append
+    for j, query_char in enumerate(word):
+        diagonal = row[j] if query_char == char else row[j] + 1
+        above = row[j + 1] + 1
+        left += 1
+        if above < left:
+            left = above
+        if diagonal < left:
+            left = diagonal
+        append(left)
+    return new_row
+
+
+def fuzzy_words(node, word, max_edits, edge_text=False):
+    """Return (word, distance) pairs within max_edits of word under node, and the nodes visited.
+
+    node must be a tree root. Set edge_text for Radix nodes, whose edges spell
+    child.text. Matches are sorted by distance, then alphabetically.
+    """
+    results = []
+    first_row = list(range(len(word) + 1))
+    if node.is_word and first_row[-1] <= max_edits:
+        results.append(('', first_row[-1]))
+    stack = [(node, '', first_row)]
+    visited = 1
+    while stack:
+        node, text, row = stack.pop()
+        for key, child in node.children.items():
+            visited += 1
+            label = child.text if edge_text else key
+            child_row = row
+            for char in label:
+                child_row = next_row(child_row, char, word)
+                if min(child_row) > max_edits:
+                    break
+            else:
+                child_text = text + label
+                if child.is_word and child_row[-1] <= max_edits:
+                    results.append((child_text, child_row[-1]))
+                if child.children:
+                    stack.append((child, child_text, child_row))
+    results.sort(key=lambda match: (match[1], match[0]))
+    return results, visited
@@ -0,0 +1,123 @@
+"""Streaming word-list ingestion: read, clean, de-duplicate and sample a CSV without loading it whole.
+
+The file is read a chunk of lines at a time and each word is normalized on
+the way through: surrounding whitespace and quotes are stripped, and
+non-alphabetic entries are dropped. A sample of n words is then kept in a
+bounded reservoir, so memory stays proportional to n however large the file is.
+
+The reservoir is a bottom-k sample: every word gets a pseudo-random priority
+from a keyed hash of the word and the seed, and the n words with the
+smallest priorities are kept. That gives each distinct word the same chance
+of being chosen however many times it is repeated, without a set of every
+word seen. A repeat has the same priority as its first occurrence, so it is
+either already in the reservoir or rejected again. The same seed always
+gives the same sample, in the same shuffled order.
+
+It also holds the word lists shared by the app, the server and the
+benchmarks: the bundled ones in data/ and seeded synthetic words.
+"""
+import csv
+import heapq
+import os
+import random
+from hashlib import blake2b
+from itertools import islice
+
+CHUNK_BYTES = 1 << 16  # Lines handed to the CSV reader per read
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+SMALL_WORDS = os.path.join(DATA_DIR, '4000-most-common-english-words-csv.csv')
+LARGE_WORDS = os.path.join(DATA_DIR, 'words.csv')
+
+
+def normalize(text, alphabetic=True):
+    """Return text stripped of whitespace and surrounding quotes, or None if it is empty or, with alphabetic, not all letters."""
+    word = text.strip().strip('"')
+    if not word or (alphabetic and not word.isalpha()):
+        return None
+    return word
+
+
+def read_words(path, alphabetic=True):
+    """Yield the normalized words of a CSV's first column, reading it a chunk at a time."""
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        while True:
+            lines = csvfile.readlines(CHUNK_BYTES)
+            if not lines:
+                return
+            for row in csv.reader(lines):
+                if row:
+                    word = normalize(row[0], alphabetic)
+                    if word is not None:
+                        yield word
+
+
+def default_word_file():
+    """Return the 400k dictionary when it is present, otherwise the bundled 4000-word list."""
+    return LARGE_WORDS if os.path.exists(LARGE_WORDS) else SMALL_WORDS
+
+
+def load_words(path=None, limit=None):
+    """Return the first limit alphabetic words of a one-column CSV, or all of them, repeats included."""
+    return list(islice(read_words(path or default_word_file()), limit or None))
+
+
+def synthetic_words(count, seed=42, alphabet='abcdefghijklmnopqrstuvwxyz', min_length=3, max_length=12):
+    """Return count distinct random lowercase words for sweeps beyond the bundled lists."""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        length = rng.randint(min_length, max_length)
+        words.add(''.join(rng.choice(alphabet) for _ in range(length)))
+    return list(words)
+
+
+def count_words(path, alphabetic=True):
+    """Return how many words read_words yields, repeats included, holding none of them."""
+    return sum(1 for _ in read_words(path, alphabetic))
+
+
+def priority(word, keyed):
+    """Return the word's 64-bit sampling priority from a keyed blake2b state; stable across runs and processes.
+
+    Copying a state keyed once is cheaper than keying a new hash for every word.
+    """
+    state = keyed.copy()
+    state.update(word.encode('utf-8'))
+    return int.from_bytes(state.digest(), 'little')
+
+
+def sample_words(words, size, seed=42):
+    """Return up to size distinct words drawn uniformly from an iterable of words, in a seeded shuffled order.
+
+    Only the size words currently sampled are held. With size None every
+    distinct word is returned in first-seen order. For one seed, a smaller
+    sample is always the start of a larger one, so growing size only adds words.
+    """
+    if size is None:
+        return list(dict.fromkeys(words))
+    if size <= 0:
+        return []
+    keyed = blake2b(digest_size=8, key=seed.to_bytes(8, 'little', signed=True))
+    reservoir = []  # Max-heap of (-priority, word): the root is the first word to give up its place
+    members = set()
+    for word in words:
+        rank = priority(word, keyed)
+        if len(reservoir) < size:
+            if word not in members:
+                members.add(word)
+                heapq.heappush(reservoir, (-rank, word))
+        elif rank < -reservoir[0][0] and word not in members:
+            members.add(word)
+            members.discard(heapq.heapreplace(reservoir, (-rank, word))[1])
+    return [word for _, word in sorted(reservoir, reverse=True)]
+
+
+def sample_file(path, size, seed=42, alphabetic=True):
+    """Stream a CSV word list and return a seeded sample of up to size distinct words; see sample_words."""
+    return sample_words(read_words(path, alphabetic), size, seed)
+
+
+def load_tree(tree, path, size=None, seed=42, alphabetic=True):
+    """Bulk insert a seeded sample of up to size words from a CSV into tree and return the tree."""
+    tree.insert_many(sample_file(path, size, seed, alphabetic))
+    return tree
@@ -0,0 +1,253 @@
+"""A succinct read-only trie in the LOUDS encoding (level-order unary degree sequence).
+
+Nodes are numbered breadth-first from the root (0). The shape is one
+bitvector: ``10`` for a virtual super-root, then for every node in order one
+``1`` per child followed by a ``0``. With 2n + 1 bits for n nodes, node i's
+children are the consecutive nodes starting at ``select0(i + 1) - i``, and
+they continue until the next ``0``. The edge label into node k is character
+k - 1 of one string, and a second bitvector marks the nodes where a word ends.
+
+``rank`` is answered from a directory of ones counted before each 64-bit
+word, and ``select0`` from a sample of every 64th zero plus per-byte tables.
+Both take a few table lookups instead of a scan. Because every level of a
+subtree is a contiguous range of nodes, ``count_prefix`` and ``starts_with``
+move one level at a time, with one or two selects per level instead of one per node.
+"""
+from array import array
+from itertools import accumulate
+
+from tree.bulk import sorted_unique
+
+WORD_BITS = 64
+SELECT_SAMPLE = 64  # Every 64th zero's word is recorded for select0
+MASK = (1 << WORD_BITS) - 1
+BIT_DIGITS = bytes.maketrans(b'\x00\x01', b'01')  # One byte per bit to the ASCII digits int() parses
+
+# Position of the r-th set bit of each byte value at SELECT_IN_BYTE[byte * 8 + r]
+SELECT_IN_BYTE = bytes(
+    ([bit for bit in range(8) if byte >> bit & 1] + [0] * 8)[rank]
+    for byte in range(256) for rank in range(8))
+
+
+class BitVector:
+    """An immutable bitvector packed into 64-bit words, with rank and select0 directories."""
+
+    def __init__(self, bits):
+        """Pack a sequence of 0/1 values or booleans, one per bit, first bit lowest."""
+        digits = bytes(bits).translate(BIT_DIGITS)
+        self.length = len(digits)
+        # Each 64 bits, reversed, read as a binary number is one word; the last is zero-padded
+        self.words = array('Q', (int(digits[start:start + WORD_BITS][::-1] or b'0', 2)
+                                 for start in range(0, max(self.length, 1), WORD_BITS)))
+        self.ranks = array('I', accumulate((word.bit_count() for word in self.words), initial=0))
+        self.zero_samples = array('I')
+        word = 0
+        for k in range(0, self.length - self.ranks[-1], SELECT_SAMPLE):  # Every 64th zero, from the first
+            while ((word + 1) << 6) - self.ranks[word + 1] <= k:
+                word += 1
+            self.zero_samples.append(word)
+
+    def __getitem__(self, position):
+        return self.words[position >> 6] >> (position & 63) & 1
+
+    def rank(self, position):
+        """Return the number of ones before position."""
+        word, offset = position >> 6, position & 63
+        if not offset:
+            return self.ranks[word]
+        return self.ranks[word] + (self.words[word] & ((1 << offset) - 1)).bit_count()
+
+    def select0(self, k):
+        """Return the position of the k-th zero, counting from 1."""
+        ranks = self.ranks
+        word = self.zero_samples[(k - 1) // SELECT_SAMPLE]
+        while ((word + 1) << 6) - ranks[word + 1] < k:
+            word += 1
+        remaining = k - ((word << 6) - ranks[word])
+        zeros = ~self.words[word] & MASK
+        position = word << 6
+        # Halve the word by popcount down to one byte, then look the bit up
+        count = (zeros & 0xFFFFFFFF).bit_count()
+        if remaining > count:
+            remaining -= count
+            zeros >>= 32
+            position += 32
+        count = (zeros & 0xFFFF).bit_count()
+        if remaining > count:
+            remaining -= count
+            zeros >>= 16
+            position += 16
+        count = (zeros & 0xFF).bit_count()
+        if remaining > count:
+            remaining -= count
+            zeros >>= 8
+            position += 8
+        return position + SELECT_IN_BYTE[(zeros & 0xFF) * 8 + remaining - 1]
+
+    def next_zero(self, position):
+        """Return the position of the first zero at or after position."""
+        word = position >> 6
+        bits = (~self.words[word] & MASK) >> (position & 63)
+        if bits:
+            return position + (bits & -bits).bit_length() - 1
+        while True:
+            word += 1
+            bits = ~self.words[word] & MASK
+            if bits:
+                return (word << 6) + (bits & -bits).bit_length() - 1
+
+    def nbytes(self):
+        """Return the bytes held by the bit words and directories."""
+        return sum(buffer.itemsize * len(buffer) for buffer in (self.words, self.ranks, self.zero_samples))
+
+
+def _levels_from_trie(root):
+    """Return (degrees, labels, terminal) of a children-dict trie in breadth-first order."""
+    degrees, labels, terminal = [], [], [root.is_word]
+    queue = [root]
+    for node in queue:
+        children = sorted(node.children.items())
+        degrees.append(len(children))
+        for char, child in children:
+            labels.append(char)
+            terminal.append(child.is_word)
+            queue.append(child)
+    return degrees, labels, terminal
+
+
+def _levels_from_sorted(words):
+    """Return (degrees, labels, terminal) of the trie of sorted words without building its nodes.
+
+    Each node on a level is the range of words sharing its prefix; its own word sorts first.
+    """
+    words = list(sorted_unique(words))
+    degrees, labels, terminal = [], [], [bool(words) and words[0] == '']
+    level = [0, len(words)]  # Flat (lo, hi) pairs, so a level allocates no tuple per node
+    depth = 0
+    while level:
+        below = []
+        bounds = iter(level)
+        for lo, hi in zip(bounds, bounds):
+            if lo < hi and len(words[lo]) == depth:
+                lo += 1
+            degree = 0
+            while lo < hi:
+                char = words[lo][depth]
+                end = lo + 1
+                while end < hi and words[end][depth] == char:
+                    end += 1
+                below += (lo, end)
+                labels.append(char)
+                terminal.append(len(words[lo]) == depth + 1)
+                degree += 1
+                lo = end
+            degrees.append(degree)
+        level = below
+        depth += 1
+    return degrees, labels, terminal
+
+
+class LoudsTrie:
+    """A read-only LOUDS trie with the find, starts_with and count_prefix contract of the other trees.
+
+    Build one with PrefixTree.succinct() or LoudsTrie.from_sorted(words).
+    """
+
+    def __init__(self, degrees, labels, terminal):
+        self.name = "Trie (LOUDS)"
+        self.nodes = len(degrees)
+        # The super-root's 10, then each node's degree in unary closed by a zero
+        unary = [b'\x01' * degree + b'\x00' for degree in range(max(degrees, default=0) + 1)]
+        self.shape = BitVector(b'\x01\x00' + b''.join(map(unary.__getitem__, degrees)))
+        self.labels = ''.join(labels)
+        self.terminal = BitVector(terminal)
+        self.words = self.terminal.rank(self.nodes)
+
+    @classmethod
+    def from_trie(cls, root):
+        """Encode the trie under a PrefixTree root node."""
+        return cls(*_levels_from_trie(root))
+
+    @classmethod
+    def from_sorted(cls, words):
+        """Encode words given in sorted order; raises ValueError on out-of-order input."""
+        return cls(*_levels_from_sorted(words))
+
+    def _first_child(self, node):
+        """Return the node number of node's first child, or of the next node's first child if it has none."""
+        return self.shape.select0(node + 1) - node
+
+    def _walk(self, word):
+        """Follow word from the root; return the node reached (None if it falls off) and the nodes stepped onto."""
+        select0, bits, labels = self.shape.select0, self.shape.words, self.labels
+        node = 0
+        for steps, char in enumerate(word):
+            start = select0(node + 1) + 1
+            # The unary degree ends at the next zero; a block of children seldom crosses a word boundary
+            zeros = (~bits[start >> 6] & MASK) >> (start & 63)
+            end = start + (zeros & -zeros).bit_length() - 1 if zeros else self.shape.next_zero(start)
+            first = start - node - 2  # Label index of the first child
+            index = labels.find(char, first, first + end - start)
+            if index < 0:
+                return None, steps
+            node = index + 1
+        return node, len(word)
+
+    def find(self, word):
+        """Return the node number of the word, or None if it is not stored."""
+        node, _ = self._walk(word)
+        if node is None or not self.terminal[node]:
+            return None
+        return node
+
+    def starts_with(self, prefix):
+        """Return a sorted list of all words starting with the prefix and the count of nodes traversed.
+
+        The subtree is expanded a level at a time by reading each level's unary degrees in one pass.
+        """
+        node, nodes_traversed = self._walk(prefix)
+        if node is None:
+            return [], nodes_traversed
+        shape, labels, terminal = self.shape, self.labels, self.terminal
+        words = []
+        level, texts = node, [prefix]
+        while texts:
+            nodes_traversed += len(texts)
+            below = []
+            position = shape.select0(level + 1) + 1
+            child = position - level - 1
+            for offset, text in enumerate(texts):
+                if terminal[level + offset]:
+                    words.append(text)
+                while shape[position]:
+                    below.append(text + labels[child - 1])
+                    child += 1
+                    position += 1
+                position += 1
+            level = child - len(below)
+            texts = below
+        words.sort()
+        return words, nodes_traversed
+
+    def count_prefix(self, prefix):
+        """Return how many words start with prefix, using one rank per level of its subtree."""
+        node, _ = self._walk(prefix)
+        if node is None:
+            return 0
+        total = 0
+        lo, hi = node, node + 1
+        while lo < hi:
+            total += self.terminal.rank(hi) - self.terminal.rank(lo)
+            lo, hi = self._first_child(lo), self._first_child(hi)
+        return total
+
+    def size(self):
+        """Return the total number of nodes in the trie."""
+        return self.nodes
+
+    def __len__(self):
+        return self.words
+
+    def nbytes(self):
+        """Return the bytes held by the bitvectors and the label string."""
+        return self.shape.nbytes() + self.terminal.nbytes() + len(self.labels.encode('utf-8'))
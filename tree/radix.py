@@ -1,6 +1,13 @@
-import networkx as nx
+from itertools import islice
+
 import matplotlib.pyplot as plt
-import plotly.graph_objects as go
+from tree.bulk import common_prefix_length, paused_gc, sorted_unique
+from tree.cursor import RadixCursor
+from tree.fuzzy import fuzzy_words
+from tree.ranking import subtree_max, top_words, weigh_path
+from tree.render import DEFAULT_BUDGET, DEFAULT_DEPTH, render_tree
+from tree.snapshot import RADIX, MappedTrie, write_snapshot
+from tree.traversal import collect_words, count_nodes, iter_words, seek_words, subtree_offset
 
 class RadixNode:
     """A node in the Radix Tree."""
@@ -8,6 +15,9 @@ class RadixNode:
         self.text = text
         self.children = {}
         self.is_word = False
+        self.weight = 0
+        self.max_weight = 0
+        self.count = 0  # Words ending at or below this node
 
 class RadixTree:
     """A Radix Tree for storing and querying strings efficiently."""
@@ -15,31 +25,93 @@ class RadixTree:
     def __init__(self):
         self.root = RadixNode()
         self.name = "Radix"
-        self.traversed_nodes = 0 
+        self.node_count = 1
+        self.generation = 0
 
-    def insert(self, word):
-        """Insert a word into the Radix Tree, with debug output."""
+    def insert(self, word, weight=None):
+        """Insert a word into the Radix Tree; weight ranks it for top_k (None keeps the current weight, 0 if new)."""
+        self.generation += 1
         current = self.root
+        path = [current]
         while word:
-            found = False
-            for char, child in current.children.items():
-                common_prefix = self._longest_common_prefix(word, child.text)
-                if common_prefix:
-                    found = True
-                    if common_prefix == child.text:
-                        current = child
-                        word = word[len(common_prefix):]
-                    else:
-                        self._split_node(current, child, common_prefix)
-                        current = current.children[common_prefix[0]]
-                        word = word[len(common_prefix):]
-                    break
-            if not found:
+            child = current.children.get(word[0])
+            if child is None:
                 new_node = RadixNode(word)
                 current.children[word[0]] = new_node
+                self.node_count += 1
+                path.append(new_node)
                 current = new_node
-                word = ''
-        current.is_word = True
+                break
+            common_prefix = self._longest_common_prefix(word, child.text)
+            if common_prefix != child.text:
+                self._split_node(current, child, common_prefix)
+            current = child
+            path.append(current)
+            word = word[len(common_prefix):]
+        weigh_path(path, weight, current.is_word, subtree_max)
+        if not current.is_word:
+            current.is_word = True
+            for node in path:
+                node.count += 1
+
+    def insert_many(self, words):
+        """Insert words; an empty tree is bulk loaded from the sorted batch in one pass."""
+        self.generation += 1
+        with paused_gc():
+            if self.root.children or self.root.is_word:
+                for word in words:
+                    self.insert(word)
+            else:
+                self._load_sorted(sorted(set(words)))
+
+    @classmethod
+    def from_sorted(cls, words):
+        """Build a Radix Tree from words in sorted order; raises ValueError on out-of-order input."""
+        tree = cls()
+        with paused_gc():
+            tree._load_sorted(words)
+        return tree
+
+    def _load_sorted(self, words):
+        """Stream sorted words into an empty tree, splitting an edge only where a new word branches off it."""
+        path = [(self.root, 0)]  # Nodes on the previous word's path with the depth where their edge ends
+        previous = ''
+        for word in sorted_unique(words):
+            common = common_prefix_length(word, previous)
+            below = None
+            while path[-1][1] > common:
+                below = path.pop()
+            parent, depth = path[-1]
+            if depth < common:
+                # The shared prefix ends inside the edge of the node we just popped
+                node, end = below
+                self._split_node(parent, node, node.text[:common - depth])
+                path.append((node, common))
+                parent = node
+            if common == len(word):
+                parent.is_word = True
+            else:
+                new_node = RadixNode(word[common:])
+                new_node.is_word = True
+                parent.children[word[common]] = new_node
+                self.node_count += 1
+                path.append((new_node, len(word)))
+            for node, _ in path:
+                node.count += 1
+            previous = word
+
+    def find(self, word, stats=None):
+        """Find and return the node representing the word, or None if not found; pass a QueryStats to count the work."""
+        if stats is not None:
+            return stats.measure('find', self._find_counted, word)
+        current = self.root
+        while word:
+            child = current.children.get(word[0])
+            if child is None or not word.startswith(child.text):
+                return None
+            word = word[len(child.text):]
+            current = child
+        return current if current.is_word else None
 
     def _split_node(self, parent, node, common_prefix):
         # Split the node at the common prefix, adjusting both the node and its new child
@@ -47,19 +119,59 @@ class RadixTree:
         new_child = RadixNode(remaining_text)
         new_child.children = node.children
         new_child.is_word = node.is_word
+        new_child.weight = node.weight
+        new_child.max_weight = node.max_weight
+        new_child.count = node.count
 
         node.text = common_prefix
         node.children = {remaining_text[0]: new_child}
         node.is_word = False
+        node.weight = 0
 
         # Ensure the parent's reference to this node is updated if needed
         parent.children[common_prefix[0]] = node
+        self.node_count += 1
 
 
-    def _log_tree(self, node, prefix):
-        full_word = prefix + node.text
-        for child in node.children.values():
-            self._log_tree(child, full_word)
+    def _merge_node(self, node):
+        # Absorb the only child of a non-word node, undoing _split_node
+        (child,) = node.children.values()
+        node.text += child.text
+        node.children = child.children
+        node.is_word = child.is_word
+        node.weight = child.weight
+        node.max_weight = child.max_weight
+        node.count = child.count
+        self.node_count -= 1
+
+    def delete(self, word):
+        """Remove a word, dropping its leaf and merging edges it no longer splits; returns False if it was not stored."""
+        current = self.root
+        path = [current]
+        while word:
+            child = current.children.get(word[0])
+            if child is None or not word.startswith(child.text):
+                return False
+            word = word[len(child.text):]
+            current = child
+            path.append(current)
+        if not current.is_word:
+            return False
+        self.generation += 1
+        current.is_word = False
+        current.weight = 0
+        for node in path:
+            node.count -= 1
+        if current is not self.root and not current.children:
+            path.pop()
+            del path[-1].children[current.text[0]]
+            self.node_count -= 1
+            current = path[-1]
+        if current is not self.root and not current.is_word and len(current.children) == 1:
+            self._merge_node(current)
+        for node in reversed(path):
+            node.max_weight = subtree_max(node)
+        return True
 
     def _longest_common_prefix(self, word1, word2):
         min_len = min(len(word1), len(word2))
@@ -68,132 +180,203 @@ class RadixTree:
                 return word1[:i]
         return word1[:min_len]
 
-    def _collect_words(self, node, accumulated_prefix, results, original_prefix=''):
+    def starts_with(self, prefix, stats=None):
+        """Return a list of all words starting with the given prefix and count nodes traversed.
+
+        Pass a QueryStats to also count comparisons and time the call.
+        """
+        if stats is not None:
+            return stats.measure('starts_with', self._starts_with_counted, prefix)
+        current, path_to_current, nodes_traversed = self._locate(prefix)
+        results = []
+        if current is not None:
+            nodes_traversed += collect_words(current, path_to_current, results, edge_text=True)
+        return results, nodes_traversed
 
-        if node.is_word:
-            full_word = accumulated_prefix + node.text
-            results.append(full_word)
+    def find_many(self, words):
+        """Return find(word) for each word in a batch, walking each shared prefix once."""
+        nodes = {}
+        for word, current, text, _, _ in self._walk_many(words):
+            nodes[word] = current if current is not None and text == word and current.is_word else None
+        return [nodes[word] for word in words]
 
-        for child_char, child in node.children.items():
-            if original_prefix and child_char == original_prefix[0]:
-                new_accumulated_prefix = accumulated_prefix + child.text
-                new_original_prefix = original_prefix[1:]
+    def starts_with_many(self, prefixes):
+        """Return starts_with(prefix) for each prefix in a batch, walking each shared path once."""
+        answers = {}
+        enclosing = []  # (prefix, path index of its node, words) for earlier prefixes the current one may extend
+        for prefix, current, text, nodes_traversed, path in self._walk_many(prefixes):
+            while enclosing and not prefix.startswith(enclosing[-1][0]):
+                enclosing.pop()
+            if current is None:
+                answers[prefix] = ([], nodes_traversed)
+                continue
+            if enclosing:
+                _, index, outer_words = enclosing[-1]
+                start = subtree_offset(path[index:])
+                words = outer_words[start:start + current.count]
             else:
-                # Only accumulate if we're on the original prefix path AND the current node is NOT a word-ending node
-                # Also, don't accumulate if the original_prefix is empty 
-                if original_prefix and not node.is_word and original_prefix != child_char: 
-                    new_accumulated_prefix = accumulated_prefix + child_char
-                else:
-                    new_accumulated_prefix = accumulated_prefix
-                new_original_prefix = '' if original_prefix else original_prefix
+                words = []
+                nodes_traversed += collect_words(current, text, words, edge_text=True)
+            answers[prefix] = (words, nodes_traversed)
+            enclosing.append((prefix, len(path) - 1, words))
+        return [answers[prefix] for prefix in prefixes]
+
+    def _walk_many(self, prefixes):
+        """Yield (prefix, node or None, text it spells, nodes newly stepped onto, path) for the distinct prefixes in sorted order.
+
+        The node is the one _locate returns. path keeps the nodes on the previous
+        prefix's path whose text lies within the characters the two prefixes share.
+        """
+        path = [self.root]
+        spelled = ['']  # Text spelled at each node on path
+        previous = ''
+        for prefix in sorted(set(prefixes)):
+            common = common_prefix_length(prefix, previous)
+            while len(spelled[-1]) > common:  # Its edge runs past the shared characters
+                path.pop()
+                spelled.pop()
+            current, text = path[-1], spelled[-1]
+            steps = 0
+            while len(text) < len(prefix):
+                rest = prefix[len(text):]
+                child = current.children.get(rest[0])
+                if child is None:
+                    current = None
+                    break
+                steps += 1
+                if not (rest.startswith(child.text) or child.text.startswith(rest)):
+                    current = None
+                    break
+                text += child.text
+                current = child
+                path.append(child)
+                spelled.append(text)
+            yield prefix, current, text, steps, path
+            previous = prefix
+
+    def _find_counted(self, word, stats):
+        current, path_to_current = self._locate_counted(word, stats)
+        if current is None or path_to_current != word or not current.is_word:
+            return None
+        return current
 
-            self._collect_words(child, new_accumulated_prefix, results, new_original_prefix)
+    def _starts_with_counted(self, prefix, stats):
+        before = stats.nodes_visited
+        current, path_to_current = self._locate_counted(prefix, stats)
+        results = []
+        if current is not None:
+            stats.nodes_visited += collect_words(current, path_to_current, results, edge_text=True)
+        return results, stats.nodes_visited - before
+
+    def count_prefix(self, prefix):
+        """Return how many words start with prefix, walking only the prefix path."""
+        current, _, _ = self._locate(prefix)
+        return current.count if current is not None else 0
+
+    def fuzzy(self, word, max_edits):
+        """Return (word, distance) pairs for stored words within max_edits edits of word, and nodes traversed."""
+        return fuzzy_words(self.root, word, max_edits, edge_text=True)
+
+    def top_k(self, prefix, k):
+        """Return the k heaviest words starting with prefix as (word, weight) pairs and the count of nodes traversed."""
+        current, path_to_current, nodes_traversed = self._locate(prefix)
+        if current is None:
+            return [], nodes_traversed
+        results, visited = top_words(current, path_to_current, k, edge_text=True)
+        return results, nodes_traversed + visited
+
+    def cursor(self, prefix=''):
+        """Return a RadixCursor at prefix that push(char) and pop() move one keystroke at a time."""
+        return RadixCursor(self, prefix)
 
+    def iter_prefix(self, prefix='', limit=None, after=None):
+        """Lazily yield up to limit words starting with prefix in lexicographic order.
 
+        Pass the last word of the previous page as after to resume right past it.
+        """
+        current, path_to_current, _ = self._locate(prefix)
+        if current is None:
+            return
+        yield from islice(iter_words(seek_words(current, path_to_current, after, edge_text=True), edge_text=True), limit)
 
-    def starts_with(self, prefix):
-        self.traversed_nodes = 0  # Reset before each search
+    def _locate(self, prefix):
+        """Return the node whose subtree holds the prefix's words, the text it spells, and nodes traversed.
+
+        The node is None when no word has the prefix; the spelled text can run past
+        the prefix when it ends partway along an edge.
+        """
         current = self.root
         path_to_current = ''
-        original_prefix = prefix
-        
+        nodes_traversed = 0
         while prefix:
-            found = False
-            for child in current.children.values():
-                self.traversed_nodes += 1  # Increment nodes traversed
-                if prefix.startswith(child.text):
-                    path_to_current += child.text
-                    current = child
-                    prefix = prefix[len(child.text):]
-                    found = True
-                    break
-            if not found:
-                return [], self.traversed_nodes  # No match found, return empty list and nodes traversed
+            child = current.children.get(prefix[0])
+            if child is None:
+                return None, path_to_current, nodes_traversed
+            nodes_traversed += 1
+            if prefix.startswith(child.text):
+                prefix = prefix[len(child.text):]
+            elif child.text.startswith(prefix):
+                prefix = ''  # The prefix ends partway along this edge
+            else:
+                return None, path_to_current, nodes_traversed
+            path_to_current += child.text
+            current = child
+        return current, path_to_current, nodes_traversed
 
-        results = []
-        self._collect_words(current, path_to_current, results, original_prefix)
-        return results, self.traversed_nodes 
+    def _locate_counted(self, prefix, stats):
+        """_locate that counts into stats instead of returning the nodes traversed."""
+        current = self.root
+        path_to_current = ''
+        while prefix:
+            stats.char_comparisons += 1
+            child = current.children.get(prefix[0])
+            if child is None:
+                return None, path_to_current
+            stats.nodes_visited += 1
+            stats.edge_comparisons += 1
+            text = child.text
+            stats.char_comparisons += min(len(text), len(prefix)) - 1  # The first character matched the dict key
+            if prefix.startswith(text):
+                prefix = prefix[len(text):]
+            elif text.startswith(prefix):
+                prefix = ''
+            else:
+                return None, path_to_current
+            path_to_current += text
+            current = child
+        return current, path_to_current
 
+    def visualize(self, prefix='', budget=DEFAULT_BUDGET, max_depth=DEFAULT_DEPTH, expanded=()):
+        """Visualize the Radix Tree with plotly, collapsing subtrees beyond the node budget or depth limit.
 
+        expanded holds keys (the spelled text) of collapsed nodes to open anyway.
+        """
+        current, path_to_current, _ = self._locate(prefix)
+        if current is None:
+            return
 
-    def visualize(self, prefix=''):
-        graph = nx.DiGraph()
-        current = self.root
-        while prefix:
-            found = False
-            for child in current.children.values():
-                if prefix.startswith(child.text):
-                    current = child
-                    prefix = prefix[len(child.text):]
-                    found = True
-                    break
-            if not found:
-                return
-
-        self._add_nodes(graph, current, "root")
-        pos = nx.spring_layout(graph)
-        edge_x = []
-        edge_y = []
-        for edge in graph.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.append(x0)
-            edge_x.append(x1)
-            edge_x.append(None)
-            edge_y.append(y0)
-            edge_y.append(y1)
-            edge_y.append(None)
-        edge_trace = go.Scatter(
-            x=edge_x, y=edge_y,
-            line=dict(width=0.5, color='#888'),
-            hoverinfo='none',
-            mode='lines')
-        node_x = []
-        node_y = []
-        labels = []
-        for node in graph.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
-            labels.append(graph.nodes[node].get('label', ''))
-        node_trace = go.Scatter(
-            x=node_x, y=node_y,
-            mode='markers+text',
-            text=labels,
-            textposition='top center',
-            hoverinfo='text',
-            marker=dict(
-                showscale=False,
-                color='skyblue',
-                size=10,
-                line_width=2))
-        fig = go.Figure(data=[edge_trace, node_trace],
-                        layout=go.Layout(
-                            title=f'Radix Tree Visualization (Prefix: {prefix})',
-                            titlefont_size=16,
-                            showlegend=False,
-                            hovermode='closest',
-                            margin=dict(b=20, l=5, r=5, t=40),
-                            annotations=[dict(
-                                text="Radix Tree Visualization",
-                                showarrow=False,
-                                xref="paper", yref="paper",
-                                x=0.005, y=-0.002)],
-                            xaxis=dict(showgrid=False, zeroline=False),
-                            yaxis=dict(showgrid=False, zeroline=False))
-                        )
-        return fig
-
-    def _add_nodes(self, graph, node, node_id):
-        for child in node.children.values():
-            child_id = node_id + child.text  # Ensure unique node IDs
-            label = f"{child.text} ({'Word' if child.is_word else 'Prefix'})"
-            graph.add_node(child_id, label=label)
-            graph.add_edge(node_id, child_id)
-            self._add_nodes(graph, child, child_id)
+        def children(node, key):
+            return [(child, key + child.text, child.text) for _, child in sorted(node.children.items())]
+
+        return render_tree(f'Radix Tree Visualization (Prefix: {prefix})', current, path_to_current or 'root', children,
+                           lambda node: node.count, lambda node: node.is_word,
+                           budget, max_depth, expanded, root_key=path_to_current, owner=self)
+
+    def save(self, path):
+        """Write the tree to path as a versioned binary snapshot; weights must be integers."""
+        write_snapshot(path, RADIX, self.root, self.node_count)
+
+    @staticmethod
+    def load(path):
+        """Open a snapshot written by save() for read-only queries; nodes are read from the mapped file on demand."""
+        return MappedTrie(path, RADIX)
 
     def size(self, current=None):
-        """Return the total number of nodes in the Radix Tree."""
+        """Return the total number of nodes in the Radix Tree, or in the subtree under current."""
         if not current:
-            current = self.root
-        return 1 + sum(self.size(child) for child in current.children.values())
\ No newline at end of file
+            return self.node_count
+        return count_nodes(current)
+
+    def __len__(self):
+        """Return the number of words stored."""
+        return self.root.count
@@ -0,0 +1,106 @@
+"""Word weights and best-first top-k search shared by the tree classes.
+
+Every node caches ``max_weight``, the heaviest word weight anywhere in its
+subtree, so a top-k search can open subtrees in order of the best word they
+could still hold and stop after k words. Weights are non-negative scores such
+as word frequencies; unweighted words weigh 0.
+"""
+from heapq import heappop, heappush
+
+
+def weigh_path(path, weight, was_word, subtree_max):
+    """Give the word ending at path[-1] its weight and refresh max_weight on every node of path.
+
+    A weight of None keeps an existing word's weight (0 for a new word). Raising
+    a weight only bumps maxima on the way down; lowering one recomputes them
+    bottom-up with subtree_max(node).
+    """
+    node = path[-1]
+    if weight is None:
+        weight = node.weight if was_word else 0
+    lowered = was_word and weight < node.weight
+    node.weight = weight
+    if lowered:
+        for node in reversed(path):
+            node.max_weight = subtree_max(node)
+    else:
+        for node in path:
+            if weight > node.max_weight:
+                node.max_weight = weight
+
+
+def subtree_max(node):
+    """Return the heaviest weight at or below a Trie or Radix node from its children's cached maxima."""
+    best = node.weight if node.is_word else 0
+    for child in node.children.values():
+        if child.max_weight > best:
+            best = child.max_weight
+    return best
+
+
+def ternary_subtree_max(node):
+    """Return the heaviest weight in a ternary node's subtree from its children's cached maxima."""
+    best = node.weight if node.is_end_of_string else 0
+    for child in (node.left, node.equal, node.right):
+        if child and child.max_weight > best:
+            best = child.max_weight
+    return best
+
+
+def top_words(node, text, k, edge_text=False):
+    """Return up to k (word, weight) pairs at or below node, heaviest first, and the nodes expanded.
+
+    text spells the path to node; set edge_text for Radix nodes. Ties are broken
+    alphabetically.
+    """
+    results = []
+    heap = [(-node.max_weight, text, 0, node)]
+    sequence = 1
+    visited = 0
+    while heap and len(results) < k:
+        negative_weight, text, _, node = heappop(heap)
+        if node is None:  # A word whose weight beats every unopened subtree
+            results.append((text, -negative_weight))
+            continue
+        visited += 1
+        if node.is_word:
+            heappush(heap, (-node.weight, text, sequence, None))
+            sequence += 1
+        for key, child in node.children.items():
+            heappush(heap, (-child.max_weight, text + (child.text if edge_text else key), sequence, child))
+            sequence += 1
+    return results, visited
+
+
+def top_ternary_words(entries, k):
+    """Return up to k (word, weight) pairs, heaviest first, and the nodes expanded.
+
+    entries are (node, prefix) ternary subtrees to search, or (None, word, weight)
+    for a word that is already known.
+    """
+    results = []
+    heap = []
+    sequence = 0
+    for entry in entries:
+        if entry[0] is None:
+            heap.append((-entry[2], entry[1], sequence, None, entry[1]))
+        else:
+            heap.append((-entry[0].max_weight, entry[1], sequence, entry[0], entry[1]))
+        sequence += 1
+    heap.sort()
+    visited = 0
+    while heap and len(results) < k:
+        negative_weight, _, _, node, prefix = heappop(heap)
+        if node is None:
+            results.append((prefix, -negative_weight))
+            continue
+        visited += 1
+        word = prefix + node.data
+        if node.is_end_of_string:
+            heappush(heap, (-node.weight, word, sequence, None, word))
+            sequence += 1
+        for child, child_prefix in ((node.left, prefix), (node.equal, word), (node.right, prefix)):
+            if child:
+                heappush(heap, (-child.max_weight, child_prefix, sequence, child, child_prefix))
+                sequence += 1
+    return results, visited
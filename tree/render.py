@@ -0,0 +1,298 @@
+"""Level-of-detail Plotly rendering shared by the three visualize methods.
+
+Only part of a large tree is drawn. Nodes are opened breadth-first until the
+node budget or the depth limit is reached; every node left closed stands in
+for its whole subtree and is labelled with the number of words below it.
+Clicking such a node in the app passes its key back through ``expanded`` so
+it is opened on the next render regardless of the budget.
+
+The layout is a tidy-tree layout computed level by level with NumPy: leaves
+take consecutive x slots in depth-first order, each parent is centred over
+the leaves below it, and y is the depth. Layouts are cached per tree and
+drawn root until the tree's ``generation`` changes, and zooming into a
+subtree that an earlier layout drew completely cuts its positions out of
+that layout instead of walking the tree again. Output uses WebGL
+``Scattergl`` traces built from the coordinate arrays, so drawing cost does
+not grow with the size of the tree, only with the budget.
+"""
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+
+DEFAULT_BUDGET = 400
+DEFAULT_DEPTH = 12
+LABEL_LIMIT = 150  # Above this many drawn nodes, labels move to hover text only
+MAX_CACHED_LAYOUTS = 16  # Layouts kept per tree before the least recently used is dropped
+
+# Marker colours are passed as codes into a discrete colour scale, which Plotly validates far faster than names
+OPEN, WORD, COLLAPSED = 0, 1, 2
+NODE_COLORSCALE = [[0, 'skyblue'], [0.5, 'seagreen'], [1, 'orange']]
+
+_layouts = weakref.WeakKeyDictionary()  # tree -> (generation, OrderedDict of Layout)
+
+
+class Layout:
+    """Drawn nodes in breadth-first order with their keys, labels, parent indices, depths and positions."""
+    __slots__ = ('nodes', 'keys', 'labels', 'parents', 'depths', 'collapsed', 'x', 'y', '_positions')
+
+    def __init__(self, nodes, keys, labels, parents, depths, collapsed, x=None, y=None):
+        self.nodes = nodes
+        self.keys = keys
+        self.labels = labels
+        self.parents = np.asarray(parents, dtype=np.intp)
+        self.depths = np.asarray(depths, dtype=np.intp)
+        self.collapsed = np.asarray(collapsed, dtype=bool)
+        if x is None:
+            x, y = tidy_layout(self.parents, self.depths)
+        self.x = x
+        self.y = y
+        self._positions = None
+
+    def position(self, node):
+        """Return the index node was drawn at, or None."""
+        if self._positions is None:
+            self._positions = {id(drawn): index for index, drawn in enumerate(self.nodes)}
+        return self._positions.get(id(node))
+
+
+def select_nodes(root, root_key, children, budget=DEFAULT_BUDGET, max_depth=DEFAULT_DEPTH, expanded=(),
+                 shared=False):
+    """Pick the nodes to draw, breadth-first, and return them as parallel lists.
+
+    children(node, key) returns the node's children as (child, key, label)
+    tuples in drawing order. Returns (nodes, keys, labels, parents, depths,
+    collapsed), where parents holds each node's index in the lists (-1 for the
+    root) and collapsed marks nodes drawn in place of a hidden subtree.
+
+    With shared, a node may be a child of several parents (the DAWG). It is
+    drawn once, under the first open parent that lists it; a parent left
+    collapsed does not claim it, so a later open parent can draw it instead.
+    """
+    expanded = set(expanded)
+    emitted = {id(root)}  # Only used with shared
+    nodes, keys, labels, parents, depths, collapsed = [root], [root_key], [''], [-1], [0], [False]
+    used = 1  # Nodes charged to the budget; clicked-open subtrees come on top of it
+    index = 0
+    while index < len(nodes):
+        node, key, depth = nodes[index], keys[index], depths[index]
+        kids = children(node, key)
+        if shared:
+            unclaimed = []
+            for kid in kids:
+                if id(kid[0]) not in emitted:
+                    emitted.add(id(kid[0]))
+                    unclaimed.append(kid)
+            kids = unclaimed
+        if kids:
+            if key in expanded:
+                fits = True
+            elif depth < max_depth and used + len(kids) <= budget:
+                fits = True
+                used += len(kids)
+            else:
+                fits = False
+                if shared:
+                    emitted.difference_update(id(kid[0]) for kid in kids)  # Left for a later open parent
+            if fits:
+                for child, child_key, label in kids:
+                    nodes.append(child)
+                    keys.append(child_key)
+                    labels.append(label)
+                    parents.append(index)
+                    depths.append(depth + 1)
+                    collapsed.append(False)
+            else:
+                collapsed[index] = True
+        index += 1
+    return nodes, keys, labels, parents, depths, collapsed
+
+
+def _levels(depths):
+    """Return (start, stop) index pairs of each depth in a breadth-first depths array."""
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(depths)) + 1, [len(depths)]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def tidy_layout(parents, depths):
+    """Return x and y arrays for nodes listed breadth-first with their parent indices.
+
+    Leaves are spaced one unit apart in depth-first order and every parent is
+    centred over the leaves below it, so subtrees never overlap. Each step is
+    one NumPy operation per level: breadth-first order keeps every level
+    contiguous, with siblings grouped and in parent order.
+    """
+    parents = np.asarray(parents, dtype=np.intp)
+    depths = np.asarray(depths, dtype=np.intp)
+    count = len(parents)
+    leaves = np.ones(count, dtype=np.int64)
+    leaves[parents[1:]] = 0
+    levels = _levels(depths)[1:]
+    for start, stop in reversed(levels):
+        np.add.at(leaves, parents[start:stop], leaves[start:stop])
+    first_slot = np.zeros(count, dtype=np.int64)
+    for start, stop in levels:
+        level_parents = parents[start:stop]
+        before = np.cumsum(leaves[start:stop]) - leaves[start:stop]
+        eldest = np.searchsorted(level_parents, level_parents)  # Index of each node's first sibling
+        first_slot[start:stop] = first_slot[level_parents] + before - before[eldest]
+    x = first_slot + (leaves - 1) / 2
+    y = (-depths).astype(float)
+    return x, y
+
+
+def _zoom(layout, root, root_key, children, budget, max_depth):
+    """Cut root's subtree out of a layout that drew all of it, or return None when it did not.
+
+    The new root only keeps the children children(root, root_key) gives it, so
+    a drawn root whose links differ at the top (the Ternary prefix root) is cut
+    down to those links.
+    """
+    index = layout.position(root)
+    if index is None or layout.collapsed[index]:
+        return None
+    kids = [layout.position(child) for child, _, _ in children(root, root_key)]
+    if any(kid is None or layout.parents[kid] != index for kid in kids):
+        return None
+    inside = np.zeros(len(layout.nodes), dtype=bool)
+    inside[kids] = True
+    for start, stop in _levels(layout.depths):
+        if start > index:
+            inside[start:stop] |= inside[layout.parents[start:stop]]
+    order = np.concatenate(([index], np.flatnonzero(inside)))
+    depths = layout.depths[order] - layout.depths[index]
+    if len(order) > budget or depths.max() > max_depth or layout.collapsed[order].any():
+        return None
+
+    renumber = np.full(len(layout.nodes), -1, dtype=np.intp)
+    renumber[order] = np.arange(len(order))
+    parents = renumber[layout.parents[order]]
+    parents[0] = -1
+    x = layout.x[order]
+    if len(order) > 1:
+        # Descendant leaves are contiguous slots; shift them to start at 0 and recentre the root over them
+        low, high = x[1:].min(), x[1:].max()
+        x -= low
+        x[0] = (high - low) / 2
+    else:
+        x[0] = 0.0
+    cut = len(layout.keys[index])
+    positions = order.tolist()
+    return Layout([layout.nodes[i] for i in positions],
+                  [root_key + layout.keys[i][cut:] for i in positions],
+                  [layout.labels[i] for i in positions],
+                  parents, depths, layout.collapsed[order], x, (-depths).astype(float))
+
+
+def layout_tree(root, root_key, children, budget=DEFAULT_BUDGET, max_depth=DEFAULT_DEPTH, expanded=(), owner=None,
+                shared=False):
+    """Return the Layout of the tree under root, reusing owner's cached layouts while its generation is unchanged."""
+    if owner is None:
+        return Layout(*select_nodes(root, root_key, children, budget, max_depth, expanded, shared))
+    generation = getattr(owner, 'generation', 0)
+    cached = _layouts.get(owner)
+    if cached is None or cached[0] != generation:
+        cached = (generation, OrderedDict())
+        _layouts[owner] = cached
+    layouts = cached[1]
+    key = (id(root), root_key, budget, max_depth, frozenset(expanded))
+    layout = layouts.get(key)
+    if layout is not None:
+        layouts.move_to_end(key)
+        return layout
+    for earlier in reversed(layouts.values()):
+        layout = _zoom(earlier, root, root_key, children, budget, max_depth)
+        if layout is not None:
+            break
+    else:
+        layout = Layout(*select_nodes(root, root_key, children, budget, max_depth, expanded, shared))
+    layouts[key] = layout
+    if len(layouts) > MAX_CACHED_LAYOUTS:
+        layouts.popitem(last=False)
+    return layout
+
+
+def render_tree(title, root, root_label, children, word_count, is_word,
+                budget=DEFAULT_BUDGET, max_depth=DEFAULT_DEPTH, expanded=(), root_key='', owner=None, links=None):
+    """Return a Scattergl figure of the tree under root, collapsing what does not fit the budget.
+
+    word_count(node) gives the words in a node's subtree and is_word(node) whether
+    a word ends there. Node keys are sent as customdata for click-to-expand.
+    Pass the tree as owner to cache its layouts; see layout_tree. For graphs whose
+    nodes have several parents (the DAWG), links(node) gives every node it points
+    to; children(node, key) then lists every child, each node is drawn once, and
+    the links that are not drawn tree edges are added as dashed lines. A link
+    into a node that is not drawn is counted in its source's hover text.
+    """
+    layout = layout_tree(root, root_key, children, budget, max_depth, expanded, owner, shared=links is not None)
+    x, y, parents, collapsed = layout.x, layout.y, layout.parents, layout.collapsed
+    count = len(x)
+    labels = [root_label] + layout.labels[1:]
+
+    edge_x = np.full(3 * (count - 1), np.nan)  # Each edge is parent, child, gap
+    edge_y = np.full(3 * (count - 1), np.nan)
+    edge_x[0::3] = x[parents[1:]]
+    edge_x[1::3] = x[1:]
+    edge_y[0::3] = y[parents[1:]]
+    edge_y[1::3] = y[1:]
+
+    traces = [go.Scattergl(
+        x=edge_x, y=edge_y,
+        line=dict(width=0.5, color='#888'),
+        hoverinfo='none',
+        mode='lines')]
+    undrawn = {}  # Node index -> links into nodes that are not drawn
+    if links is not None:
+        shared_x = []
+        shared_y = []
+        for index, (node, closed) in enumerate(zip(layout.nodes, collapsed.tolist())):
+            if closed:
+                continue
+            for target in links(node):
+                other = layout.position(target)
+                if other is None:
+                    undrawn[index] = undrawn.get(index, 0) + 1
+                elif parents[other] != index:
+                    shared_x += [x[index], x[other], None]
+                    shared_y += [y[index], y[other], None]
+        traces.append(go.Scattergl(
+            x=shared_x, y=shared_y,
+            line=dict(width=0.5, color='#888', dash='dash'),
+            hoverinfo='none',
+            mode='lines'))
+
+    words = np.array([word_count(node) if closed else 0 for node, closed in zip(layout.nodes, collapsed.tolist())])
+    kinds = np.where(collapsed, COLLAPSED, np.fromiter(map(is_word, layout.nodes), dtype=bool, count=count))
+    sizes = np.where(collapsed, np.minimum(8 + np.sqrt(words), 30), 10)
+    hover = [f"{label}: {total} words (click to expand)" if kind == COLLAPSED
+             else f"{label} (Word)" if kind == WORD else label
+             for label, total, kind in zip(labels, words.tolist(), kinds.tolist())]
+    for index, hidden_links in undrawn.items():
+        hover[index] += f" (+{hidden_links} links to undrawn nodes)"
+    show_labels = count <= LABEL_LIMIT
+    if show_labels:
+        text = [f"{label} ({total})" if kind == COLLAPSED else label
+                for label, total, kind in zip(labels, words.tolist(), kinds.tolist())]
+
+    traces.append(go.Scattergl(
+        x=x, y=y,
+        mode='markers+text' if show_labels else 'markers',
+        text=text if show_labels else None,
+        textposition='top center',
+        hovertext=hover,
+        hoverinfo='text',
+        customdata=np.array(layout.keys, dtype=object),
+        marker=dict(color=kinds, colorscale=NODE_COLORSCALE, cmin=OPEN, cmax=COLLAPSED, size=sizes, line_width=1)))
+    hidden = int(collapsed.sum())
+    subtitle = f"{count} nodes drawn" + (f", {hidden} collapsed" if hidden else "")
+    return go.Figure(data=traces,
+                     layout=go.Layout(
+                         title=f'{title} ({subtitle})',
+                         titlefont_size=16,
+                         showlegend=False,
+                         hovermode='closest',
+                         clickmode='event+select',
+                         margin=dict(b=20, l=5, r=5, t=40),
+                         xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                         yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)))
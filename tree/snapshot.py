@@ -0,0 +1,284 @@
+"""Versioned binary snapshots of the trees, queried in place through mmap.
+
+A snapshot is a fixed header followed by one record per node, written children
+first so every record can hold the offsets of the records below it. Loading
+maps the file and reads the header only; ``find`` and ``starts_with`` then
+unpack just the records they walk, so opening costs the same for any dictionary
+size and the pages are shared between processes mapping the same file.
+
+Trie and Radix nodes are written as an edge label followed by a child table
+sorted by the first character of each child's label, which is binary searched.
+Ternary nodes keep their character and left/equal/right offsets. All integers
+are little-endian and an offset of 0 (the header) means "no node".
+"""
+import mmap
+import struct
+
+MAGIC = b'TREE'
+VERSION = 1
+TRIE, RADIX, TERNARY = 1, 2, 3
+KIND_NAMES = {TRIE: 'Trie', RADIX: 'Radix', TERNARY: 'Ternary'}
+
+HEADER = struct.Struct('<4sHHQQQ')  # magic, version, kind, words, nodes, root offset
+EDGE_NODE = struct.Struct('<BqqQII')  # is_word, weight, max_weight, count, label bytes, children
+CHILD = struct.Struct('<IQ')  # first character of the child's label, child offset
+TERNARY_NODE = struct.Struct('<IBqqQQQQ')  # character, is_end, weight, max_weight, count, left, equal, right
+
+
+def write_snapshot(path, kind, root, node_count):
+    """Write the tree under root to path; weights must be integers."""
+    with open(path, 'wb') as out:
+        out.write(bytes(HEADER.size))
+        if kind == TERNARY:
+            root_offset = _write_ternary_nodes(out, root)
+        else:
+            root_offset = _write_edge_nodes(out, root, edge_text=kind == RADIX)
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, VERSION, kind, root.count, node_count, root_offset))
+
+
+def _write_edge_nodes(out, root, edge_text):
+    """Write Trie or Radix records children first and return the root record's offset."""
+    position = out.tell()
+    frames = [(root, '', sorted(root.children.items()), [])]  # (node, label, children left to write, table)
+    while True:
+        node, label, pending, table = frames[-1]
+        if len(table) < len(pending):
+            key, child = pending[len(table)]
+            frames.append((child, child.text if edge_text else key, sorted(child.children.items()), []))
+            continue
+        frames.pop()
+        encoded = label.encode('utf-8')
+        out.write(EDGE_NODE.pack(node.is_word, node.weight, node.max_weight, node.count, len(encoded), len(table)))
+        out.write(encoded)
+        for entry in table:
+            out.write(CHILD.pack(*entry))
+        offset = position
+        position += EDGE_NODE.size + len(encoded) + CHILD.size * len(table)
+        if not frames:
+            return offset
+        frames[-1][3].append((ord(label[0]), offset))
+
+
+def _write_ternary_nodes(out, root):
+    """Write ternary records children first and return the root record's offset."""
+    position = out.tell()
+    offsets = {}
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if not expanded:
+            stack.append((node, True))
+            for child in (node.left, node.equal, node.right):
+                if child:
+                    stack.append((child, False))
+            continue
+        out.write(TERNARY_NODE.pack(ord(node.data) if node.data else 0, node.is_end_of_string,
+                                    node.weight, node.max_weight, node.count,
+                                    *(offsets.pop(child) if child else 0 for child in (node.left, node.equal, node.right))))
+        offsets[node] = position
+        position += TERNARY_NODE.size
+    return offsets[root]
+
+
+def open_snapshot(path, kind):
+    """Map a snapshot file and return (mapping, words, nodes, root offset); raises ValueError on a bad header."""
+    with open(path, 'rb') as source:
+        mapping = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapping) < HEADER.size:
+        mapping.close()
+        raise ValueError(f"{path} is not a tree snapshot")
+    magic, version, found, words, nodes, root = HEADER.unpack_from(mapping, 0)
+    if magic != MAGIC or version != VERSION:
+        mapping.close()
+        raise ValueError(f"{path} is not a version {VERSION} tree snapshot")
+    if found != kind:
+        mapping.close()
+        raise ValueError(f"{path} holds a {KIND_NAMES.get(found, found)} snapshot, not {KIND_NAMES[kind]}")
+    return mapping, words, nodes, root
+
+
+class MappedTrie:
+    """A read-only Trie or Radix Tree answered straight from a memory-mapped snapshot."""
+
+    def __init__(self, path, kind):
+        self.name = f"{KIND_NAMES[kind]} (mapped)"
+        self.mapping, self.words, self.nodes, self.root = open_snapshot(path, kind)
+
+    def _read(self, offset):
+        """Return (is_word, count, label, table offset, child count) for the record at offset."""
+        is_word, _, _, count, label_length, children = EDGE_NODE.unpack_from(self.mapping, offset)
+        start = offset + EDGE_NODE.size
+        label = self.mapping[start:start + label_length].decode('utf-8')
+        return is_word, count, label, start + label_length, children
+
+    def _child(self, table, children, char):
+        """Binary search a child table for the child whose label starts with char; returns its offset or None."""
+        code = ord(char)
+        lo, hi = 0, children
+        while lo < hi:
+            mid = (lo + hi) // 2
+            found, offset = CHILD.unpack_from(self.mapping, table + mid * CHILD.size)
+            if found == code:
+                return offset
+            if found < code:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def _locate(self, prefix):
+        """Return the offset of the record whose subtree holds the prefix's words, the text it spells, and nodes read.
+
+        The offset is None when no word has the prefix; the text can run past the
+        prefix when it ends partway along a Radix edge.
+        """
+        offset = self.root
+        text = ''
+        nodes_read = 0
+        _, _, _, table, children = self._read(offset)
+        while prefix:
+            offset = self._child(table, children, prefix[0])
+            if offset is None:
+                return None, text, nodes_read
+            nodes_read += 1
+            _, _, label, table, children = self._read(offset)
+            if prefix.startswith(label):
+                prefix = prefix[len(label):]
+            elif label.startswith(prefix):
+                prefix = ''
+            else:
+                return None, text, nodes_read
+            text += label
+        return offset, text, nodes_read
+
+    def find(self, word):
+        """Return the record offset of the word, or None if it is not stored."""
+        offset, text, _ = self._locate(word)
+        if offset is None or text != word or not self._read(offset)[0]:
+            return None
+        return offset
+
+    def starts_with(self, prefix):
+        """Return a sorted list of all words starting with the prefix and the count of nodes read."""
+        offset, text, nodes_read = self._locate(prefix)
+        words = []
+        if offset is None:
+            return words, nodes_read
+        stack = [(offset, text[:len(text) - len(self._read(offset)[2])])]  # (record, text above its label)
+        while stack:
+            offset, text = stack.pop()
+            nodes_read += 1
+            is_word, _, label, table, children = self._read(offset)
+            text += label
+            if is_word:
+                words.append(text)
+            for i in range(children - 1, -1, -1):
+                stack.append((CHILD.unpack_from(self.mapping, table + i * CHILD.size)[1], text))
+        return words, nodes_read
+
+    def count_prefix(self, prefix):
+        """Return how many words start with prefix, reading only the prefix path."""
+        offset, _, _ = self._locate(prefix)
+        return self._read(offset)[1] if offset is not None else 0
+
+    def size(self):
+        """Return the total number of nodes in the snapshot."""
+        return self.nodes
+
+    def __len__(self):
+        return self.words
+
+    def close(self):
+        """Unmap the snapshot file."""
+        self.mapping.close()
+
+
+class MappedTernaryTree:
+    """A read-only Ternary tree answered straight from a memory-mapped snapshot."""
+
+    def __init__(self, path):
+        self.name = "Ternary (mapped)"
+        self.mapping, self.words, self.nodes, self.root = open_snapshot(path, TERNARY)
+
+    def _search(self, word):
+        """Return the offset of the record holding the last character of word, or None, and the nodes read."""
+        mapping = self.mapping
+        offset = self.root
+        nodes_read = 0
+        index = 0
+        while offset:
+            nodes_read += 1
+            code, _, _, _, _, left, equal, right = TERNARY_NODE.unpack_from(mapping, offset)
+            wanted = ord(word[index])
+            if wanted < code:
+                offset = left
+            elif wanted > code:
+                offset = right
+            elif index + 1 == len(word):
+                return offset, nodes_read
+            else:
+                offset = equal
+                index += 1
+        return None, nodes_read
+
+    def find(self, word):
+        """Return the record offset of the word, or None if it is not stored."""
+        if not word:
+            return None
+        offset, _ = self._search(word)
+        if offset is None or not TERNARY_NODE.unpack_from(self.mapping, offset)[1]:
+            return None
+        return offset
+
+    def starts_with(self, prefix):
+        """Return a sorted list of all words starting with the prefix and the count of nodes read."""
+        words = []
+        if prefix:
+            offset, nodes_read = self._search(prefix)
+            if offset is None:
+                return words, nodes_read
+            _, is_end, _, _, _, _, offset, _ = TERNARY_NODE.unpack_from(self.mapping, offset)
+            if is_end:
+                words.append(prefix)
+        else:
+            offset, nodes_read = self.root, 0
+        stack = [(offset, prefix)] if offset else []
+        while stack:
+            offset, text = stack.pop()
+            if offset is None:  # A finished word queued between the left and equal subtrees
+                words.append(text)
+                continue
+            nodes_read += 1
+            code, is_end, _, _, _, left, equal, right = TERNARY_NODE.unpack_from(self.mapping, offset)
+            word = text + chr(code) if code else text
+            if right:
+                stack.append((right, text))
+            if equal:
+                stack.append((equal, word))
+            if is_end:
+                stack.append((None, word))
+            if left:
+                stack.append((left, text))
+        return words, nodes_read
+
+    def count_prefix(self, prefix):
+        """Return how many words start with prefix, reading only the prefix path."""
+        if not prefix:
+            return self.words
+        offset, _ = self._search(prefix)
+        if offset is None:
+            return 0
+        _, is_end, _, _, _, _, equal, _ = TERNARY_NODE.unpack_from(self.mapping, offset)
+        return is_end + (TERNARY_NODE.unpack_from(self.mapping, equal)[4] if equal else 0)
+
+    def size(self):
+        """Return the total number of nodes in the snapshot."""
+        return self.nodes
+
+    def __len__(self):
+        return self.words
+
+    def close(self):
+        """Unmap the snapshot file."""
+        self.mapping.close()
@@ -0,0 +1,62 @@
+"""Per-call query instrumentation shared by the tree classes.
+
+``find`` and ``starts_with`` take an optional ``stats`` argument. Without it
+they run their plain loops, which keep no counters beyond the node count they
+already return, and the only cost is a single ``is not None`` test per call.
+With a QueryStats they run a counting copy of the descent instead and fill in
+the stats object, so concurrent queries never share counters on the tree.
+
+All trees count the same things:
+
+* ``nodes_visited``: nodes stepped onto during the descent, plus every node
+  expanded while collecting words (the count ``starts_with`` returns).
+* ``char_comparisons``: characters of the query compared against node
+  characters or edge labels during the descent.
+* ``edge_comparisons``: multi-character edge labels compared against the
+  query (Radix only; the other trees compare single characters).
+* ``allocated_bytes``: peak bytes allocated during the call, traced with
+  tracemalloc only when ``trace_memory`` is set because tracing is slow.
+* ``elapsed_ns``: wall time per operation name, summed over calls.
+"""
+import time
+import tracemalloc
+
+
+class QueryStats:
+    """Counters filled in by the queries it is passed to."""
+    __slots__ = ('nodes_visited', 'char_comparisons', 'edge_comparisons', 'allocated_bytes',
+                 'elapsed_ns', 'trace_memory')
+
+    def __init__(self, trace_memory=False):
+        self.nodes_visited = 0
+        self.char_comparisons = 0
+        self.edge_comparisons = 0
+        self.allocated_bytes = None
+        self.elapsed_ns = {}
+        self.trace_memory = trace_memory
+
+    def measure(self, operation, function, *args):
+        """Call function(*args, self), adding its wall time under operation and tracing memory if enabled."""
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        start = time.perf_counter_ns()
+        try:
+            return function(*args, self)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            self.elapsed_ns[operation] = self.elapsed_ns.get(operation, 0) + elapsed
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                self.allocated_bytes = max(self.allocated_bytes or 0, peak)
+
+    def as_dict(self):
+        """Return the counters as a plain dict, e.g. for a metrics table."""
+        return {
+            'nodes_visited': self.nodes_visited,
+            'char_comparisons': self.char_comparisons,
+            'edge_comparisons': self.edge_comparisons,
+            'allocated_bytes': self.allocated_bytes,
+            'elapsed_ns': dict(self.elapsed_ns),
+        }
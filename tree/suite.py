@@ -0,0 +1,196 @@
+"""Benchmark workloads for every tree: insert, find, starts_with and memory over a sweep of datasets.
+
+A dataset is ``small`` (the bundled 4000-word list), ``large`` (data/words.csv),
+``synthetic:N`` (N random words) or any of these with ``:N`` to keep only the
+first N words, e.g. ``large:100000``. Timings use perf_counter_ns after warmup
+runs and are reported as percentiles in nanoseconds per operation. Memory is
+measured in a separate build under tracemalloc so it never skews the timings.
+The DAWG only accepts words in sorted order, so it has no ``insert`` row and
+is built through ``insert_many``.
+
+``python -m benchmarks.suite`` runs this from the command line; the app runs
+it from its "Run benchmark suite" button.
+"""
+import csv
+import gc
+import io
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from tree.ingest import LARGE_WORDS, SMALL_WORDS, load_words, synthetic_words
+from tree.tries import PrefixTree
+from tree.ternary import TernaryTree
+from tree.radix import RadixTree
+from tree.dawg import DAWG
+
+TREES = {
+    'Trie': PrefixTree,
+    'Ternary': TernaryTree,
+    'Radix': RadixTree,
+    'DAWG': DAWG,
+}
+SORTED_INSERT = {'DAWG'}  # Trees whose insert only accepts words in sorted order
+WORKLOADS = ('insert', 'insert_many', 'find', 'starts_with', 'memory')
+FIELDS = ('dataset', 'words', 'tree', 'workload', 'unit', 'samples',
+          'min', 'median', 'p90', 'p99', 'max', 'mean', 'peak_bytes', 'retained_bytes')
+DEFAULT_DATASETS = ('small', 'synthetic:10000', 'synthetic:50000')
+
+
+def load_dataset(spec, seed=42):
+    """Return the words named by a dataset spec such as small, large:100000 or synthetic:50000."""
+    name, _, count = spec.partition(':')
+    limit = int(count) if count else None
+    if name == 'small':
+        return load_words(SMALL_WORDS, limit)
+    if name == 'large':
+        return load_words(LARGE_WORDS, limit)
+    if name == 'synthetic':
+        if limit is None:
+            raise ValueError("synthetic datasets need a size, e.g. synthetic:10000")
+        return synthetic_words(limit, seed)
+    raise ValueError(f"unknown dataset {spec!r}; use small, large or synthetic:N")
+
+
+def percentile(ordered, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def summarize(samples):
+    """Reduce a list of nanosecond samples to the percentile columns of a result row."""
+    ordered = sorted(samples)
+    return {
+        'samples': len(ordered),
+        'min': ordered[0],
+        'median': percentile(ordered, 0.5),
+        'p90': percentile(ordered, 0.9),
+        'p99': percentile(ordered, 0.99),
+        'max': ordered[-1],
+        'mean': round(sum(ordered) / len(ordered), 1),
+    }
+
+
+def time_builds(build, words, repeats, warmup):
+    """Return ns per word for each timed build; the built tree is torn down outside the timed region."""
+    samples = []
+    for run in range(warmup + repeats):
+        gc.collect()
+        start = time.perf_counter_ns()
+        tree = build(words)
+        elapsed = time.perf_counter_ns() - start
+        del tree
+        if run >= warmup:
+            samples.append(round(elapsed / max(len(words), 1), 1))
+    return samples
+
+
+def time_calls(function, arguments, repeats, warmup):
+    """Return the latency in ns of every timed call of function over arguments, repeated."""
+    for _ in range(warmup):
+        for argument in arguments:
+            function(argument)
+    clock = time.perf_counter_ns
+    samples = []
+    for _ in range(repeats):
+        for argument in arguments:
+            start = clock()
+            function(argument)
+            samples.append(clock() - start)
+    return samples
+
+
+def measure_memory(build, words):
+    """Return (peak, retained) traced bytes for one build."""
+    gc.collect()
+    tracemalloc.start()
+    tree = build(words)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+    return peak, retained
+
+
+def insert_loop(tree_class):
+    def build(words):
+        tree = tree_class()
+        for word in words:
+            tree.insert(word)
+        return tree
+    return build
+
+
+def insert_many(tree_class):
+    def build(words):
+        tree = tree_class()
+        tree.insert_many(words)
+        return tree
+    return build
+
+
+def run_suite(datasets=DEFAULT_DATASETS, trees=tuple(TREES), workloads=WORKLOADS,
+              repeats=5, warmup=1, queries=1000, seed=42, words=None):
+    """Run the workloads and return one result row (a dict keyed by FIELDS) per dataset, tree and workload.
+
+    Pass words to benchmark an in-memory list instead; it is reported under the first dataset name.
+    """
+    rows = []
+    for spec in datasets:
+        dataset = list(words) if words is not None else load_dataset(spec, seed)
+        random.Random(seed).shuffle(dataset)  # app.py shuffles before inserting
+        rng = random.Random(seed)
+        hits = [rng.choice(dataset) for _ in range(queries)] if dataset else []
+        prefixes = [word[:3] for word in hits[:max(queries // 10, 1)]]
+        for name in trees:
+            tree_class = TREES[name]
+
+            def row(workload, unit, **values):
+                result = dict.fromkeys(FIELDS)
+                result.update(dataset=spec, words=len(dataset), tree=name, workload=workload, unit=unit, **values)
+                rows.append(result)
+
+            if 'insert' in workloads and name not in SORTED_INSERT:
+                row('insert', 'ns/word', **summarize(time_builds(insert_loop(tree_class), dataset, repeats, warmup)))
+            if 'insert_many' in workloads:
+                row('insert_many', 'ns/word', **summarize(time_builds(insert_many(tree_class), dataset, repeats, warmup)))
+            if 'find' in workloads or 'starts_with' in workloads:
+                tree = insert_many(tree_class)(dataset)
+                if 'find' in workloads and hits:
+                    row('find', 'ns/call', **summarize(time_calls(tree.find, hits, repeats, warmup)))
+                if 'starts_with' in workloads and prefixes:
+                    row('starts_with', 'ns/call', **summarize(time_calls(tree.starts_with, prefixes, repeats, warmup)))
+                del tree
+            if 'memory' in workloads:
+                peak, retained = measure_memory(insert_many(tree_class), dataset)
+                row('memory', 'bytes', samples=1, peak_bytes=peak, retained_bytes=retained)
+        if words is not None:
+            break
+    return rows
+
+
+def environment():
+    """Describe the interpreter and machine so saved results can be compared fairly."""
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def to_json(rows, settings=None):
+    """Serialize result rows with the settings and environment that produced them."""
+    return json.dumps({'environment': environment(), 'settings': settings or {}, 'results': rows}, indent=2)
+
+
+def to_csv(rows):
+    """Serialize result rows as CSV with one column per FIELDS entry."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
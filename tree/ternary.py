@@ -1,5 +1,12 @@
-import networkx as nx
-import plotly.graph_objects as go
+from bisect import bisect_left
+from itertools import islice
+
+from tree.bulk import common_prefix_length, paused_gc, sorted_unique
+from tree.cursor import TernaryCursor
+from tree.ranking import ternary_subtree_max, top_ternary_words, weigh_path
+from tree.render import DEFAULT_BUDGET, DEFAULT_DEPTH, render_tree
+from tree.snapshot import TERNARY, MappedTernaryTree, write_snapshot
+from tree.traversal import collect_ternary_words, count_ternary_nodes, iter_ternary_words, seek_ternary_words
 
 class Node:
     """A node in the Ternary structure."""
@@ -9,205 +16,589 @@ class Node:
         self.equal = equal
         self.right = right
         self.is_end_of_string = is_end_of_string
+        self.weight = 0
+        self.max_weight = 0
+        self.count = 0  # Words ending anywhere in the subtree rooted here, left and right included
 
 class TernaryTree:
     def __init__(self):
         self.root = Node()
         self.name = "Ternary"
-        self.traversed_nodes = 0  # Counter for traversed nodes
-
-    def insert(self, word):
-        """Inserts a word into the ternary tree."""
-        self.root = self._insert(self.root, word, 0)
-
-    def _insert(self, node, word, index):
-        """Helper function to insert a word into the ternary tree."""
-        if node is None:
-            node = Node(data=word[index])
+        self.node_count = 1
+        self.generation = 0
 
-        if word[index] < node.data:
-            node.left = self._insert(node.left, word, index)
-        elif word[index] > node.data:
-            node.right = self._insert(node.right, word, index)
-        else:
-            if index + 1 == len(word):
-                node.is_end_of_string = True
+    def insert(self, word, weight=None):
+        """Inserts a word into the ternary tree; weight ranks it for top_k (None keeps the current weight, 0 if new)."""
+        if not word:
+            return
+        self.generation += 1
+        node = self.root
+        path = [node]
+        index = 0
+        while True:
+            char = word[index]
+            if char < node.data:
+                if node.left is None:
+                    node.left = Node(data=char)
+                    self.node_count += 1
+                node = node.left
+            elif char > node.data:
+                if node.right is None:
+                    node.right = Node(data=char)
+                    self.node_count += 1
+                node = node.right
+            elif index + 1 == len(word):
+                weigh_path(path, weight, node.is_end_of_string, ternary_subtree_max)
+                if not node.is_end_of_string:
+                    node.is_end_of_string = True
+                    for ancestor in path:
+                        ancestor.count += 1
+                return
             else:
-                node.equal = self._insert(node.equal, word, index + 1)
-
-        return node
-
-    def find(self, word):
-        """Find and return the node representing the word, or None if not found."""
-        self.traversed_nodes = 0  # Reset the counter before the search
+                index += 1
+                if node.equal is None:
+                    node.equal = Node(data=word[index])
+                    self.node_count += 1
+                node = node.equal
+            path.append(node)
+
+    def insert_many(self, words, balanced=True):
+        """Insert words; with balanced=True every sibling BST is left height-balanced afterwards."""
+        self.generation += 1
+        with paused_gc():
+            if not balanced:
+                for word in words:
+                    if word:
+                        self.insert(word)
+                return
+            words = sorted(set(word for word in words if word))
+            if self.root.right is None:
+                self.root.right = self._build_balanced(words)
+                self._refresh_subtree_caches()
+                return
+            for word in words:
+                self.insert(word)
+            self.rebalance()
+
+    def rebalance(self):
+        """Rebuild every sibling BST in place around its median word; equal links are untouched."""
+        self.generation += 1
+        pending = [(self.root, 'right')]  # The empty root node stays on top of the first-character BST
+        while pending:
+            parent, side = pending.pop()
+            siblings = self._in_order_siblings(getattr(parent, side))
+            # A sibling's weight is the words ending at it or continuing through its equal link
+            weights = [node.is_end_of_string + (node.equal.count if node.equal else 0) for node in siblings]
+            setattr(parent, side, self._balance_siblings(siblings, weights))
+            for node in siblings:
+                if node.equal:
+                    pending.append((node, 'equal'))
+        self._refresh_subtree_caches()
+
+    def _refresh_subtree_caches(self):
+        """Recompute every cached count and max_weight bottom-up after left/right links have moved."""
+        order = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for child in (node.left, node.equal, node.right):
+                if child:
+                    stack.append(child)
+        for node in reversed(order):
+            self._refresh_node(node)
+        self.node_count = len(order)
+
+    @staticmethod
+    def _refresh_node(node):
+        """Recompute a node's count and max_weight from its children's cached values."""
+        node.max_weight = ternary_subtree_max(node)
+        node.count = (node.is_end_of_string
+                      + (node.left.count if node.left else 0)
+                      + (node.equal.count if node.equal else 0)
+                      + (node.right.count if node.right else 0))
+
+    @staticmethod
+    def _in_order_siblings(node):
+        """Return the nodes reachable through left/right links from node, in character order."""
+        siblings = []
+        stack = []
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            siblings.append(node)
+            node = node.right
+        return siblings
+
+    @classmethod
+    def _balance_siblings(cls, siblings, weights):
+        """Relink sorted sibling nodes into a BST split at the median word and return its root."""
+        holder = Node()
+        ranges = [(holder, 'right', 0, len(siblings))]
+        while ranges:
+            parent, side, lo, hi = ranges.pop()
+            if lo >= hi:
+                setattr(parent, side, None)
+                continue
+            mid = lo + cls._median_index(weights[lo:hi])
+            node = siblings[mid]
+            setattr(parent, side, node)
+            ranges.append((node, 'right', mid + 1, hi))
+            ranges.append((node, 'left', lo, mid))
+        return holder.right
+
+    def depth_report(self):
+        """Return shape statistics: node depths as counted by find and starts_with, and sibling BST heights."""
+        words = nodes = 0
+        word_depths = node_depths = 0
+        max_depth = max_sibling_height = 0
+        stack = [(self.root, 1, 1)]  # (node, nodes visited to reach it, height within its sibling BST)
+        while stack:
+            node, depth, height = stack.pop()
+            nodes += 1
+            node_depths += depth
+            max_depth = max(max_depth, depth)
+            max_sibling_height = max(max_sibling_height, height)
+            if node.is_end_of_string:
+                words += 1
+                word_depths += depth
+            if node.left:
+                stack.append((node.left, depth + 1, height + 1))
+            if node.right:
+                stack.append((node.right, depth + 1, height + 1))
+            if node.equal:
+                stack.append((node.equal, depth + 1, 1))
+        return {
+            'words': words,
+            'nodes': nodes,
+            'max_depth': max_depth,
+            'max_sibling_height': max_sibling_height,
+            'average_find_nodes': word_depths / words if words else 0.0,
+            'average_prefix_nodes': node_depths / nodes,
+        }
+
+    @classmethod
+    def from_sorted(cls, words):
+        """Build a balanced ternary tree from words in sorted order; raises ValueError on out-of-order input."""
+        tree = cls()
+        words = list(sorted_unique(word for word in words if word))
+        with paused_gc():
+            tree.root.right = tree._build_balanced(words)
+            tree._refresh_subtree_caches()
+        return tree
+
+    def _build_balanced(self, words):
+        """Build a subtree from sorted unique words, rooting every sibling BST at the character holding its median word."""
+        holder = Node()
+        stack = [(holder, 'right', self._char_runs(words, 0, len(words), 0), 0)]
+        while stack:
+            parent, side, runs, depth = stack.pop()
+            if not runs:
+                continue
+            mid = self._median_index([hi - lo for _, lo, hi in runs])
+            char, lo, hi = runs[mid]
+            node = Node(data=char)
+            setattr(parent, side, node)
+            if len(words[lo]) == depth + 1:
+                node.is_end_of_string = True
+                lo += 1
+            if lo < hi:
+                stack.append((node, 'equal', self._char_runs(words, lo, hi, depth + 1), depth + 1))
+            stack.append((node, 'right', runs[mid + 1:], depth))
+            stack.append((node, 'left', runs[:mid], depth))
+        return holder.right
+
+    @staticmethod
+    def _median_index(weights):
+        """Return the index of the item that holds the middle unit of weight."""
+        half = sum(weights) / 2
+        seen = 0
+        for i, weight in enumerate(weights):
+            seen += weight
+            if seen > half:
+                return i
+        return len(weights) - 1
+
+    @staticmethod
+    def _char_runs(words, lo, hi, depth):
+        """Split sorted words[lo:hi] into (char, start, end) runs sharing the character at depth."""
+        runs = []
+        i = lo
+        while i < hi:
+            char = words[i][depth]
+            j = i + 1
+            while j < hi and words[j][depth] == char:
+                j += 1
+            runs.append((char, i, j))
+            i = j
+        return runs
+
+    def find(self, word, stats=None):
+        """Find and return the node representing the word, or None if not found; pass a QueryStats to count the work."""
+        if stats is not None:
+            return stats.measure('find', self._find_counted, word)
+        if not word:
+            return None
         current = self.root
         i = 0
 
-        while i < len(word):
-            self.traversed_nodes += 1  # Increment the counter for each node visited
-            if word[i] < current.data and current.left:
+        while current:
+            if word[i] < current.data:
                 current = current.left
-            elif word[i] > current.data and current.right:
+            elif word[i] > current.data:
                 current = current.right
-            elif word[i] == current.data and current.equal:
+            elif i + 1 == len(word):
+                return current if current.is_end_of_string else None
+            else:
                 current = current.equal
                 i += 1
-            else:
-                return None
-
-        return current if current.is_end_of_string else None
 
-    def starts_with(self, prefix):
-        """Return a list of all words starting with the given prefix."""
-        self.traversed_nodes = 0  # Reset before each search
+        return None
+
+    def delete(self, word):
+        """Remove a word, unlinking nodes that no longer lead to any word; returns False if it was not stored."""
+        if not word:
+            return False
+        node = self.root
+        path = [node]
+        links = []  # (parent, side) pairs leading to path[1:]
+        index = 0
+        while node is not None:
+            char = word[index]
+            if char < node.data:
+                side = 'left'
+            elif char > node.data:
+                side = 'right'
+            elif index + 1 == len(word):
+                break
+            else:
+                side = 'equal'
+                index += 1
+            links.append((node, side))
+            node = getattr(node, side)
+            path.append(node)
+        if node is None or not node.is_end_of_string:
+            return False
+        self.generation += 1
+        node.is_end_of_string = False
+        node.weight = 0
+
+        # Walk back up the word, unlinking characters that now end no word and lead nowhere
+        depth = len(path) - 1
+        while depth:
+            node = path[depth]
+            if node.is_end_of_string or node.equal:
+                break
+            parent, side = links[depth - 1]
+            setattr(parent, side, self._unlink(node))
+            self.node_count -= 1
+            if side != 'equal':  # The sibling BST still holds other characters
+                break
+            depth -= 1
+        for node in reversed(path[:depth + 1]):
+            self._refresh_node(node)
+        return True
+
+    def _unlink(self, node):
+        """Remove node from its sibling BST and return the subtree that takes its place."""
+        if node.left is None:
+            return node.right
+        if node.right is None:
+            return node.left
+        # Promote the in-order successor, the leftmost node of the right subtree
+        chain = []
+        successor = node.right
+        while successor.left:
+            chain.append(successor)
+            successor = successor.left
+        if chain:
+            chain[-1].left = successor.right
+            successor.right = node.right
+        successor.left = node.left
+        for moved in reversed(chain):
+            self._refresh_node(moved)
+        self._refresh_node(successor)
+        return successor
+
+    def starts_with(self, prefix, stats=None):
+        """Return a list of all words starting with the given prefix and count nodes traversed.
+
+        Pass a QueryStats to also count comparisons and time the call.
+        """
+        if stats is not None:
+            return stats.measure('starts_with', self._starts_with_counted, prefix)
         results = []
         if not prefix:
-            self._collect_words(self.root, '', results)
-            return results, self.traversed_nodes
-        
-        node = self._search_prefix(self.root, prefix, 0)
+            nodes_traversed = collect_ternary_words(self.root, '', results)
+            return results, nodes_traversed
+
+        node, nodes_traversed = self._search_prefix(self.root, prefix, 0)
         if node:
             if node.is_end_of_string:
                 results.append(prefix)
-            self._collect_words(node.equal, prefix, results)
-        
-        return results, self.traversed_nodes
+            nodes_traversed += collect_ternary_words(node.equal, prefix, results)
+
+        return results, nodes_traversed
+
+    def find_many(self, words):
+        """Return find(word) for each word in a batch, walking each shared prefix once."""
+        nodes = {}
+        for word, node, _ in self._walk_many(words):
+            nodes[word] = node if node is not None and word and node.is_end_of_string else None
+        return [nodes[word] for word in words]
+
+    def starts_with_many(self, prefixes):
+        """Return starts_with(prefix) for each prefix in a batch, walking each shared path once."""
+        answers = {}
+        enclosing = []  # (prefix, words) for earlier prefixes the current one may extend
+        for prefix, node, nodes_traversed in self._walk_many(prefixes):
+            while enclosing and not prefix.startswith(enclosing[-1][0]):
+                enclosing.pop()
+            if node is None:
+                answers[prefix] = ([], nodes_traversed)
+                continue
+            if enclosing:
+                outer_words = enclosing[-1][1]
+                start = bisect_left(outer_words, prefix)
+                words = outer_words[start:start + node.is_end_of_string + (node.equal.count if node.equal else 0)]
+            elif not prefix:
+                words = []
+                nodes_traversed += collect_ternary_words(self.root, '', words)
+            else:
+                words = [prefix] if node.is_end_of_string else []
+                nodes_traversed += collect_ternary_words(node.equal, prefix, words)
+            answers[prefix] = (words, nodes_traversed)
+            enclosing.append((prefix, words))
+        return [answers[prefix] for prefix in prefixes]
+
+    def _walk_many(self, prefixes):
+        """Yield (prefix, node or None, nodes newly visited) for the distinct prefixes in sorted order.
+
+        The node is the one _search_prefix returns (the root for the empty
+        prefix). path[d] is the node matching character d - 1 and is kept from
+        the previous prefix up to the characters the two share.
+        """
+        path = [self.root]
+        previous = ''
+        for prefix in sorted(set(prefixes)):
+            del path[common_prefix_length(prefix, previous) + 1:]
+            node = path[-1]
+            steps = 0
+            for index in range(len(path) - 1, len(prefix)):
+                char = prefix[index]
+                node = node.equal if index else node  # The root heads the first-character BST
+                while node is not None and node.data != char:
+                    steps += 1
+                    node = node.left if char < node.data else node.right
+                if node is None:
+                    break
+                steps += 1
+                path.append(node)
+            yield prefix, node, steps
+            previous = prefix
+
+    def _search_counted(self, prefix, stats):
+        """_search_prefix from the root that counts into stats instead of returning the nodes traversed."""
+        node = self.root
+        index = 0
+        while node is not None:
+            stats.nodes_visited += 1
+            stats.char_comparisons += 1
+            if prefix[index] < node.data:
+                node = node.left
+                continue
+            stats.char_comparisons += 1
+            if prefix[index] > node.data:
+                node = node.right
+            elif index + 1 == len(prefix):
+                return node
+            else:
+                node = node.equal
+                index += 1
+        return None
 
-    def _search_prefix(self, node, prefix, index):
-        """Helper function to search for the node that matches the end of the prefix."""
-        if node is None:
+    def _find_counted(self, word, stats):
+        if not word:
             return None
-        self.traversed_nodes += 1  # Increment nodes traversed
-        if prefix[index] < node.data:
-            return self._search_prefix(node.left, prefix, index)
-        elif prefix[index] > node.data:
-            return self._search_prefix(node.right, prefix, index)
-        else:
-            if index + 1 == len(prefix):
-                return node
-            return self._search_prefix(node.equal, prefix, index + 1)
+        node = self._search_counted(word, stats)
+        return node if node is not None and node.is_end_of_string else None
 
-    def _collect_words(self, node, prefix, results):
-        """Helper function to collect all words from a given node."""
+    def _starts_with_counted(self, prefix, stats):
+        before = stats.nodes_visited
+        results = []
+        if not prefix:
+            stats.nodes_visited += collect_ternary_words(self.root, '', results)
+        else:
+            node = self._search_counted(prefix, stats)
+            if node:
+                if node.is_end_of_string:
+                    results.append(prefix)
+                stats.nodes_visited += collect_ternary_words(node.equal, prefix, results)
+        return results, stats.nodes_visited - before
+
+    def match(self, pattern, length=None):
+        """Return words matching pattern, where ? is any one character and * any run, and the nodes traversed.
+
+        length, when given, keeps only words of exactly that many characters.
+        Literal characters steer through the left/right links like a search, so
+        only branches that can still match are visited. Results are sorted.
+        """
+        while '**' in pattern:
+            pattern = pattern.replace('**', '*')
+        # only_stars[i] is True when pattern[i:] can match the empty string
+        only_stars = [False] * len(pattern) + [True]
+        for i in range(len(pattern) - 1, -1, -1):
+            only_stars[i] = pattern[i] == '*' and only_stars[i + 1]
+        # Without a star every word is reached along one path, so repeats need no tracking
+        seen = set() if '*' in pattern else None
+
+        results = set()
+        nodes_traversed = 0
+        stack = [(self.root, '', 0)]  # (subtree, characters matched before it, pattern position)
+        while stack:
+            node, prefix, i = stack.pop()
+            if node is None or i == len(pattern):
+                continue
+            if length is not None and len(prefix) >= length:
+                continue
+            if seen is not None:
+                if (node, i) in seen:
+                    continue
+                seen.add((node, i))
+            if only_stars[i]:
+                # Nothing but a run of anything is left: every word in this subtree matches
+                words = []
+                nodes_traversed += collect_ternary_words(node, prefix, words)
+                results.update(word for word in words if length is None or len(word) == length)
+                continue
+            nodes_traversed += 1
+            wanted = pattern[i]
+            if wanted == '*':
+                stack.append((node, prefix, i + 1))  # The run is empty
+                following = i  # Or it swallows this character and maybe more
+            else:
+                following = i + 1
+            if wanted == '*' or wanted == '?':
+                stack.append((node.left, prefix, i))
+                stack.append((node.right, prefix, i))
+            elif wanted < node.data:
+                stack.append((node.left, prefix, i))
+                continue
+            elif wanted > node.data:
+                stack.append((node.right, prefix, i))
+                continue
+            word = prefix + node.data
+            if node.is_end_of_string and only_stars[following] and (length is None or len(word) == length):
+                results.add(word)
+            stack.append((node.equal, word, following))
+        return sorted(results), nodes_traversed
+
+    def count_prefix(self, prefix):
+        """Return how many words start with prefix, walking only the prefix path."""
+        if not prefix:
+            return self.root.count
+        node, _ = self._search_prefix(self.root, prefix, 0)
         if node is None:
-            return
+            return 0
+        return node.is_end_of_string + (node.equal.count if node.equal else 0)
+
+    def top_k(self, prefix, k):
+        """Return the k heaviest words starting with prefix as (word, weight) pairs and the count of nodes traversed."""
+        nodes_traversed = 0
+        if not prefix:
+            entries = [(self.root, '')]
+        else:
+            node, nodes_traversed = self._search_prefix(self.root, prefix, 0)
+            if node is None:
+                return [], nodes_traversed
+            entries = [(node.equal, prefix)] if node.equal else []
+            if node.is_end_of_string:
+                entries.append((None, prefix, node.weight))
+        results, visited = top_ternary_words(entries, k)
+        return results, nodes_traversed + visited
+
+    def cursor(self, prefix=''):
+        """Return a TernaryCursor at prefix that push(char) and pop() move one keystroke at a time."""
+        return TernaryCursor(self, prefix)
+
+    def iter_prefix(self, prefix='', limit=None, after=None):
+        """Lazily yield up to limit words starting with prefix in lexicographic order.
 
-        self._collect_words(node.left, prefix, results)
+        Pass the last word of the previous page as after to resume right past it.
+        """
+        if not prefix:
+            stack = seek_ternary_words(self.root, '', after)
+        else:
+            node, _ = self._search_prefix(self.root, prefix, 0)
+            if node is None:
+                return
+            stack = seek_ternary_words(node.equal, prefix, after)
+            if node.is_end_of_string and (after is None or prefix > after):
+                stack.append((None, prefix))  # The prefix itself sorts first
+        yield from islice(iter_ternary_words(stack), limit)
 
-        if node.is_end_of_string:
-            results.append(prefix + node.data)
+    def _search_prefix(self, node, prefix, index):
+        """Return the node that matches the end of the prefix, or None, and the count of nodes traversed."""
+        if index == len(prefix):
+            return node, 0
+        nodes_traversed = 0
+        while node is not None:
+            nodes_traversed += 1
+            if prefix[index] < node.data:
+                node = node.left
+            elif prefix[index] > node.data:
+                node = node.right
+            elif index + 1 == len(prefix):
+                return node, nodes_traversed
+            else:
+                node = node.equal
+                index += 1
+        return None, nodes_traversed
 
-        self._collect_words(node.equal, prefix + node.data, results)
+    def save(self, path):
+        """Write the tree to path as a versioned binary snapshot; weights must be integers."""
+        write_snapshot(path, TERNARY, self.root, self.node_count)
 
-        self._collect_words(node.right, prefix, results)
+    @staticmethod
+    def load(path):
+        """Open a snapshot written by save() for read-only queries; nodes are read from the mapped file on demand."""
+        return MappedTernaryTree(path)
 
     def size(self, current=None):
-        """Return the total number of nodes in the Ternary tree."""
+        """Return the total number of nodes in the Ternary tree, or in the subtree under current."""
         if not current:
-            current = self.root
-        return 1 + self._size(current.left) + self._size(current.equal) + self._size(current.right)
+            return self.node_count
+        return count_ternary_nodes(current)
 
-    def _size(self, current):
-        """Helper function to calculate all nodes from a given node."""
-        if not current:
-            return 0
-        else:
-            return 1 + self._size(current.left) + self._size(current.equal) + self._size(current.right)
+    def __len__(self):
+        """Return the number of words stored."""
+        return self.root.count
 
-    def visualize(self, prefix=''):
-        """Visualizes the ternary tree using NetworkX and Plotly."""
-        # Create a directed graph
-        graph = nx.DiGraph()
+    def visualize(self, prefix='', budget=DEFAULT_BUDGET, max_depth=DEFAULT_DEPTH, expanded=()):
+        """Visualizes the ternary tree with plotly, collapsing subtrees beyond the node budget or depth limit.
 
-        current = self._search_prefix(self.root, prefix, 0)
+        Node keys spell the links taken from the drawn root: < for left, = for equal
+        and > for right; expanded holds keys of collapsed nodes to open anyway.
+        """
+        current, _ = self._search_prefix(self.root, prefix, 0)
         if not current:
             print("Prefix not in tree")
             return
-        self.__add_nodes(graph, node=current, node_id="Root")
-
-        # Use spring layout for better visualization
-        pos = nx.spring_layout(graph)
-        edge_x = []
-        edge_y = []
-
-        for edge in graph.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.append(x0)
-            edge_x.append(x1)
-            edge_x.append(None)
-            edge_y.append(y0)
-            edge_y.append(y1)
-            edge_y.append(None)
-
-        edge_trace = go.Scatter(
-            x=edge_x, y=edge_y,
-            line=dict(width=0.5, color='#888'),
-            hoverinfo='none',
-            mode='lines')
-
-        node_x = []
-        node_y = []
-        labels = []
-
-        for node in graph.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
-            labels.append(graph.nodes[node].get('label', ''))
-
-        node_trace = go.Scatter(
-            x=node_x, y=node_y,
-            mode='markers+text',
-            text=labels,
-            textposition='top center',
-            hoverinfo='text',
-            marker=dict(
-                showscale=False,
-                color='skyblue',
-                size=10,
-                line_width=2))
-
-        fig = go.Figure(data=[edge_trace, node_trace],
-                        layout=go.Layout(
-                            title=f'Ternary Tree Visualization (Prefix: {prefix})',
-                            titlefont_size=16,
-                            showlegend=False,
-                            hovermode='closest',
-                            margin=dict(b=20, l=5, r=5, t=40),
-                            annotations=[dict(
-                                text="Ternary Tree Visualization",
-                                showarrow=False,
-                                xref="paper", yref="paper",
-                                x=0.005, y=-0.002)],
-                            xaxis=dict(showgrid=False, zeroline=False),
-                            yaxis=dict(showgrid=False, zeroline=False))
-                        )
-        return fig
-
-    def __add_nodes(self, graph, node, node_id):
-        """Helper method to add nodes to the networkx graph."""
-        if node is None:
-            return
 
-        # Add the current node
-        label = f"{node.data} (End)" if node.is_end_of_string else node.data
-        graph.add_node(node_id, label=label)
-
-        # Add left child
-        if node.left:
-            left_id = node_id + "L"
-            graph.add_edge(node_id, left_id)
-            self.__add_nodes(graph, node.left, left_id)
-
-        # Add equal child
-        if node.equal:
-            equal_id = node_id + node.data
-            graph.add_edge(node_id, equal_id)
-            self.__add_nodes(graph, node.equal, equal_id)
-
-        # Add right child
-        if node.right:
-            right_id = node_id + "R"
-            graph.add_edge(node_id, right_id)
-            self.__add_nodes(graph, node.right, right_id)
+        def children(node, key):
+            if not key and prefix:
+                # Below a prefix only its equal subtree holds matching words
+                links = (('=', node.equal),)
+            else:
+                links = (('<', node.left), ('=', node.equal), ('>', node.right))
+            return [(child, key + link, child.data) for link, child in links if child]
+
+        def word_count(node):
+            if node is current and prefix:
+                return node.is_end_of_string + (node.equal.count if node.equal else 0)
+            return node.count
+
+        return render_tree(f'Ternary Tree Visualization (Prefix: {prefix})', current, prefix or 'root', children,
+                           word_count, lambda node: node.is_end_of_string, budget, max_depth, expanded, owner=self)
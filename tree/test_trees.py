@@ -0,0 +1,607 @@
+import os
+import random
+import tempfile
+import unittest
+from tree.tries import PrefixTree
+from tree.ternary import TernaryTree
+from tree.radix import RadixTree
+from tree.dawg import DAWG
+from tree.ingest import count_words, load_tree, sample_file, sample_words
+from tree.cache import CachedTree
+from tree.louds import BitVector, LoudsTrie
+from tree.render import COLLAPSED
+from tree.stats import QueryStats
+
+WORDS = ['bad', 'bat', 'bath', 'bathroom', 'battle', 'battery', 'cat', 'cage', 'a']
+
+
+class CompactTrieTest(unittest.TestCase):
+
+    def setUp(self):
+        """Build the same word list in both Trie layouts."""
+        self.trie = PrefixTree()
+        self.compact = PrefixTree(compact=True)
+        for word in WORDS:
+            self.trie.insert(word)
+            self.compact.insert(word)
+
+    def test_same_queries(self):
+        """The compact layout answers find and starts_with like the default one."""
+        for prefix in ['', 'b', 'bat', 'bath', 'x']:
+            self.assertEqual(self.compact.starts_with(prefix), self.trie.starts_with(prefix))
+        self.assertIsNotNone(self.compact.find('bath'))
+        self.assertIsNone(self.compact.find('batt'))
+        self.assertEqual(self.compact.size(), self.trie.size())
+
+    def test_no_prefix_copies(self):
+        """Compact nodes are slotted and keep no prefix text."""
+        node = self.compact.find('bathroom')
+        self.assertFalse(hasattr(node, 'text'))
+        self.assertFalse(hasattr(node, '__dict__'))
+
+
+class FrozenTrieTest(unittest.TestCase):
+
+    def setUp(self):
+        """Freeze a Trie built from the shared word list."""
+        self.trie = PrefixTree()
+        for word in WORDS:
+            self.trie.insert(word)
+        self.frozen = self.trie.freeze()
+
+    def test_find(self):
+        """Frozen find matches the Trie for stored words, prefixes and misses."""
+        for word in WORDS:
+            self.assertIsNotNone(self.frozen.find(word))
+        for word in ['ba', 'batt', 'dog', 'bathroomz']:
+            self.assertIsNone(self.frozen.find(word))
+
+    def test_starts_with(self):
+        """Frozen starts_with returns the same words, sorted, and the same traversal count."""
+        for prefix in ['', 'b', 'bat', 'c', 'x']:
+            words, nodes_traversed = self.trie.starts_with(prefix)
+            self.assertEqual(self.frozen.starts_with(prefix), (sorted(words), nodes_traversed))
+
+    def test_size(self):
+        """The frozen trie keeps one state per Trie node and counts its words."""
+        self.assertEqual(self.frozen.size(), self.trie.size())
+        self.assertEqual(len(self.frozen), len(WORDS))
+
+
+class BulkLoadTest(unittest.TestCase):
+
+    def test_bulk_matches_insert(self):
+        """insert_many and from_sorted store the same words as one-by-one insertion."""
+        for tree_class in (PrefixTree, TernaryTree, RadixTree):
+            one_by_one = tree_class()
+            for word in WORDS:
+                one_by_one.insert(word)
+            many = tree_class()
+            many.insert_many(WORDS)
+            bulk = tree_class.from_sorted(sorted(WORDS))
+            for prefix in ['', 'b', 'bat', 'ba', 'c', 'x']:
+                expected = sorted(one_by_one.starts_with(prefix)[0])
+                self.assertEqual(sorted(many.starts_with(prefix)[0]), expected)
+                self.assertEqual(sorted(bulk.starts_with(prefix)[0]), expected)
+
+    def test_radix_shape(self):
+        """A bulk loaded Radix Tree splits edges exactly like incremental inserts."""
+        one_by_one = RadixTree()
+        for word in WORDS:
+            one_by_one.insert(word)
+        self.assertEqual(RadixTree.from_sorted(sorted(WORDS)).size(), one_by_one.size())
+
+    def test_unsorted_input(self):
+        """from_sorted rejects input that is not in sorted order."""
+        for tree_class in (PrefixTree, TernaryTree, RadixTree):
+            with self.assertRaises(ValueError):
+                tree_class.from_sorted(['bat', 'bad'])
+
+
+class TernaryTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        """Insert the shared words in sorted order, the worst case for sibling BSTs."""
+        self.tree = TernaryTree()
+        self.tree.insert_many(sorted(WORDS), balanced=False)
+
+    def test_find(self):
+        """find returns nodes for stored words, including ones with no longer extension."""
+        for word in WORDS:
+            self.assertIsNotNone(self.tree.find(word))
+        for word in ['ba', 'batt', 'bathroo', 'dog', '']:
+            self.assertIsNone(self.tree.find(word))
+
+    def test_rebalance(self):
+        """rebalance keeps every word and does not lengthen any lookup."""
+        before = self.tree.depth_report()
+        words = sorted(self.tree.starts_with('')[0])
+        self.tree.rebalance()
+        after = self.tree.depth_report()
+        self.assertEqual(sorted(self.tree.starts_with('')[0]), words)
+        self.assertLess(after['average_find_nodes'], before['average_find_nodes'])
+        self.assertLessEqual(after['max_depth'], before['max_depth'])
+        self.assertEqual(after['words'], len(WORDS))
+        for word in WORDS:
+            self.assertIsNotNone(self.tree.find(word))
+
+    def test_match(self):
+        """match handles ? and * wildcards and the optional length constraint."""
+        self.assertEqual(self.tree.match('ba?')[0], ['bad', 'bat'])
+        self.assertEqual(self.tree.match('bat*')[0], ['bat', 'bath', 'bathroom', 'battery', 'battle'])
+        self.assertEqual(self.tree.match('*t*', length=3)[0], ['bat', 'cat'])
+        self.assertEqual(self.tree.match('?a*e')[0], ['battle', 'cage'])
+        self.assertEqual(self.tree.match('x*')[0], [])
+
+    def test_match_prunes(self):
+        """A pattern with a literal head visits only part of the tree."""
+        self.assertLess(self.tree.match('ca?e')[1], self.tree.size())
+
+    def test_balanced_build_matches_rebalance(self):
+        """A balanced bulk build has the same shape as rebalancing an unbalanced one."""
+        self.tree.rebalance()
+        self.assertEqual(TernaryTree.from_sorted(sorted(WORDS)).depth_report(), self.tree.depth_report())
+
+
+class RadixTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = RadixTree()
+        for word in WORDS:
+            self.tree.insert(word)
+
+    def test_find(self):
+        """find returns nodes for stored words only."""
+        for word in WORDS:
+            self.assertIsNotNone(self.tree.find(word))
+        for word in ['ba', 'batt', 'bathroo', 'dog']:
+            self.assertIsNone(self.tree.find(word))
+
+    def test_starts_with_mid_edge(self):
+        """A prefix ending partway along an edge still returns the words below it."""
+        self.assertEqual(sorted(self.tree.starts_with('bathr')[0]), ['bathroom'])
+        self.assertEqual(sorted(self.tree.starts_with('ca')[0]), ['cage', 'cat'])
+
+
+class IterPrefixTest(unittest.TestCase):
+
+    def setUp(self):
+        self.trees = []
+        for tree_class in (PrefixTree, TernaryTree, RadixTree):
+            tree = tree_class()
+            for word in WORDS:
+                tree.insert(word)
+            self.trees.append(tree)
+
+    def test_sorted_and_limited(self):
+        """iter_prefix yields matching words in lexicographic order and honours limit."""
+        for tree in self.trees:
+            self.assertEqual(list(tree.iter_prefix('bat')), ['bat', 'bath', 'bathroom', 'battery', 'battle'])
+            self.assertEqual(list(tree.iter_prefix('b', limit=2)), ['bad', 'bat'])
+            self.assertEqual(list(tree.iter_prefix('x')), [])
+
+    def test_pages(self):
+        """Resuming after the last word of each page walks the whole listing exactly once."""
+        for tree in self.trees:
+            pages = []
+            after = None
+            while True:
+                page = list(tree.iter_prefix('', limit=2, after=after))
+                if not page:
+                    break
+                pages.extend(page)
+                after = page[-1]
+            self.assertEqual(pages, sorted(WORDS))
+            self.assertEqual(list(tree.iter_prefix('bat', after='bath')), ['bathroom', 'battery', 'battle'])
+            self.assertEqual(list(tree.iter_prefix('ca', after='bz')), ['cage', 'cat'])
+
+
+class TopKTest(unittest.TestCase):
+
+    def setUp(self):
+        """Weight the shared words by their position so later words rank higher."""
+        self.trees = []
+        for tree_class in (PrefixTree, TernaryTree, RadixTree):
+            tree = tree_class()
+            for weight, word in enumerate(WORDS):
+                tree.insert(word, weight)
+            self.trees.append(tree)
+
+    def test_heaviest_first(self):
+        """top_k returns the heaviest matches first, with their weights."""
+        for tree in self.trees:
+            self.assertEqual(tree.top_k('bat', 2)[0], [('battery', 5), ('battle', 4)])
+            self.assertEqual(tree.top_k('', 1)[0], [('a', 8)])
+            self.assertEqual(tree.top_k('x', 3)[0], [])
+
+    def test_reweighting(self):
+        """Lowering or keeping a weight on re-insert updates the cached subtree maxima."""
+        for tree in self.trees:
+            tree.insert('battery', 0)
+            tree.insert('battle')
+            self.assertEqual(tree.top_k('batt', 2)[0], [('battle', 4), ('battery', 0)])
+
+    def test_prunes(self):
+        """A top-1 query opens fewer nodes than the full subtree."""
+        for tree in self.trees:
+            self.assertLess(tree.top_k('b', 1)[1], tree.top_k('b', len(WORDS))[1])
+
+
+class CountTest(unittest.TestCase):
+
+    def test_count_prefix(self):
+        """count_prefix, len and size agree with full walks however the tree was built."""
+        for tree_class in (PrefixTree, TernaryTree, RadixTree):
+            one_by_one = tree_class()
+            for word in WORDS + ['bat']:
+                one_by_one.insert(word)
+            for tree in (one_by_one, tree_class.from_sorted(sorted(WORDS))):
+                self.assertEqual(len(tree), len(WORDS))
+                for prefix in ['', 'b', 'ba', 'bat', 'bathr', 'cag', 'x']:
+                    self.assertEqual(tree.count_prefix(prefix), len(tree.starts_with(prefix)[0]))
+                self.assertEqual(tree.size(), tree.size(tree.root))
+
+    def test_radix_split_counts(self):
+        """Splitting a Radix edge keeps the counts on both halves."""
+        tree = RadixTree()
+        for word in ['battle', 'battery', 'bat']:
+            tree.insert(word)
+        self.assertEqual(tree.count_prefix('batt'), 2)
+        self.assertEqual(tree.count_prefix('ba'), 3)
+        self.assertEqual(tree.size(), 5)  # root, bat, t, le, ery
+
+
+class FuzzyTest(unittest.TestCase):
+
+    def test_matches_with_distances(self):
+        """fuzzy returns every stored word within the edit budget, closest first."""
+        for tree_class in (PrefixTree, RadixTree):
+            tree = tree_class()
+            for word in WORDS:
+                tree.insert(word)
+            self.assertEqual(tree.fuzzy('bat', 0)[0], [('bat', 0)])
+            self.assertEqual(tree.fuzzy('bqt', 1)[0], [('bat', 1)])
+            self.assertEqual(tree.fuzzy('bqt', 2)[0], [('bat', 1), ('bad', 2), ('bath', 2), ('cat', 2)])
+            self.assertEqual(tree.fuzzy('cage', 1)[0], [('cage', 0)])
+            self.assertEqual(tree.fuzzy('bathrom', 1)[0], [('bathroom', 1)])
+            self.assertEqual(tree.fuzzy('zzzz', 2)[0], [])
+
+    def test_prunes(self):
+        """A tight budget visits fewer nodes than the whole tree."""
+        tree = PrefixTree()
+        for word in WORDS:
+            tree.insert(word)
+        self.assertLess(tree.fuzzy('battle', 1)[1], tree.size())
+
+
+class DeleteTest(unittest.TestCase):
+
+    def test_delete_matches_fresh_build(self):
+        """Deleting words leaves the same words and node count as building without them."""
+        removed = ['bath', 'battle', 'cage', 'a', 'bad']
+        kept = [word for word in WORDS if word not in removed]
+        for tree_class in (PrefixTree, TernaryTree, RadixTree):
+            tree = tree_class()
+            for word in WORDS:
+                tree.insert(word, weight=len(word))
+            for word in removed:
+                self.assertTrue(tree.delete(word))
+            self.assertFalse(tree.delete('bath'))
+            self.assertFalse(tree.delete('ba'))
+            fresh = tree_class()
+            for word in kept:
+                fresh.insert(word)
+            self.assertEqual(sorted(tree.starts_with('')[0]), sorted(kept))
+            self.assertEqual(tree.size(), fresh.size())
+            self.assertEqual(len(tree), len(kept))
+            self.assertIsNone(tree.find('bath'))
+            self.assertEqual(tree.top_k('b', 1)[0], [('bathroom', 8)])
+
+    def test_radix_merges_edges(self):
+        """A Radix node left with one child and no word merges back into it."""
+        tree = RadixTree()
+        for word in ['bat', 'battle', 'battery']:
+            tree.insert(word)
+        tree.delete('battery')
+        self.assertEqual(tree.root.children['b'].children['t'].text, 'tle')
+        tree.delete('bat')
+        self.assertEqual(tree.root.children['b'].text, 'battle')
+        self.assertEqual(tree.size(), 2)
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        """A loaded snapshot answers find, starts_with and count_prefix like the tree it was saved from."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'words.tree')
+            for tree_class in (PrefixTree, TernaryTree, RadixTree):
+                tree = tree_class()
+                for word in WORDS:
+                    tree.insert(word)
+                tree.save(path)
+                mapped = tree_class.load(path)
+                self.assertEqual(len(mapped), len(tree))
+                self.assertEqual(mapped.size(), tree.size())
+                self.assertEqual(mapped.starts_with('')[0], sorted(WORDS))
+                self.assertEqual(mapped.starts_with('bat')[0], ['bat', 'bath', 'bathroom', 'battery', 'battle'])
+                self.assertEqual(mapped.starts_with('batt')[0], ['battery', 'battle'])
+                self.assertEqual(mapped.starts_with('x')[0], [])
+                self.assertEqual(mapped.count_prefix('ba'), 6)
+                self.assertIsNotNone(mapped.find('bath'))
+                self.assertIsNone(mapped.find('ba'))
+                mapped.close()
+
+    def test_rejects_other_kind(self):
+        """Loading a snapshot as the wrong tree type raises ValueError."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'words.tree')
+            RadixTree().save(path)
+            with self.assertRaises(ValueError):
+                PrefixTree.load(path)
+
+
+class QueryStatsTest(unittest.TestCase):
+
+    def test_counts_match_plain_queries(self):
+        """A counted query returns the same answer and node count as the plain one and keeps counters off the tree."""
+        for tree_class in (PrefixTree, TernaryTree, RadixTree):
+            tree = tree_class()
+            for word in WORDS:
+                tree.insert(word)
+            for prefix in ['', 'bat', 'batt', 'x']:
+                stats = QueryStats()
+                self.assertEqual(tree.starts_with(prefix, stats), tree.starts_with(prefix))
+                self.assertEqual(stats.nodes_visited, tree.starts_with(prefix)[1])
+            stats = QueryStats()
+            self.assertIs(tree.find('battle', stats), tree.find('battle'))
+            self.assertGreater(stats.char_comparisons, 0)
+            self.assertIn('find', stats.elapsed_ns)
+            self.assertFalse(hasattr(tree, 'traversed_nodes'))
+
+    def test_edge_comparisons(self):
+        """Only the Radix tree compares whole edge labels."""
+        for tree_class, expected in ((PrefixTree, 0), (RadixTree, 4)):  # ba, t, t, le
+            tree = tree_class()
+            for word in WORDS:
+                tree.insert(word)
+            stats = QueryStats()
+            tree.find('battle', stats)
+            self.assertEqual(stats.edge_comparisons, expected)
+
+
+class BatchTest(unittest.TestCase):
+
+    def test_matches_single_queries(self):
+        """Batched queries answer in input order like one call per query, visiting shared nodes once."""
+        prefixes = ['bat', 'b', 'x', 'batt', 'b', 'bath', 'c', '', 'battlex']
+        for tree_class in (PrefixTree, TernaryTree, RadixTree):
+            tree = tree_class()
+            for word in WORDS:
+                tree.insert(word)
+            answers = tree.starts_with_many(prefixes)
+            self.assertEqual([words for words, _ in answers], [tree.starts_with(prefix)[0] for prefix in prefixes])
+            self.assertEqual(tree.starts_with_many(['ba']), [tree.starts_with('ba')])
+            self.assertLess(sum(nodes for _, nodes in dict(zip(prefixes, answers)).values()),
+                            sum(tree.starts_with(prefix)[1] for prefix in set(prefixes)))
+            words = ['battle', 'bat', 'batt', 'zebra', 'a']
+            self.assertEqual(tree.find_many(words), [tree.find(word) for word in words])
+
+
+class LoudsTest(unittest.TestCase):
+
+    def test_matches_trie(self):
+        """The LOUDS trie answers find, starts_with and count_prefix like the Trie it encodes."""
+        trie = PrefixTree()
+        trie.insert_many(WORDS)
+        for louds in (trie.succinct(), LoudsTrie.from_sorted(sorted(WORDS))):
+            self.assertEqual((louds.size(), len(louds)), (trie.size(), len(trie)))
+            for prefix in ['', 'ba', 'bat', 'bath', 'x']:
+                self.assertEqual(louds.starts_with(prefix), (sorted(trie.starts_with(prefix)[0]), trie.starts_with(prefix)[1]))
+                self.assertEqual(louds.count_prefix(prefix), trie.count_prefix(prefix))
+            self.assertIsNotNone(louds.find('battery'))
+            self.assertIsNone(louds.find('batt'))
+
+    def test_rank_select(self):
+        """rank and select0 agree with a plain scan across word boundaries."""
+        bits = [(i * 7) % 3 == 0 for i in range(300)]
+        vector = BitVector(bits)
+        zeros = [i for i, bit in enumerate(bits) if not bit]
+        self.assertEqual([vector.select0(k + 1) for k in range(len(zeros))], zeros)
+        self.assertEqual([vector.rank(i) for i in range(301)], [sum(bits[:i]) for i in range(301)])
+
+
+class DawgTest(unittest.TestCase):
+
+    def test_shares_suffixes(self):
+        """The DAWG answers like a Trie while storing shared endings once."""
+        dawg = DAWG.from_sorted(['tap', 'taps', 'top', 'tops'])
+        self.assertEqual(dawg.size(), 5)  # root, t, the shared a/o state, p and s
+        self.assertEqual(dawg.starts_with('t')[0], ['tap', 'taps', 'top', 'tops'])
+        self.assertIsNotNone(dawg.find('tops'))
+        self.assertIsNone(dawg.find('to'))
+        trie = PrefixTree()
+        dawg = DAWG()
+        trie.insert_many(WORDS)
+        dawg.insert_many(WORDS)
+        for prefix in ['', 'ba', 'bat', 'x']:
+            self.assertEqual(dawg.starts_with(prefix)[0], sorted(trie.starts_with(prefix)[0]))
+            self.assertEqual(dawg.count_prefix(prefix), trie.count_prefix(prefix))
+        self.assertLess(dawg.size(), trie.size())
+
+    def test_sorted_insert_only(self):
+        """Out-of-order words and words added after finish() are rejected."""
+        dawg = DAWG()
+        dawg.insert('bat')
+        with self.assertRaises(ValueError):
+            dawg.insert('bad')
+        dawg.finish()
+        with self.assertRaises(ValueError):
+            dawg.insert('cat')
+
+    def test_figure_shows_every_transition(self):
+        """Every drawn, open state has each transition drawn as a tree edge or a dashed link, whatever the budget."""
+        rng = random.Random(3)
+        for _ in range(60):
+            words = [''.join(rng.choice('abc') for _ in range(rng.randint(1, 6))) for _ in range(rng.randint(5, 40))]
+            dawg = DAWG()
+            dawg.insert_many(words)
+            for budget in (5, 10, 20):
+                figure = dawg.visualize(budget=budget)
+                nodes = figure.data[-1]
+                drawn = {}
+                for index, key in enumerate(nodes.customdata):
+                    state = dawg.root
+                    for char in key:
+                        state = state.children[char]
+                    drawn[id(state)] = index
+                segments = set()
+                for trace in figure.data[:-1]:
+                    xs, ys = list(trace.x), list(trace.y)
+                    for start in range(0, len(xs), 3):
+                        segments.add(((xs[start], ys[start]), (xs[start + 1], ys[start + 1])))
+                for key, kind, x, y in zip(nodes.customdata, nodes.marker.color, nodes.x, nodes.y):
+                    if kind == COLLAPSED:
+                        continue
+                    state = dawg.root
+                    for char in key:
+                        state = state.children[char]
+                    for child in state.children.values():
+                        self.assertIn(id(child), drawn)
+                        other = drawn[id(child)]
+                        self.assertIn(((x, y), (nodes.x[other], nodes.y[other])), segments)
+
+
+class RenderTest(unittest.TestCase):
+
+    def test_budget_and_expand(self):
+        """Figures stay within the node budget, and a clicked collapsed node opens on the next render."""
+        words = [f"{a}{b}{c}" for a in 'abcdef' for b in 'ghijkl' for c in 'mnopqr']
+        for tree_class in (PrefixTree, TernaryTree, RadixTree):
+            tree = tree_class()
+            tree.insert_many(words)
+            nodes = tree.visualize('', budget=20).data[1]
+            self.assertLessEqual(len(nodes.x), 20)
+            closed = [key for key, kind in zip(nodes.customdata, nodes.marker.color) if kind == COLLAPSED]
+            self.assertTrue(closed)
+            opened = tree.visualize('', budget=20, expanded=[closed[0]]).data[1]
+            self.assertGreater(len(opened.x), len(nodes.x))
+
+    def test_cached_layouts(self):
+        """Zooming in reuses the wider layout's positions, and a change to the tree redraws it."""
+        for tree_class in (PrefixTree, TernaryTree, RadixTree):
+            tree = tree_class()
+            tree.insert_many(WORDS)
+            fresh = tree_class()
+            fresh.insert_many(WORDS)
+            tree.visualize('')
+            zoomed = tree.visualize('b')
+            self.assertEqual(list(zoomed.data[1].x), list(fresh.visualize('b').data[1].x))
+            self.assertEqual(list(zoomed.data[1].customdata), list(fresh.visualize('b').data[1].customdata))
+            generation = tree.generation
+            tree.insert('banana')
+            self.assertGreater(tree.generation, generation)
+            self.assertGreater(len(tree.visualize('b').data[1].x), len(zoomed.data[1].x))
+
+    def test_prefix_inside_radix_edge(self):
+        """A Radix prefix ending partway along an edge still draws the subtree below it."""
+        tree = RadixTree()
+        for word in WORDS:
+            tree.insert(word)
+        figure = tree.visualize('batt')
+        self.assertGreater(len(figure.data[1].x), 1)
+
+
+class DeepKeyTest(unittest.TestCase):
+
+    def test_long_keys(self):
+        """Keys far longer than the recursion limit can be inserted, listed, sized and drawn."""
+        long_word = 'a' * 5000
+        for tree_class in (PrefixTree, TernaryTree, RadixTree):
+            tree = tree_class()
+            for word in ['bat', long_word, long_word + 'b']:
+                tree.insert(word)
+            self.assertEqual(sorted(tree.starts_with('')[0]), ['a' * 5000, long_word + 'b', 'bat'])
+            self.assertIsNotNone(tree.find(long_word + 'b'))
+            self.assertGreater(tree.size(), 2)
+
+
+class CursorTest(unittest.TestCase):
+
+    def test_keystrokes_match_prefix_queries(self):
+        """Typing and deleting characters gives the same answers as querying each prefix from the root."""
+        for tree_class in (PrefixTree, TernaryTree, RadixTree):
+            tree = tree_class()
+            for weight, word in enumerate(WORDS):
+                tree.insert(word, weight)
+            cursor = tree.cursor()
+            for text in ['bathroom', 'battlex', 'cage', 'a']:
+                for char in text:
+                    cursor.push(char)
+                    prefix = cursor.prefix
+                    self.assertEqual(list(cursor.completions()), list(tree.iter_prefix(prefix)))
+                    self.assertEqual(cursor.count(), tree.count_prefix(prefix))
+                    self.assertEqual(cursor.is_word(), tree.find(prefix) is not None)
+                    self.assertEqual(cursor.top(2), tree.top_k(prefix, 2)[0])
+                while len(cursor):
+                    cursor.pop()
+            self.assertRaises(IndexError, cursor.pop)
+
+    def test_follows_changes(self):
+        """A cursor walks its prefix again after the tree changes, even mid-edge in a Radix Tree."""
+        for tree_class in (PrefixTree, TernaryTree, RadixTree):
+            tree = tree_class()
+            for word in WORDS:
+                tree.insert(word)
+            cursor = tree.cursor('batt')
+            tree.insert('battalion')
+            self.assertEqual(list(cursor.completions(2)), ['battalion', 'battery'])
+            tree.delete('battalion')
+            self.assertEqual(cursor.count(), 2)
+
+
+class CachedTreeTest(unittest.TestCase):
+
+    def test_hits_filters_and_invalidation(self):
+        """Cached answers match the tree's, extend from shorter prefixes and are dropped when the tree changes."""
+        for tree_class in (PrefixTree, TernaryTree, RadixTree, DAWG):
+            tree = CachedTree(tree_class(), max_words=8)
+            tree.insert_many(WORDS)
+            self.assertEqual(tree.starts_with('b'), (['bad', 'bat', 'bath', 'bathroom', 'battery', 'battle'],
+                                                     tree.tree.starts_with('b')[1]))
+            self.assertEqual(tree.starts_with('b')[0], sorted(tree.tree.starts_with('b')[0]))
+            self.assertEqual(tree.starts_with('bath'), (['bath', 'bathroom'], 0))
+            self.assertEqual(tree.starts_with('bx'), ([], 0))
+            info = tree.cache_info()
+            self.assertEqual((info['hits'], info['filtered_hits'], info['misses']), (1, 2, 1))
+            tree.starts_with('c')  # 'b', 'bath', 'bx' and 'c' hold 10 words, so the least recent, 'bath', goes
+            self.assertEqual(tree.cache_info()['evictions'], 1)
+            if tree_class is not DAWG:
+                tree.insert('bathtub')
+                self.assertEqual(tree.starts_with('bath')[0], ['bath', 'bathroom', 'bathtub'])
+                self.assertEqual(tree.cache_info()['invalidations'], 2)  # insert_many, then insert
+
+
+class IngestTest(unittest.TestCase):
+
+    def test_stream_and_sample(self):
+        """Words are cleaned and de-duplicated on the way in, and the seeded sample is stable and distinct."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'words.csv')
+            with open(path, 'w', encoding='utf-8') as csvfile:
+                csvfile.write('"bad"\n bat \ne-mail\n\nbath\nbat\n"cat"\n42\n')
+            self.assertEqual(count_words(path), 5)
+            self.assertEqual(sample_file(path, None), ['bad', 'bat', 'bath', 'cat'])
+            self.assertEqual(sample_file(path, None, alphabetic=False), ['bad', 'bat', 'e-mail', 'bath', 'cat', '42'])
+            self.assertEqual(sorted(sample_file(path, 10)), ['bad', 'bat', 'bath', 'cat'])
+            tree = load_tree(RadixTree(), path, 2)
+            self.assertEqual(len(tree), 2)
+        words = [f'w{number}' for number in range(1000)]
+        sample = sample_words(words, 50, seed=7)
+        self.assertEqual(len(set(sample)), 50)
+        self.assertEqual(sample, sample_words(words * 3, 50, seed=7))  # Repeats change nothing
+        self.assertNotEqual(sample, sample_words(words, 50, seed=8))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,204 @@
+"""Explicit-stack traversals shared by the tree classes.
+
+Trie and Radix nodes both keep a ``children`` dict and an ``is_word`` flag; they
+differ only in what an edge spells (the dict key for a Trie, ``child.text`` for
+a Radix node). Ternary nodes link through ``left``/``equal``/``right``. None of
+these helpers recurse, so key length and BST shape never hit the recursion limit.
+"""
+
+
+def collect_words(node, text, words, edge_text=False):
+    """Append every word at or below node to words in child order; text spells the path to node.
+
+    Set edge_text for Radix nodes, whose edges spell ``child.text``. Returns the
+    number of nodes visited, including node itself.
+    """
+    stack = [(node, text)]
+    pop, push, add = stack.pop, stack.append, words.append
+    visited = 0
+    while stack:
+        node, text = pop()
+        visited += 1
+        if node.is_word:
+            add(text)
+        children = node.children
+        if children:
+            if edge_text:
+                for child in reversed(children.values()):
+                    push((child, text + child.text))
+            else:
+                for char, child in reversed(children.items()):
+                    push((child, text + char))
+    return visited
+
+
+def subtree_offset(path):
+    """Return where the words below path[-1] start in the list collect_words makes for path[0].
+
+    path is the chain of children-dict nodes from path[0] down to path[-1]. A
+    subtree's words are contiguous in that list, after the word ending at each
+    ancestor and the words of every earlier sibling, so the offset is read from
+    the cached counts without visiting the words.
+    """
+    offset = 0
+    for parent, child in zip(path, path[1:]):
+        offset += parent.is_word
+        for sibling in parent.children.values():
+            if sibling is child:
+                break
+            offset += sibling.count
+    return offset
+
+
+def count_nodes(node):
+    """Return the number of nodes in the children-dict subtree rooted at node."""
+    stack = [node]
+    count = 0
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children.values())
+    return count
+
+
+def collect_ternary_words(node, prefix, words):
+    """Append every word in the ternary subtree under node to words in sorted order.
+
+    prefix spells the characters matched before node. Returns the number of nodes visited.
+    """
+    if node is None:
+        return 0
+    stack = [(node, prefix)]
+    visited = 0
+    while stack:
+        node, prefix = stack.pop()
+        if node is None:  # A finished word queued between the left and equal subtrees
+            words.append(prefix)
+            continue
+        visited += 1
+        if node.right:
+            stack.append((node.right, prefix))
+        if node.equal:
+            stack.append((node.equal, prefix + node.data))
+        if node.is_end_of_string:
+            stack.append((None, prefix + node.data))
+        if node.left:
+            stack.append((node.left, prefix))
+    return visited
+
+
+def count_ternary_nodes(node):
+    """Return the number of nodes in the ternary subtree rooted at node."""
+    stack = [node]
+    count = 0
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        count += 1
+        stack.append(node.left)
+        stack.append(node.equal)
+        stack.append(node.right)
+    return count
+
+
+def iter_words(stack, edge_text=False):
+    """Lazily yield words in lexicographic order from a stack of (node, text) subtree entries.
+
+    The last entry is expanded first; seek_words builds a stack in that order.
+    """
+    pop, push = stack.pop, stack.append
+    while stack:
+        node, text = pop()
+        if node.is_word:
+            yield text
+        children = node.children
+        if children:
+            if edge_text:
+                for key in sorted(children, reverse=True):
+                    child = children[key]
+                    push((child, text + child.text))
+            else:
+                for key in sorted(children, reverse=True):
+                    push((children[key], text + key))
+
+
+def seek_words(node, text, after=None, edge_text=False):
+    """Return an iter_words stack covering the words under node (spelling text) that sort after `after`.
+
+    Only the path spelling `after` is walked, so resuming a listing costs one
+    descent instead of re-reading every earlier word.
+    """
+    if after is None or text > after:
+        return [(node, text)]
+    if not after.startswith(text):
+        return []
+    stack = []
+    while node is not None:
+        following = None
+        children = node.children
+        for key in sorted(children, reverse=True):
+            child = children[key]
+            label = text + (child.text if edge_text else key)
+            if after.startswith(label):
+                following = (child, label)
+            elif label > after:
+                stack.append((child, label))
+        if following is None:
+            break
+        node, text = following
+    return stack
+
+
+def iter_ternary_words(stack):
+    """Lazily yield words in sorted order from a stack of ternary (node, prefix) entries.
+
+    An entry whose node is None is a finished word held in its prefix slot.
+    """
+    pop, push = stack.pop, stack.append
+    while stack:
+        node, prefix = pop()
+        if node is None:
+            yield prefix
+            continue
+        if node.right:
+            push((node.right, prefix))
+        if node.equal:
+            push((node.equal, prefix + node.data))
+        if node.is_end_of_string:
+            push((None, prefix + node.data))
+        if node.left:
+            push((node.left, prefix))
+
+
+def seek_ternary_words(node, prefix, after=None):
+    """Return an iter_ternary_words stack for the words under node (matched prefix) that sort after `after`."""
+    if node is None:
+        return []
+    if after is None or prefix > after:
+        return [(node, prefix)]
+    if not after.startswith(prefix):
+        return []
+    stack = []
+    while node is not None:
+        if prefix == after:  # Everything left in this subtree extends `after`
+            stack.append((node, prefix))
+            break
+        char = after[len(prefix)]
+        if char < node.data:
+            # This node, its equal subtree and its right subtree all sort after `after`
+            if node.right:
+                stack.append((node.right, prefix))
+            if node.equal:
+                stack.append((node.equal, prefix + node.data))
+            if node.is_end_of_string:
+                stack.append((None, prefix + node.data))
+            node = node.left
+        elif char > node.data:
+            node = node.right
+        else:
+            if node.right:
+                stack.append((node.right, prefix))
+            prefix += node.data
+            node = node.equal
+    return stack
@@ -1,6 +1,15 @@
-import networkx as nx
+from itertools import islice
+
 import matplotlib.pyplot as plt
-import plotly.graph_objects as go
+from tree.bulk import common_prefix_length, paused_gc, sorted_unique
+from tree.cursor import TrieCursor
+from tree.frozen import FrozenTrie
+from tree.fuzzy import fuzzy_words
+from tree.louds import LoudsTrie
+from tree.ranking import subtree_max, top_words, weigh_path
+from tree.render import DEFAULT_BUDGET, DEFAULT_DEPTH, render_tree
+from tree.snapshot import TRIE, MappedTrie, write_snapshot
+from tree.traversal import collect_words, count_nodes, iter_words, seek_words, subtree_offset
 
 class TrieNode:
     """A node in the Trie structure."""
@@ -8,26 +17,104 @@ class TrieNode:
         self.text = text
         self.children = dict()
         self.is_word = False
+        self.weight = 0
+        self.max_weight = 0
+        self.count = 0  # Words ending at or below this node
+
+class CompactTrieNode:
+    """A slotted Trie node that keeps no copy of its prefix; words are rebuilt from the path."""
+    __slots__ = ('children', 'is_word', 'weight', 'max_weight', 'count')
+
+    def __init__(self):
+        self.children = dict()
+        self.is_word = False
+        self.weight = 0
+        self.max_weight = 0
+        self.count = 0
 
 class PrefixTree:
     """A Trie to store and query strings efficiently."""
     
-    def __init__(self):
-        self.root = TrieNode()
+    def __init__(self, compact=False):
+        self.compact = compact
+        self.root = CompactTrieNode() if compact else TrieNode()
         self.name = "Trie"
+        self.node_count = 1
+        self.generation = 0
 
-    def insert(self, word):
-        """Insert a word into the Trie."""
+    def insert(self, word, weight=None):
+        """Insert a word into the Trie; weight ranks it for top_k (None keeps the current weight, 0 if new)."""
+        self.generation += 1
         current = self.root
+        path = [current]
         for i, char in enumerate(word):
-            if char not in current.children:
-                prefix = word[0:i+1]
-                current.children[char] = TrieNode(prefix)
-            current = current.children[char]
-        current.is_word = True
+            child = current.children.get(char)
+            if child is None:
+                child = CompactTrieNode() if self.compact else TrieNode(word[0:i+1])
+                current.children[char] = child
+                self.node_count += 1
+            current = child
+            path.append(current)
+        weigh_path(path, weight, current.is_word, subtree_max)
+        if not current.is_word:
+            current.is_word = True
+            for node in path:
+                node.count += 1
+
+    def insert_many(self, words):
+        """Insert words in sorted order, reusing the path shared with the previous word."""
+        self.generation += 1
+        compact = self.compact
+        path = [self.root]
+        previous = ''
+        with paused_gc():
+            for word in sorted(set(words)):
+                common = common_prefix_length(word, previous)
+                del path[common + 1:]
+                current = path[-1]
+                for i in range(common, len(word)):
+                    char = word[i]
+                    child = current.children.get(char)
+                    if child is None:
+                        child = CompactTrieNode() if compact else TrieNode(word[0:i+1])
+                        current.children[char] = child
+                        self.node_count += 1
+                    path.append(child)
+                    current = child
+                if not current.is_word:
+                    current.is_word = True
+                    for node in path:
+                        node.count += 1
+                previous = word
 
-    def find(self, word):
-        """Find and return the node representing the word, or None if not found."""
+    @classmethod
+    def from_sorted(cls, words, compact=False):
+        """Build a Trie from words in sorted order; raises ValueError on out-of-order input."""
+        tree = cls(compact=compact)
+        path = [tree.root]
+        previous = ''
+        with paused_gc():
+            for word in sorted_unique(words):
+                common = common_prefix_length(word, previous)
+                del path[common + 1:]
+                current = path[-1]
+                # Sorted input guarantees everything past the shared prefix is new
+                for i in range(common, len(word)):
+                    child = CompactTrieNode() if compact else TrieNode(word[0:i+1])
+                    current.children[word[i]] = child
+                    path.append(child)
+                    current = child
+                tree.node_count += len(word) - common
+                current.is_word = True
+                for node in path:
+                    node.count += 1
+                previous = word
+        return tree
+
+    def find(self, word, stats=None):
+        """Find and return the node representing the word, or None if not found; pass a QueryStats to count the work."""
+        if stats is not None:
+            return stats.measure('find', self._find_counted, word)
         current = self.root
         for char in word:
             if char not in current.children:
@@ -35,8 +122,37 @@ class PrefixTree:
             current = current.children[char]
         return current if current.is_word else None
 
-    def starts_with(self, prefix):
-        """Return a list of all words starting with the given prefix and count nodes traversed."""
+    def delete(self, word):
+        """Remove a word, pruning nodes that no longer lead to any word; returns False if it was not stored."""
+        current = self.root
+        path = [current]
+        for char in word:
+            current = current.children.get(char)
+            if current is None:
+                return False
+            path.append(current)
+        if not current.is_word:
+            return False
+        self.generation += 1
+        current.is_word = False
+        current.weight = 0
+        depth = len(word)
+        while depth and not path[depth].is_word and not path[depth].children:
+            del path[depth - 1].children[word[depth - 1]]
+            depth -= 1
+        self.node_count -= len(word) - depth
+        for node in reversed(path[:depth + 1]):
+            node.count -= 1
+            node.max_weight = subtree_max(node)
+        return True
+
+    def starts_with(self, prefix, stats=None):
+        """Return a list of all words starting with the given prefix and count nodes traversed.
+
+        Pass a QueryStats to also count comparisons and time the call.
+        """
+        if stats is not None:
+            return stats.measure('starts_with', self._starts_with_counted, prefix)
         words = list()
         current = self.root
         nodes_traversed = 0
@@ -45,106 +161,163 @@ class PrefixTree:
                 return list(), nodes_traversed
             current = current.children[char]
             nodes_traversed += 1
-        nodes_traversed += self.__child_words_for(current, words)
+        nodes_traversed += collect_words(current, prefix, words)
         return words, nodes_traversed
 
-    def __child_words_for(self, node, words):
-        """Helper method to collect all words under a given node and count nodes traversed."""
-        nodes_traversed = 1  # Start by counting the current node
-        if node.is_word:
-            words.append(node.text)
-        for letter in node.children:
-            nodes_traversed += self.__child_words_for(node.children[letter], words)
-        return nodes_traversed
+    def find_many(self, words):
+        """Return find(word) for each word in a batch, walking each shared prefix once."""
+        nodes = {}
+        for word, current, _, _ in self._walk_many(words):
+            nodes[word] = current if current is not None and current.is_word else None
+        return [nodes[word] for word in words]
+
+    def starts_with_many(self, prefixes):
+        """Return starts_with(prefix) for each prefix in a batch, walking each shared path once."""
+        answers = {}
+        enclosing = []  # (prefix, path index of its node, words) for earlier prefixes the current one may extend
+        for prefix, current, nodes_traversed, path in self._walk_many(prefixes):
+            while enclosing and not prefix.startswith(enclosing[-1][0]):
+                enclosing.pop()
+            if current is None:
+                answers[prefix] = ([], nodes_traversed)
+                continue
+            if enclosing:
+                _, index, outer_words = enclosing[-1]
+                start = subtree_offset(path[index:])
+                words = outer_words[start:start + current.count]
+            else:
+                words = []
+                nodes_traversed += collect_words(current, prefix, words)
+            answers[prefix] = (words, nodes_traversed)
+            enclosing.append((prefix, len(path) - 1, words))
+        return [answers[prefix] for prefix in prefixes]
+
+    def _walk_many(self, prefixes):
+        """Yield (prefix, node or None, nodes newly stepped onto, path) for the distinct prefixes in sorted order.
+
+        path[d] is the node reached after d characters and is kept from the
+        previous prefix up to the characters the two share.
+        """
+        path = [self.root]
+        previous = ''
+        for prefix in sorted(set(prefixes)):
+            del path[common_prefix_length(prefix, previous) + 1:]
+            current = path[-1]
+            steps = 0
+            for char in prefix[len(path) - 1:]:
+                current = current.children.get(char)
+                if current is None:
+                    break
+                path.append(current)
+                steps += 1
+            yield prefix, current, steps, path
+            previous = prefix
+
+    def _descend_counted(self, prefix, stats):
+        """Walk prefix from the root like find, counting into stats; returns the node reached or None."""
+        current = self.root
+        for char in prefix:
+            stats.char_comparisons += 1
+            current = current.children.get(char)
+            if current is None:
+                return None
+            stats.nodes_visited += 1
+        return current
+
+    def _find_counted(self, word, stats):
+        current = self._descend_counted(word, stats)
+        return current if current is not None and current.is_word else None
+
+    def _starts_with_counted(self, prefix, stats):
+        before = stats.nodes_visited
+        words = []
+        current = self._descend_counted(prefix, stats)
+        if current is not None:
+            stats.nodes_visited += collect_words(current, prefix, words)
+        return words, stats.nodes_visited - before
+
+    def count_prefix(self, prefix):
+        """Return how many words start with prefix, walking only the prefix path."""
+        current = self.root
+        for char in prefix:
+            current = current.children.get(char)
+            if current is None:
+                return 0
+        return current.count
+
+    def fuzzy(self, word, max_edits):
+        """Return (word, distance) pairs for stored words within max_edits edits of word, and nodes traversed."""
+        return fuzzy_words(self.root, word, max_edits)
+
+    def top_k(self, prefix, k):
+        """Return the k heaviest words starting with prefix as (word, weight) pairs and the count of nodes traversed."""
+        current = self.root
+        nodes_traversed = 0
+        for char in prefix:
+            current = current.children.get(char)
+            if current is None:
+                return [], nodes_traversed
+            nodes_traversed += 1
+        results, visited = top_words(current, prefix, k)
+        return results, nodes_traversed + visited
+
+    def cursor(self, prefix=''):
+        """Return a TrieCursor at prefix that push(char) and pop() move one keystroke at a time."""
+        return TrieCursor(self, prefix)
+
+    def iter_prefix(self, prefix='', limit=None, after=None):
+        """Lazily yield up to limit words starting with prefix in lexicographic order.
+
+        Pass the last word of the previous page as after to resume right past it.
+        """
+        current = self.root
+        for char in prefix:
+            current = current.children.get(char)
+            if current is None:
+                return
+        yield from islice(iter_words(seek_words(current, prefix, after)), limit)
+
+    def freeze(self):
+        """Return an immutable double-array copy of the Trie for read-only serving."""
+        return FrozenTrie(self.root)
+
+    def succinct(self):
+        """Return a read-only LOUDS trie of the current words: a few bytes per node, slower lookups than freeze()."""
+        return LoudsTrie.from_trie(self.root)
+
+    def save(self, path):
+        """Write the tree to path as a versioned binary snapshot; weights must be integers."""
+        write_snapshot(path, TRIE, self.root, self.node_count)
+
+    @staticmethod
+    def load(path):
+        """Open a snapshot written by save() for read-only queries; nodes are read from the mapped file on demand."""
+        return MappedTrie(path, TRIE)
 
     def size(self, current=None):
-        """Return the total number of nodes in the Trie."""
+        """Return the total number of nodes in the Trie, or in the subtree under current."""
         if not current:
-            current = self.root
-        count = 1
-        for letter in current.children:
-            count += self.size(current.children[letter])
-        return count
-
-    def visualize(self, prefix=''):
-        """Visualize the Trie using plotly for interactivity."""
-        graph = nx.DiGraph()
-        current = self.root
+            return self.node_count
+        return count_nodes(current)
+
+    def __len__(self):
+        """Return the number of words stored."""
+        return self.root.count
+
+    def visualize(self, prefix='', budget=DEFAULT_BUDGET, max_depth=DEFAULT_DEPTH, expanded=()):
+        """Visualize the Trie with plotly, collapsing subtrees beyond the node budget or depth limit.
 
-        # Start from the given prefix
+        expanded holds keys (the spelled text) of collapsed nodes to open anyway.
+        """
+        current = self.root
         for char in prefix:
-            if char in current.children:
-                current = current.children[char]
-            else:
+            current = current.children.get(char)
+            if current is None:
                 return  # Prefix not in Trie
 
-        self.__add_nodes(graph, current, "root")
-
-        # Use spring layout for better visualization
-        pos = nx.spring_layout(graph)
-        edge_x = []
-        edge_y = []
-
-        for edge in graph.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.append(x0)
-            edge_x.append(x1)
-            edge_x.append(None)
-            edge_y.append(y0)
-            edge_y.append(y1)
-            edge_y.append(None)
-
-        edge_trace = go.Scatter(
-            x=edge_x, y=edge_y,
-            line=dict(width=0.5, color='#888'),
-            hoverinfo='none',
-            mode='lines')
-
-        node_x = []
-        node_y = []
-        labels = []
-
-        for node in graph.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
-            labels.append(graph.nodes[node].get('label', ''))
-
-        node_trace = go.Scatter(
-            x=node_x, y=node_y,
-            mode='markers+text',
-            text=labels,
-            textposition='top center',
-            hoverinfo='text',
-            marker=dict(
-                showscale=False,
-                color='skyblue',
-                size=10,
-                line_width=2))
-
-        fig = go.Figure(data=[edge_trace, node_trace],
-                        layout=go.Layout(
-                            title=f'Trie Visualization (Prefix: {prefix})',
-                            titlefont_size=16,
-                            showlegend=False,
-                            hovermode='closest',
-                            margin=dict(b=20,l=5,r=5,t=40),
-                            annotations=[dict(
-                                text="Trie Visualization",
-                                showarrow=False,
-                                xref="paper", yref="paper",
-                                x=0.005, y=-0.002 )],
-                            xaxis=dict(showgrid=False, zeroline=False),
-                            yaxis=dict(showgrid=False, zeroline=False))
-                        )
-        return fig
-
-    def __add_nodes(self, graph, node, node_id):
-        """Helper method to add nodes to the networkx graph."""
-        for char, child in node.children.items():
-            child_id = node_id + char
-            label = f"{char} ({child.text})" if child.is_word else char
-            graph.add_node(child_id, label=label)
-            graph.add_edge(node_id, child_id)
-            self.__add_nodes(graph, child, child_id)
+        def children(node, key):
+            return [(child, key + char, char) for char, child in sorted(node.children.items())]
+
+        return render_tree(f'Trie Visualization (Prefix: {prefix})', current, prefix or 'root', children,
+                           lambda node: node.count, lambda node: node.is_word,
+                           budget, max_depth, expanded, root_key=prefix, owner=self)
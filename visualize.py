@@ -1,40 +1,144 @@
 from tree.tries import PrefixTree
 from tree.ternary import TernaryTree
 from tree.radix import RadixTree
+from tree.dawg import DAWG
+from tree.cache import CachedTree
+from tree.ingest import sample_file
+from tree.stats import QueryStats
 
+from collections import OrderedDict
+from io import BytesIO
 import time
 
-def helper(words, tree, prefix):
-    # Measure insertion time
-    start_time = time.time()
-    for word in words:
-        tree.insert(word)
-    insertion_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+from wordcloud import WordCloud
+
+TREE_CLASSES = {
+    1: PrefixTree,
+    2: TernaryTree,
+    3: RadixTree,
+    4: DAWG,
+}
+
+MAX_CACHED_TREES = 4  # Built trees kept per process before the least recently used is dropped
+_tree_cache = OrderedDict()
+_result_caches = {}  # key -> CachedTree over the cached tree of that key
+
+
+def build_tree(words, tree_selection=1):
+    """Build the selected tree from words and return it with the insertion time in milliseconds."""
+    if tree_selection not in TREE_CLASSES:
+        raise Exception("Invalid tree selection")
+    tree = TREE_CLASSES[tree_selection]()
+    start_time = time.perf_counter_ns()
+    tree.insert_many(words)
+    insertion_time = (time.perf_counter_ns() - start_time) / 1e6  # Convert to milliseconds
+    return tree, insertion_time
 
-    # Measure retrieval time
-    start_time = time.time()
+
+def query_tree(tree, prefix, expanded=()):
+    """Query an already built tree for prefix.
+
+    Returns results, figure, nodes traversed, total nodes, retrieval time and the QueryStats of a second, counted run.
+    """
+    # Measure retrieval time on the uninstrumented path
+    start_time = time.perf_counter_ns()
     results, nodes_traversed = tree.starts_with(prefix)
-    retrieval_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+    retrieval_time = (time.perf_counter_ns() - start_time) / 1e6  # Convert to milliseconds
+
+    # Count the same query's work separately so the counters never skew the timing
+    stats = QueryStats(trace_memory=True)
+    tree.starts_with(prefix, stats)
 
     # Visualize the tree
-    fig = tree.visualize(prefix)
+    fig = tree.visualize(prefix, expanded=expanded)
 
     # Get total node count
     total_nodes = tree.size()
 
+    return results, fig, nodes_traversed, total_nodes, retrieval_time, stats
+
+
+def cached_tree(key, sample, tree_selection):
+    """Return the tree this process built for key, reading its words with sample_file(*sample) on first use."""
+    tree = _tree_cache.get(key)
+    if tree is None:
+        tree, _ = build_tree(sample_file(*sample), tree_selection)
+        _tree_cache[key] = tree
+        if len(_tree_cache) > MAX_CACHED_TREES:
+            evicted, _ = _tree_cache.popitem(last=False)
+            _result_caches.pop(evicted, None)
+    else:
+        _tree_cache.move_to_end(key)
+    return tree
+
+
+def cached_results(key, tree):
+    """Return the CachedTree kept for key's tree, so its results and counters persist across queries."""
+    cached = _result_caches.get(key)
+    if cached is None or cached.tree is not tree:
+        cached = CachedTree(tree)
+        _result_caches[key] = cached
+    return cached
+
+
+def wordcloud_png(words):
+    """Render words as a word cloud and return PNG bytes, or None when there are no words."""
+    if not words:
+        return None
+    image = WordCloud(width=800, height=400, background_color="white").generate(" ".join(words)).to_image()
+    buffer = BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def analyze(sample, tree_selection, prefix, measure_insertion=False, expanded=(), cache_results=False):
+    """Query the tree cached for a word sample and render its figure and word cloud; meant to run in a worker process.
+
+    sample holds the sample_file arguments (path, size, seed, alphabetic), so only they cross
+    to the worker, which reads the words itself when it has no tree for them yet or has to
+    time an insertion. expanded lists the keys of collapsed figure nodes the user clicked open.
+    With cache_results, starts_with goes through the tree's result cache and its counters are
+    returned under 'cache'.
+    Returns a dict of picklable results: the figure as Plotly JSON and the word cloud as PNG bytes.
+    """
+    key = (sample, tree_selection)
+    tree = cached_tree(key, sample, tree_selection)
+    if cache_results:
+        tree = cached_results(key, tree)
+    results, fig, nodes_traversed, total_nodes, retrieval_time, stats = query_tree(tree, prefix, expanded)
+    insertion_time = None
+    if measure_insertion:
+        # Timed on a throwaway tree so the cached one is never rebuilt
+        _, insertion_time = build_tree(sample_file(*sample), tree_selection)
+    return {
+        'results': results,
+        'figure': fig.to_json() if fig is not None else None,
+        'wordcloud': wordcloud_png(results),
+        'nodes_traversed': nodes_traversed,
+        'char_comparisons': stats.char_comparisons,
+        'edge_comparisons': stats.edge_comparisons,
+        'allocated_bytes': stats.allocated_bytes,
+        'total_nodes': total_nodes,
+        'insertion_time': insertion_time,
+        'retrieval_time': retrieval_time,
+        'cache': tree.cache_info() if cache_results else None,
+    }
+
+
+def helper(words, tree, prefix):
+    # Measure insertion time
+    start_time = time.perf_counter_ns()
+    tree.insert_many(words)
+    insertion_time = (time.perf_counter_ns() - start_time) / 1e6  # Convert to milliseconds
+
+    results, fig, nodes_traversed, total_nodes, retrieval_time, _ = query_tree(tree, prefix)
+
     # Return all metrics and results
     return results, fig, nodes_traversed, total_nodes, insertion_time, retrieval_time
 
 
 def visualize(words, tree_selection=1, prefix=''):
     # Initialize the appropriate tree
-    if tree_selection == 1:
-        tree = PrefixTree()
-    elif tree_selection == 2:
-        tree = TernaryTree()
-    elif tree_selection == 3:
-        tree = RadixTree()
-    else:
+    if tree_selection not in TREE_CLASSES:
         raise Exception("Invalid tree selection")
-
-    return helper(words, tree, prefix)
+    return helper(words, TREE_CLASSES[tree_selection](), prefix)